@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark wyznaczania tras: A* (heurystyka euklidesowa) vs Dijkstra dla pojedynczych par
+na dużym wygenerowanym układzie (zapytania spoza policzonej tablicy tras).
+
+Użycie:
+    python benchmarks/bench_routing.py [rozmiar_siatki] [liczba_zapytań]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.graph import AirportGraph
+
+
+def write_grid_layout(directory: str, size: int, seed: int = 0):
+    """Siatka size x size dróg kołowania z długościami >= odległości euklidesowej"""
+    rng = random.Random(seed)
+    nodes_file = os.path.join(directory, "nodes.csv")
+    edges_file = os.path.join(directory, "edges.csv")
+    with open(nodes_file, "w") as f:
+        f.write("id,type,name,x,y,notes\n")
+        for r in range(size):
+            for c in range(size):
+                f.write(f"{r * size + c + 1},taxiway,TWY_{r}_{c},{c * 10},{r * 10},\n")
+    with open(edges_file, "w") as f:
+        f.write("from,to,type,length,bidirectional,desc\n")
+        for r in range(size):
+            for c in range(size):
+                u = r * size + c + 1
+                if c + 1 < size:
+                    f.write(f"{u},{u + 1},taxiway,{10 * (1 + 0.3 * rng.random()):.3f},True,taxiway\n")
+                if r + 1 < size:
+                    f.write(f"{u},{u + size},taxiway,{10 * (1 + 0.3 * rng.random()):.3f},True,taxiway\n")
+    return nodes_file, edges_file
+
+
+def run(nodes_file: str, edges_file: str, queries: int, seed: int = 1):
+    rng = random.Random(seed)
+    pairs = None
+    results = {}
+    for strategy in ("dijkstra", "astar"):
+        graph = AirportGraph(nodes_file, edges_file, use_cache=False, route_strategy=strategy)
+        if pairs is None:
+            nodes = graph.get_all_nodes()
+            pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(queries)]
+        expanded = 0
+        lengths = []
+        t = time.perf_counter()
+        for start, end in pairs:
+            path = graph.find_shortest_path(start, end)
+            expanded += graph.routes.last_expanded
+            lengths.append(sum(graph.get_edge_length(a, b) for a, b in zip(path, path[1:])))
+        results[strategy] = (time.perf_counter() - t, expanded, lengths)
+    return results
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 120
+    queries = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    with tempfile.TemporaryDirectory() as tmp:
+        nodes_file, edges_file = write_grid_layout(tmp, size)
+        results = run(nodes_file, edges_file, queries)
+
+    print(f"Siatka {size}x{size} ({size * size} węzłów), {queries} zapytań")
+    print(f"{'Strategia':<10} {'Czas [s]':>10} {'Rozwinięte węzły':>18}")
+    for strategy, (elapsed, expanded, _) in results.items():
+        print(f"{strategy:<10} {elapsed:>10.3f} {expanded:>18}")
+    same = all(abs(a - b) < 1e-6 for a, b in zip(results["dijkstra"][2], results["astar"][2]))
+    print(f"Długości tras zgodne: {'TAK' if same else 'NIE'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -8,11 +8,13 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.model import AirportModel
-from src.visualization import AirportVisualization
-import matplotlib.pyplot as plt
 
 def run_realtime_animation():
     """Uruchamia animację w czasie rzeczywistym"""
+    # Importy graficzne dopiero tutaj - sam import modułu nie ładuje matplotlib
+    from src.visualization import AirportVisualization
+    import matplotlib.pyplot as plt
+
     print("🎬 Uruchamianie animacji symulacji lotniska Balice w czasie rzeczywistym...")
     
     # Parametry symulacji
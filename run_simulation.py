@@ -8,8 +8,9 @@ import os
 sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.model import AirportModel
-from src.visualization import AirportVisualization
-import matplotlib.pyplot as plt
+
+# Wizualizacja (matplotlib, obrazek tła) importowana dopiero w trybach graficznych,
+# żeby symulacja bez okna (--headless) startowała szybko.
 
 
 def configure_airport(model: "AirportModel"):
@@ -19,13 +20,16 @@ def configure_airport(model: "AirportModel"):
     - krawędzie jednokierunkowe (model.graph.set_one_way / set_bidirectional),
     - pojemności segmentów kolejki (model.graph.set_edge_capacity),
     - limity prędkości (model.graph.set_edge_speed_limits),
-    - punkty konfliktu (model.graph.add_conflict_point).
+    - punkty konfliktu (model.graph.add_conflict_point),
+    - zamknięcia krawędzi (model.graph.close_edge / open_edge - także w trakcie symulacji).
+    Zmiany poprawiają tablicę tras i planer przyrostowo, bez pełnej przebudowy.
     Domyślnie nic nie zmieniamy (mapa może już zawierać te informacje).
     """
     # Przykład (zakomentowane – brak wiedzy o konkretnych ID z CSV):
     # model.graph.set_one_way(12, 15, 'AB')
     # model.graph.set_edge_capacity(21, 22, capacity=3)  # np. segment kolejki
     # model.graph.add_conflict_point(1, description="Crossing RWY", edges=[(30,31), (40,41)])
+    # model.graph.close_edge(21, 22)  # np. zamknięta droga kołowania
     return
 
 def scenarios_smoke_tests(model: "AirportModel"):
@@ -65,6 +69,8 @@ def main():
     )
     
     # Tworzenie wizualizacji
+    from src.visualization import AirportVisualization
+    import matplotlib.pyplot as plt
     viz = AirportVisualization(model)
 
     # Konfiguracja lotniska (jednokierunkowość, pojemności, konflikty)
@@ -152,6 +158,27 @@ def main():
     print("\n✅ Symulacja zakończona!")
 
 
+def run_headless(max_steps: int = 100, engine: str = "tick"):
+    """Symulacja bez wizualizacji - nie ładuje matplotlib ani obrazka tła"""
+    print(f"🛫 Symulacja bez wizualizacji ({max_steps} kroków, silnik: {engine})...")
+
+    model = AirportModel(num_arriving_airplanes=3, wind_direction="25", arrival_rate=0.01, engine=engine)
+    configure_airport(model)
+
+    model.run_until(max_steps)
+    step_count = model.step_count
+
+    states_count = {}
+    for airplane in model.airplanes:
+        states_count[airplane.state] = states_count.get(airplane.state, 0) + 1
+    print(f"\nSymulacja zakończona po {step_count} krokach.")
+    print(f"- Samolotów: {len(model.airplanes)}")
+    print(f"- Stany: {', '.join([f'{k}: {v}' for k, v in sorted(states_count.items())])}")
+    print(f"- Kolejka pasa: {model.runway_controller.get_runway_queue_length()}")
+    print(f"- Pas zajęty: {'TAK' if model.runway_controller.is_busy else 'NIE'}")
+    return model
+
+
 def demo_quick():
     """Szybka demonstracja symulacji"""
     print("🚀 Szybka demonstracja symulacji lotniska Balice...")
@@ -160,6 +187,7 @@ def demo_quick():
     model = AirportModel(num_arriving_airplanes=3, wind_direction="07", arrival_rate=0.15)
     
     # Tworzenie wizualizacji
+    from src.visualization import AirportVisualization
     viz = AirportVisualization(model)
     
     # Uruchomienie kilku kroków
@@ -181,5 +209,8 @@ def demo_quick():
 if __name__ == "__main__":
     if len(sys.argv) > 1 and sys.argv[1] == "--demo":
         demo_quick()
+    elif len(sys.argv) > 1 and sys.argv[1] == "--headless":
+        steps = [arg for arg in sys.argv[2:] if arg.isdigit()]
+        run_headless(int(steps[0]) if steps else 100, engine="event" if "--events" in sys.argv else "tick")
     else:
         main()
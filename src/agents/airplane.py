@@ -1,13 +1,42 @@
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 from mesa import Agent
-from src.movement_controller import MovementController, Position
+from src.movement_controller import MovementController
+from src.fleet import FleetField, FleetPosition, IdField, OptionalField, StateField
 
 
 class Airplane(Agent):
-    """Agent reprezentujący samolot na płycie lotniska"""
-    
+    """
+    Agent reprezentujący samolot na płycie lotniska. Gorący stan (stan, węzły,
+    pozycja, ruch, liczniki) leży w model.fleet - obiekt trzyma tylko numer wiersza.
+    """
+
+    # Atrybuty przechowywane w FleetStore
+    state = StateField('state')
+    current_node = IdField('current_node')
+    target_node = IdField('target_node')
+    is_moving = FleetField('is_moving')  # Czy aktualnie się porusza między węzłami
+    movement_start_time = FleetField('movement_start')  # Kiedy rozpoczął ruch między węzłami
+    movement_duration = FleetField('movement_duration')  # Ile ticków zajmuje przejście
+    movement_edge = IdField('movement_edge')  # Krawędź bieżącego (po dojechaniu - ostatniego) ruchu
+    hold_progress_limit = OptionalField('hold_limit')  # Limit postępu do zatrzymania się przed segmentem
+    advanced_at = FleetField('advanced_at')  # Tick, w którym faza ruchu przesunęła samolot
+    landing_time = FleetField('landing_time')
+    stand_time = FleetField('stand_time')
+    departure_time = FleetField('departure_time')
+    wait_time = FleetField('wait_time')  # Czas oczekiwania na segment
+
+    # Stałe wspólne dla wszystkich samolotów
+    max_landing_time = 3  # Kroki potrzebne do wylądowania
+    max_stand_time = 10  # Czas obsługi na stanowisku
+    max_departure_time = 3  # Kroki potrzebne do startu
+    max_wait_time = 5  # Maksymalny czas oczekiwania przed prośbą o arbitraż
+    movement_controller = MovementController()  # Bezstanowy - jeden dla całej floty
+
     def __init__(self, model, unique_id, airplane_type="arrival"):
         super().__init__(model)
+        self.fleet = model.fleet
+        self._row = self.fleet.allocate(self)
+        self.position = FleetPosition(self.fleet, self._row)  # Aktualna pozycja z interpolacją
         self.unique_id = unique_id
         self.airplane_type = airplane_type  # "arrival" lub "departure"
         # Stany: waiting_landing, landing, taxiing_to_stand, at_stand,
@@ -17,37 +46,24 @@ class Airplane(Agent):
         else:
             self.state = "at_stand"
         
-        self.landing_time = 0
-        self.max_landing_time = 3  # Kroki potrzebne do wylądowania
         self.taxi_time = 0
-        self.stand_time = 0
-        self.max_stand_time = 10  # Czas obsługi na stanowisku
-        self.departure_time = 0
-        self.max_departure_time = 3  # Kroki potrzebne do startu
-        self.target_node = None
-        self.current_node = None
         self.path = []  # Ścieżka do celu
         self.is_in_queue = False
         
-        # System rezerwacji segmentów
-        self.blocked_edges = []  # Lista zarezerwowanych segmentów
-        
+        # System rezerwacji segmentów (trzymane krawędzie: SegmentManager.held_edge_ids)
+        self.exit_edge_id: Optional[int] = None  # Zjazd z pasa zarezerwowany przy lądowaniu
         self.priority = 1  # Priorytet samolotu (wyższa liczba = wyższy priorytet)
-        self.wait_time = 0  # Czas oczekiwania na segment
-        self.max_wait_time = 5  # Maksymalny czas oczekiwania przed prośbą o arbitraż
-        self.hold_progress_limit = None  # Limit postępu do zatrzymania się przed segmentem
-        
-        # System płynnego ruchu
-        self.position = Position(0.0, 0.0)  # Aktualna pozycja z interpolacją
-        self.movement_controller = MovementController()
-        self.movement_start_time = 0  # Kiedy rozpoczął ruch między węzłami
-        self.movement_duration = 1  # Ile ticków zajmuje przejście
-        self.is_moving = False  # Czy aktualnie się porusza między węzłami
         # Pushback
         self.pushback_started_at: Optional[int] = None
         self.runway_entry_node: Optional[int] = None
         self.departure_hold_node: Optional[int] = None
         
+    @property
+    def blocked_edges(self) -> List[Dict]:
+        """Zarezerwowane krawędzie (widok na indeks w SegmentManager)"""
+        graph = self.model.graph
+        return [graph.edge_record(edge_id) for edge_id in self.model.segment_manager.held_edge_ids(self.unique_id)]
+
     def step(self):
         print(f"Airplane {self.unique_id} state: {self.state}")
         print(f"  Current node: {self.current_node}, Target node: {self.target_node}, Path: {self.path}")
@@ -98,6 +114,7 @@ class Airplane(Agent):
         """Wybór wyjścia z pasa startowego"""
         success, blocked_edges = self.model.segment_manager.request_airport_section("taxiway_outbound", self.unique_id)         
         if success:
+            self.exit_edge_id = self.model.graph.get_edge_id(blocked_edges[0]['from'], blocked_edges[0]['to'])
             self.target_node = blocked_edges[0]['to']
             self.path = self.model.graph.find_shortest_path(self.model.runway_controller.get_active_runway(), blocked_edges[0]['to'])
 
@@ -118,17 +135,23 @@ class Airplane(Agent):
     
     def wait_for_stand(self):
         """Oczekiwanie na wolne stanowisko postojowe"""
-        before_blocked_edges = self.blocked_edges.copy()
+        # Uśpiony do czasu zwolnienia segmentów, które go zablokowały
+        if self.model.segment_manager.is_parked(self.unique_id):
+            return
+        before_held = self.model.segment_manager.held_edge_ids(self.unique_id)
         success_airport, blocked_edges_taxiway = self.model.segment_manager.request_airport_section("airport_deck", self.unique_id)
         print("WAIT FOR STAND")
         print(f"Airplane {self.unique_id} requesting stand:")
         print(success_airport)
         if success_airport and self.choose_stand():
-            self.model.segment_manager.release_edges(before_blocked_edges, self.unique_id)
-            self.blocked_edges = blocked_edges_taxiway
+            self.model.segment_manager.release_edge_ids(before_held, self.unique_id)
+            # Zjazd z pasa zwolniony - kolejka na krawędzi nie może go już zostawiać
+            self.exit_edge_id = None
             self.state = "taxiing_to_stand"
         else:
             self.model.segment_manager.release_edges(blocked_edges_taxiway, self.unique_id)
+            if not success_airport:
+                self.model.segment_manager.park(self.unique_id)
             return
 
     
@@ -160,9 +183,8 @@ class Airplane(Agent):
         
         # Sprawdź czy dotarł do stanowiska
         if self.current_node == self.target_node:
-            self.model.segment_manager.release_edges(self.blocked_edges, self.unique_id)
+            self.model.segment_manager.release_all(self.unique_id)
             self.model.segment_manager.remove_airplane_from_airport_queue(self.unique_id)
-            self.blocked_edges = []
             self.state = "at_stand"
             self.stand_time = 0
     
@@ -180,19 +202,21 @@ class Airplane(Agent):
     
     def handle_pushback_pending(self):
         """Czeka na dostępność tuga/apron i rozpoczyna pushback."""
+        if self.model.segment_manager.is_parked(self.unique_id):
+            return
         now = self.model.step_count
         granted_airport, blocked_edges_airport = self.model.segment_manager.request_airport_section("airport_deck", self.unique_id)
-        granted_runway_entry,blocked_edges_runway_entry = self.choose_runway_entry()
+        # Wjazd na pas tylko po przydziale płyty - udana prośba o wjazd skasowałaby
+        # blokady płyty i samolot nie miałby na co czekać (park)
+        granted_runway_entry, blocked_edges_runway_entry = self.choose_runway_entry() if granted_airport else (False, [])
         if granted_airport and granted_runway_entry:
-            blocked_edges = blocked_edges_airport + blocked_edges_runway_entry
-            self.blocked_edges = blocked_edges
             self.state = "pushback"
             self.airplane_type = "departure"
             self.pushback_started_at = now
         else:
             self.model.segment_manager.release_edges(blocked_edges_airport, self.unique_id)
             self.model.segment_manager.release_edges(blocked_edges_runway_entry, self.unique_id)
-            self.blocked_edges = []
+            self.model.segment_manager.park(self.unique_id)
     
     def choose_runway_entry(self):
         """Wybór węzła wejścia na pas startowy"""
@@ -220,8 +244,7 @@ class Airplane(Agent):
         
         # Sprawdź czy dotarł do stanowiska
         if self.current_node == self.target_node:
-            self.model.segment_manager.release_edges(self.blocked_edges, self.unique_id)
-            self.blocked_edges = []
+            self.model.segment_manager.release_all(self.unique_id)
             self.model.segment_manager.remove_airplane_from_airport_queue(self.unique_id)
             self.state = "waiting_departure"
             self.target_node = None
@@ -241,19 +264,25 @@ class Airplane(Agent):
         self._move_along_path()
         if self.current_node == self.target_node:
             # Samolot odleciał - usuń z symulacji
-            self.model.segment_manager.release_edges(self.blocked_edges, self.unique_id)
-            self.blocked_edges = []
+            self.model.segment_manager.release_all(self.unique_id)
             self.model.runway_controller.finish_departure()
             if self.current_node is not None:
                 self.model.segment_manager.release_node(self.current_node, self.unique_id)
-            if self in self.model.airplanes:
-                self.model.airplanes.remove(self)
+            self.remove()
+
+    def remove(self):
+        """Usuwa samolot z symulacji: lista modelu, stan oczekiwania, wiersz floty i rejestr agentów Mesa"""
+        if self in self.model.airplanes:
+            self.model.airplanes.remove(self)
+        self.model.segment_manager.remove_airplane(self.unique_id)
+        self.fleet.release(self._row)
+        super().remove()
     
     def _move_along_path(self):
         """Wspólna metoda ruchu po ścieżce z płynnym ruchem i systemem rezerwacji"""
-        # Jeśli aktualnie się poruszamy, aktualizuj pozycję
-        if self.is_moving:
-            self._update_movement()
+        # Ruch między węzłami przelicza faza ruchu modelu (AirportModel.advance_movement);
+        # samolot, który był w ruchu na początku ticku, nie rusza dalej w tym samym ticku
+        if self.is_moving or self.advanced_at == self.model.step_count:
             return
         
         if not self.path:
@@ -268,19 +297,7 @@ class Airplane(Agent):
         if self.path:
             next_node = self.path[0]
 
-            # Oblicz czas ruchu dla tej krawędzi (potrzebujemy duration dla interpolacji)
-            start_pos = self.model.graph.get_node_position(self.current_node)
-            target_pos = self.model.graph.get_node_position(next_node)
             edge_type = self.model.graph.get_edge_type(self.current_node, next_node)
-            if start_pos and target_pos:
-                distance = self.movement_controller.calculate_distance(start_pos, target_pos)
-                if edge_type == "runway":
-                    movement_type = "landing" if self.state == "landing" else "departing"
-                else:
-                    movement_type = self.movement_controller.get_movement_type_for_state(self.state)
-                estimated_duration = self.movement_controller.calculate_movement_time(distance, movement_type)
-            else:
-                estimated_duration = 10  # fallback
 
             # Segment zarezerwowany - rozpocznij ruch
             self._start_movement_to_node(next_node)
@@ -307,81 +324,123 @@ class Airplane(Agent):
                 self.current_node = target_node
                 return
         
-        start_pos = self.model.graph.get_node_position(self.current_node)
-        target_pos = self.model.graph.get_node_position(target_node)
+        graph = self.model.graph
+        start_pos = graph.get_node_position(self.current_node)
+        target_pos = graph.get_node_position(target_node)
+        edge_id = graph.get_edge_id(self.current_node, target_node)
         
         if start_pos and target_pos:
-            # Oblicz czas ruchu na podstawie odległości i typu ruchu
-            distance = self.movement_controller.calculate_distance(start_pos, target_pos)
-            # Wybór typu ruchu: jeśli krawędź to runway, użyj prędkości pasa (szybszej)
-            edge_type = self.model.graph.get_edge_type(self.current_node, target_node)
-            if edge_type == "runway":
-                movement_type = "landing"  # Na pasie poruszamy się szybciej
+            controller = self.movement_controller
+            if edge_id is not None:
+                # Czas ruchu z tablicy przejazdów (typ ruchu wg krawędzi i stanu, zakręt z poprzedniej krawędzi)
+                movement_type = controller.edge_movement_type(graph, edge_id, self.state)
+                self.movement_duration = controller.movement_ticks(graph, edge_id, movement_type, self.movement_edge)
             else:
-                movement_type = self.movement_controller.get_movement_type_for_state(self.state)
-            self.movement_duration = self.movement_controller.calculate_movement_time(distance, movement_type)
+                # Węzły bez krawędzi - czas z odległości
+                distance = controller.calculate_distance(start_pos, target_pos)
+                movement_type = controller.get_movement_type_for_state(self.state)
+                self.movement_duration = controller.calculate_movement_time(distance, movement_type)
             
             # Ustaw parametry ruchu
             self.movement_start_time = self.model.step_count
+            self.movement_edge = edge_id
             self.is_moving = True
             self.position.current_node = self.current_node
             self.position.target_node = target_node
             self.position.progress = 0.0
     
-    def _update_movement(self):
-        """Aktualizuje pozycję podczas ruchu między węzłami"""
-        if not self.is_moving:
-            return
-        
-        target = self.position.target_node
-        if target is not None:
-            
-            status = self.model.segment_manager.get_edge_status(self.position.current_node,target)
-            
-            occupants = status["airplanes"]
-
-
-            if status["occupied"] and self.model.segment_manager._edge_capacity(self.position.current_node,target) >= len(occupants):
+    def _edge_hold(self) -> Optional[Tuple[float, int]]:
+        """(limit postępu, pozycja w kolejce) na krawędzi ruchu albo None, gdy kolejka nie obowiązuje"""
+        segment_manager = self.model.segment_manager
+        current_edge = self.movement_edge
+        occupants = segment_manager.get_edge_occupants(current_edge)
+        if not occupants or segment_manager._edge_capacity_by_id(current_edge) < len(occupants):
+            return None
+        try:
+            pos = occupants.index(self.unique_id)
+        except ValueError:
+            pos = 0
+        return max(0.0, 1 - 0.19 * pos), pos
 
-                self.model.segment_manager.release_edges([x for x in self.blocked_edges if not(x["from"] == self.position.current_node and x["to"] == target)],self.unique_id)
-
-                blocked_edges = [{'from':self.position.current_node,'to':target}]
-                self.blocked_edges = blocked_edges
-
-                try:
-                    pos = occupants.index(self.unique_id)
-                except ValueError:
-                    pos = 0
-                self.hold_progress_limit = max(0.0,1 - 0.19 * pos)
-                if self.position.progress >= self.hold_progress_limit:
-                    return
-
-                
+    def _hold_on_edge(self) -> bool:
+        """
+        Kolejka na zajętej krawędzi ruchu (wywoływane z fazy ruchu modelu): zostawia
+        bieżącą krawędź i zarezerwowany zjazd, ustala limit postępu wg pozycji
+        w kolejce. Zwraca True, gdy samolot w tym ticku stoi.
+        """
+        hold = self._edge_hold()
+        if hold is None:
+            return False
+        segment_manager = self.model.segment_manager
+        current_edge = self.movement_edge
+        segment_manager.release_all(self.unique_id, keep=(current_edge, self.exit_edge_id))
+        self.hold_progress_limit, pos = hold
+        if self.position.progress >= self.hold_progress_limit:
+            if pos:
+                # Czeka na samoloty przed nim na tej krawędzi (graf oczekiwania)
+                segment_manager.wait_behind(self.unique_id, current_edge)
+            return True
+        return False
 
-        # Oblicz postęp ruchu
-        elapsed_time = self.model.step_count - self.movement_start_time
-        
-        progress = min(1.0, elapsed_time / self.movement_duration)
-        progress = max(0.0, progress)
+    def next_step_time(self, now: int) -> Optional[int]:
+        """
+        Pierwszy tick po now, w którym krok samolotu zmieni coś poza licznikami czasu
+        w stanie - None, jeśli obudzi go dopiero zdarzenie (koniec ruchu, przydział pasa,
+        zwolnienie segmentu). Wyznaczane zachowawczo: w razie wątpliwości now + 1.
+        """
+        state = self.state
+        ticks = []
+        if state == "landing":
+            ticks.append(now + max(1, self.max_landing_time - self.landing_time))
+        elif state == "at_stand":
+            ticks.append(now + max(1, self.max_stand_time - self.stand_time))
+        elif state in ("waiting_landing", "waiting_departure"):
+            ticks.append(None if self.is_in_queue else now + 1)
+        elif state in ("at_exit", "pushback_pending"):
+            ticks.append(None if self.model.segment_manager.is_parked(self.unique_id) else now + 1)
+        if state in ("landing", "taxiing_to_exit", "taxiing_to_stand", "pushback", "departing") and not self.is_moving:
+            # Stoi w węźle ścieżki - ruszy albo zmieni stan w następnym kroku
+            ticks.append(now + 1)
+        ticks = [tick for tick in ticks if tick is not None]
+        return min(ticks) if ticks else None
 
-        if progress >= self.hold_progress_limit if self.hold_progress_limit is not None else False:
-            progress = self.hold_progress_limit
-        
-        # Interpoluj pozycję
-        start_pos = self.model.graph.get_node_position(self.position.current_node)
-        target_pos = self.model.graph.get_node_position(self.position.target_node)
+    def next_activity(self, now: int) -> Optional[int]:
+        """Jak next_step_time, ale z fazą ruchu: tick dojścia do końca krawędzi lub limitu postoju"""
+        ticks = [self.next_step_time(now)]
+        if self.is_moving:
+            ticks.append(self._movement_event(now))
+        ticks = [tick for tick in ticks if tick is not None]
+        return min(ticks) if ticks else None
 
+    def _movement_event(self, now: int) -> Optional[int]:
+        """Tick dojścia do limitu postępu / celu krawędzi albo początku postoju w kolejce"""
+        if self.advanced_at != now:
+            # Ruch zaczęty po fazie ruchu - limit ustali dopiero następna faza
+            return now + 1
+        segment_manager = self.model.segment_manager
+        limit = self.hold_progress_limit
+        edge = self.movement_edge
+        if edge is not None and segment_manager.edge_occupancy[edge] > 0:
+            hold = self._edge_hold()
+            if hold is not None:
+                held = set(segment_manager.held_edge_ids(self.unique_id))
+                if not held.issubset((edge, self.exit_edge_id)):
+                    return now + 1
+                limit, pos = hold
+                if self.position.progress >= limit:
+                    # Stoi w kolejce; stan ustalony, gdy czeka już w grafie oczekiwania
+                    if pos and not segment_manager.is_waiting(self.unique_id, edge):
+                        return now + 1
+                    return None
+        limit = 1.0 if limit is None else min(limit, 1.0)
+        if self.position.progress >= limit:
+            return None
+        start, duration = self.movement_start_time, self.movement_duration
+        tick = max(now + 1, start + int(limit * duration) - 1)
+        while (tick - start) / duration < limit:
+            tick += 1
+        return tick
 
-        if start_pos and target_pos:
-            self.position.x, self.position.y = self.movement_controller.interpolate_position(
-                start_pos, target_pos, progress
-            )
-            self.position.progress = progress
-        
-        # Sprawdź czy ruch się zakończył
-        if progress >= 1.0:
-            self._finish_movement()
-    
     def _finish_movement(self):
         """Kończy ruch i aktualizuje pozycję"""
         if self.position.target_node:
@@ -1,7 +1,14 @@
+from typing import Optional
+
 from mesa import Agent
+from src.queues import IndexedPriorityQueue
+from src.runway_sequencer import RunwaySequencer
 
 class RunwayController(Agent):
     """Agent kontrolujący pas startowy, kolejkę lądowania i startów"""
+
+    # Priorytet uśpionego lądującego: budzony przed kołującymi i startującymi (0)
+    LANDING_WAIT_PRIORITY = 1
     
     def __init__(self, model, unique_id, wind_direction="07"):
         super().__init__(model)
@@ -9,10 +16,14 @@ class RunwayController(Agent):
         self.is_busy = False
         self.current_airplane = None
         self.current_operation = None  # "landing" lub "departure"
-        self.runway_queue = []  # Kolejka samolotów oczekujących na pasie startowym
+        # Kolejka samolotów oczekujących na pas: wg priorytetu, potem kolejności zgłoszenia
+        self.runway_queue = IndexedPriorityQueue()
+        self._queue_info = ((), [])
         self.wind_direction = wind_direction  # "07" lub "25"
         self.active_runway = None  # Aktywny węzeł pasa startowego
         self.set_active_runway()
+        # Kolejność obsługi w oknie kolejki (minimalizacja sumy separacji)
+        self.sequencer = RunwaySequencer(model.segment_manager.atc.gaps)
     
     def set_active_runway(self):
         """Ustaw aktywny pas startowy na podstawie kierunku wiatru"""
@@ -35,44 +46,94 @@ class RunwayController(Agent):
         else:
             return 1
     
+    def _candidate(self, now: int):
+        """(okno kolejki, indeks) samolotu, którym kontroler zajmie się w ticku now, albo None"""
+        if self.is_busy or not self.active_runway or not self.runway_queue:
+            return None
+        segment_manager = self.model.segment_manager
+        atc = segment_manager.atc
+        ready = (max(0, atc.earliest("T") - now), max(0, atc.earliest("L") - now))
+        window = self.runway_queue.smallest(self.sequencer.window)
+        index = self.sequencer.choose(window, ready)
+        # Wybrany samolot czeka uśpiony na zwolnienie pasa / zjazdu; miejsce mogło się
+        # zwolnić, a obudzony został ktoś inny - wtedy kontroler ponawia prośbę sam
+        airplane_id = window[index].unique_id
+        if segment_manager.is_parked(airplane_id) and not segment_manager.can_retry(airplane_id):
+            return None
+        return window, index
+
+    def is_idle_at(self, now: int) -> bool:
+        """Czy krok w ticku now nic nie zmieni (bez zmian stanu w międzyczasie)"""
+        candidate = self._candidate(now)
+        if candidate is None:
+            return True
+        window, index = candidate
+        if window[index].airplane_type == "arrival":
+            return not self._can_land_now(now)
+        return not self._can_depart_now(now)
+
+    def next_activity(self, now: int) -> Optional[int]:
+        """Pierwszy tick po now, w którym kontroler spróbuje operacji (None - nigdy bez zmian stanu)"""
+        if self.is_busy or not self.active_runway or not self.runway_queue:
+            return None
+        atc = self.model.segment_manager.atc
+        # Od chwili, gdy obie operacje są dozwolone, wybór samolotu już się nie zmienia
+        horizon = max(atc.earliest("T"), atc.earliest("L"), now + 1)
+        for tick in range(now + 1, horizon + 1):
+            if not self.is_idle_at(tick):
+                return tick
+        return None
+
     def step(self):
         """Logika kontrolera pasa startowego"""
-        if self.is_busy or not self.active_runway:
-            return
-
         now = self.model.step_count
         # Priorytet dla samolotów na pasie startowym
-        if self.runway_queue:
-            airplane = self.runway_queue[0]
+        candidate = self._candidate(now)
+        if candidate is not None:
+            segment_manager = self.model.segment_manager
+            window, index = candidate
+            airplane = window[index]
             print(f"Samolot {airplane.unique_id} w kolejce na pasie startowym")
             print(f"Samolot {airplane.airplane_type}")
             if airplane.airplane_type == "arrival":
+                # Separacja od poprzedniej operacji na pasie (ATC)
+                if not self._can_land_now(now):
+                    return
                 granted,blocked_edges = self.model.segment_manager.request_airport_section("runway", airplane.unique_id)
                 if granted:
                     if airplane.choose_exit():
-                        airplane.blocked_edges = blocked_edges
-                        airplane = self.runway_queue.pop(0)
+                        self.sequencer.served(window, index)
+                        self.runway_queue.remove(airplane)
                         self._start_operation(airplane)
                         return
                 else:
                     self.model.segment_manager.release_edges(blocked_edges, airplane.unique_id)
+                segment_manager.park(airplane.unique_id, priority=self.LANDING_WAIT_PRIORITY)
                         
             elif airplane.airplane_type == "departure":
+                if not self._can_depart_now(now):
+                    return
                 granted,blocked_edges = self.model.segment_manager.request_airport_section("runway", airplane.unique_id)
                 if granted:
-                    airplane.blocked_edges = blocked_edges
-                    airplane = self.runway_queue.pop(0)
+                    self.sequencer.served(window, index)
+                    self.runway_queue.remove(airplane)
                     self._start_operation(airplane)
                     return
                 else:
                     self.model.segment_manager.release_edges(blocked_edges, airplane.unique_id)
+                    segment_manager.park(airplane.unique_id)
                     
 
     
     def add_to_runway_queue(self, airplane):
         """Dodaj samolot do kolejki na pasie startowym"""
-        if airplane not in self.runway_queue:
-            self.runway_queue.append(airplane)
+        self.runway_queue.push(airplane, airplane.priority)
+
+    def set_priority(self, airplane, priority: int):
+        """Zmienia priorytet samolotu (także w kolejce, jeśli w niej czeka)"""
+        airplane.priority = priority
+        if airplane in self.runway_queue:
+            self.runway_queue.update(airplane, priority)
     
 
     def finish_landing(self):
@@ -93,7 +154,10 @@ class RunwayController(Agent):
     
     def get_runway_queue_info(self):
         """Zwraca informacje o kolejce lądowań"""
-        return [f"A{plane.unique_id}" for plane in self.runway_queue]
+        snapshot = self.runway_queue.snapshot()
+        if self._queue_info[0] is not snapshot:
+            self._queue_info = (snapshot, [f"A{plane.unique_id}" for plane in snapshot])
+        return self._queue_info[1]
     
 
     # --- Metody pomocnicze ---
@@ -102,9 +166,12 @@ class RunwayController(Agent):
         self.is_busy = True
         self.current_airplane = airplane
         airplane.is_in_queue = False
+        self.model.scheduler.wake(airplane)
 
+        now = self.model.step_count
         if airplane.airplane_type == "arrival":
             self.current_operation = "landing"
+            self.model.segment_manager.atc.grant_landing(now)
     
             airplane.current_node = self.active_runway
 
@@ -117,6 +184,7 @@ class RunwayController(Agent):
             airplane.landing_time = 0
         else:
             self.current_operation = "departure"
+            self.model.segment_manager.atc.grant_takeoff(now)
             airplane.target_node = self.active_runway
             airplane.path = self.model.graph.find_shortest_path(airplane.current_node, airplane.target_node)
             if len(airplane.path) > 1:
@@ -124,11 +192,11 @@ class RunwayController(Agent):
             airplane.state = "departing"
             airplane.departure_time = 0
 
-    def _can_land_now(self, _now: int) -> bool:
-        return True
+    def _can_land_now(self, now: int) -> bool:
+        return self.model.segment_manager.atc.can_land(now)
 
-    def _can_depart_now(self, _now: int) -> bool:
-        return True
+    def _can_depart_now(self, now: int) -> bool:
+        return self.model.segment_manager.atc.can_takeoff(now)
 
     def _landing_duration_ticks(self) -> int:
         return 3
@@ -0,0 +1,92 @@
+"""
+Silnik zdarzeniowy dla AirportModel
+
+Zamiast wykonywać krok w każdym ticku, silnik trzyma kolejkę priorytetową
+najbliższych zdarzeń (kontroler pasa i każdy samolot podaje tick, w którym
+jego krok zmieni coś poza licznikami) i przeskakuje czas do najbliższego z nich.
+W tickach pominiętych jedynymi zmianami są liczniki czasu w stanach (nanoszone
+zbiorczo na tablice floty) i losowanie przylotu - losowane jest tick po ticku,
+tym samym generatorem, więc trajektorie w tickach zdarzeń są identyczne jak
+w silniku ticków. W tickach zdarzeń wykonywany jest zwykły AirportModel.step.
+"""
+
+import math
+
+from src.queues import IndexedPriorityQueue
+
+
+class EventEngine:
+    """Przeskakiwanie cichych ticków między zdarzeniami modelu"""
+
+    def __init__(self, model):
+        self.model = model
+        # Źródło zdarzeń (kontroler pasa, samolot) -> priorytet = -tick zdarzenia
+        self.events = IndexedPriorityQueue()
+        # Samoloty dodane, obudzone lub po kroku - tylko one (i poruszające się) zmieniają tick zdarzenia
+        model.scheduler.touched = set(model.airplanes)
+        # Statystyka: ile ticków wykonano, a ile pominięto
+        self.steps_run = 0
+        self.ticks_skipped = 0
+
+    def schedule(self):
+        """
+        Przelicza tick najbliższego zdarzenia źródeł, które mogły go zmienić od ostatniego
+        wywołania: kontrolera pasa, samolotów, które wykonały krok lub zostały obudzone
+        (ActiveSetScheduler.touched), i poruszających się (zdarzenie ruchu zależy od kolejki
+        na krawędzi). Pozostałym tick zdarzenia się nie zmienia - na tym samym opiera się
+        usypianie w harmonogramie.
+        """
+        model = self.model
+        now = model.step_count
+        touched = model.scheduler.touched
+        fleet = model.fleet
+        sources = [model.runway_controller]
+        sources.extend(touched)
+        touched.clear()
+        sources.extend(fleet.owner[row] for row in fleet.moving_rows().tolist())
+        events = self.events
+        for source in dict.fromkeys(sources):
+            tick = source.next_activity(now)
+            if tick is None:
+                events.discard(source)
+            elif source not in events:
+                events.push(source, -tick)
+            elif events.priority(source) != -tick:
+                events.update(source, -tick)
+
+    def remove(self, source):
+        """Wyrejestrowuje źródło zdarzeń (np. samolot po odlocie)"""
+        self.events.discard(source)
+
+    def next_event_time(self) -> float:
+        """Tick najbliższego zdarzenia (math.inf, gdy bez przylotów nic się już nie wydarzy)"""
+        self.schedule()
+        head = self.events.peek()
+        return math.inf if head is None else -self.events.priority(head)
+
+    def run_until(self, until: int):
+        """Symuluje do ticku until (wykonany jako pełny krok)"""
+        model = self.model
+        while model.running and model.step_count < until:
+            target = min(self.next_event_time(), until)
+            # Losowanie przylotu w cichych tickach - przylot też jest zdarzeniem
+            draw, rate = model.random.random, model.arrival_rate
+            quiet = gap = target - model.step_count - 1
+            spawned = None
+            for tick in range(gap):
+                if draw() < rate:
+                    quiet, spawned = tick, True
+                    break
+            self._skip(quiet)
+            model.step(spawned=spawned)
+            self.steps_run += 1
+
+    def _skip(self, ticks: int):
+        """Przesuwa czas o `ticks` cichych ticków: tylko liczniki w stanach"""
+        if not ticks:
+            return
+        model = self.model
+        model.fleet.add_state_time(model.fleet.active_rows(), ticks)
+        model.step_count += ticks
+        model.steps += ticks
+        self.ticks_skipped += ticks
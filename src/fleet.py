@@ -0,0 +1,202 @@
+"""
+Magazyn stanu floty w układzie struktury tablic (SoA)
+
+Gorący stan samolotów (kod stanu, węzły, pozycja, postęp i czasy ruchu,
+liczniki) leży w tablicach NumPy indeksowanych numerem wiersza. Obiekt
+Airplane trzyma tylko swój wiersz, a atrybuty czyta i zapisuje przez
+deskryptory (FleetField, IdField, OptionalField, StateField) - dzięki temu
+kod agentów się nie zmienia, a faza ruchu modelu przetwarza wszystkie
+samoloty jedną operacją na tablicach. Zwolnione wiersze są używane ponownie.
+"""
+
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+# Stany samolotu; kod stanu = indeks w krotce
+STATES: Tuple[str, ...] = (
+    "waiting_landing", "landing", "taxiing_to_exit", "at_exit", "taxiing_to_stand",
+    "at_stand", "pushback_pending", "pushback", "taxiing_to_runway",
+    "waiting_departure", "departing",
+)
+STATE_CODES: Dict[str, int] = {name: code for code, name in enumerate(STATES)}
+
+# Brak węzła / krawędzi (None) w tablicach id
+NO_NODE = -1
+
+# Liczniki czasu zwiększane w każdym ticku w danym stanie (Airplane.step)
+STATE_TIMERS: Tuple[Tuple[str, str], ...] = (
+    ("landing", "landing_time"), ("at_stand", "stand_time"), ("departing", "departure_time"),
+)
+
+
+class FleetStore:
+    """Tablice stanu floty, jeden wiersz na samolot"""
+
+    # nazwa tablicy -> (typ NumPy, wartość początkowa)
+    FIELDS: Dict[str, Tuple[type, object]] = {
+        'state': (np.int8, 0),
+        'current_node': (np.int64, NO_NODE),
+        'target_node': (np.int64, NO_NODE),
+        # Pozycja z interpolacją (odpowiednik Position)
+        'x': (np.float64, 0.0),
+        'y': (np.float64, 0.0),
+        'pos_current_node': (np.int64, NO_NODE),
+        'pos_target_node': (np.int64, NO_NODE),
+        'progress': (np.float64, 0.0),
+        # Ruch między węzłami: krawędź ruchu, limit postępu (NaN = brak), tick ostatniej fazy ruchu
+        'is_moving': (np.bool_, False),
+        'movement_start': (np.int64, 0),
+        'movement_duration': (np.int64, 1),
+        'movement_edge': (np.int64, NO_NODE),
+        'hold_limit': (np.float64, np.nan),
+        'advanced_at': (np.int64, -1),
+        # Liczniki
+        'landing_time': (np.int32, 0),
+        'stand_time': (np.int32, 0),
+        'departure_time': (np.int32, 0),
+        'wait_time': (np.int32, 0),
+        'active': (np.bool_, False),
+    }
+
+    def __init__(self, capacity: int = 64):
+        self.capacity = 0
+        # Właściciel wiersza (obiekt Airplane) - do zdarzeń z fazy ruchu
+        self.owner: List[object] = []
+        self._free: List[int] = []
+        self._next = 0
+        for name, (dtype, _) in self.FIELDS.items():
+            setattr(self, name, np.empty(0, dtype=dtype))
+        self._grow(max(1, capacity))
+
+    def __len__(self) -> int:
+        """Liczba zajętych wierszy"""
+        return self._next - len(self._free)
+
+    def _grow(self, capacity: int):
+        for name, (dtype, fill) in self.FIELDS.items():
+            old = getattr(self, name)
+            new = np.full(capacity, fill, dtype=dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self.owner.extend([None] * (capacity - self.capacity))
+        self.capacity = capacity
+
+    def allocate(self, owner=None) -> int:
+        """Zajmuje wiersz (z wartościami początkowymi) i zwraca jego numer"""
+        if self._free:
+            row = self._free.pop()
+        else:
+            if self._next == self.capacity:
+                self._grow(2 * self.capacity)
+            row = self._next
+            self._next += 1
+        for name, (_, fill) in self.FIELDS.items():
+            getattr(self, name)[row] = fill
+        self.active[row] = True
+        self.owner[row] = owner
+        return row
+
+    def release(self, row: int):
+        """Zwalnia wiersz samolotu, który opuścił symulację"""
+        if self.active[row]:
+            self.active[row] = False
+            self.owner[row] = None
+            self._free.append(row)
+
+    def active_rows(self) -> np.ndarray:
+        return np.flatnonzero(self.active[:self._next])
+
+    def moving_rows(self) -> np.ndarray:
+        n = self._next
+        return np.flatnonzero(self.active[:n] & self.is_moving[:n])
+
+    def add_state_time(self, rows: np.ndarray, ticks: int = 1):
+        """Zwiększa liczniki czasu w stanie (STATE_TIMERS) wierszom, których krok pominięto"""
+        if len(rows) == 0:
+            return
+        states = self.state[rows]
+        for state, counter in STATE_TIMERS:
+            getattr(self, counter)[rows[states == STATE_CODES[state]]] += ticks
+
+    def state_counts(self) -> Dict[str, int]:
+        """Liczba samolotów w każdym stanie (jedno przejście po tablicy)"""
+        rows = self.active_rows()
+        counts = np.bincount(self.state[rows], minlength=len(STATES))
+        return {STATES[code]: int(n) for code, n in enumerate(counts) if n}
+
+
+class FleetField:
+    """
+    Deskryptor atrybutu przechowywanego w FleetStore (liczba lub bool).
+    Obiekt musi mieć atrybuty `fleet` (FleetStore) i `_row`. Odczyt zwraca typy Pythona.
+    """
+
+    def __init__(self, array: str):
+        self.array = array
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return obj.fleet.__dict__[self.array].item(obj._row)
+
+    def __set__(self, obj, value):
+        obj.fleet.__dict__[self.array][obj._row] = value
+
+
+class IdField(FleetField):
+    """Id węzła / krawędzi lub None (NO_NODE w tablicy)"""
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = obj.fleet.__dict__[self.array].item(obj._row)
+        return None if value == NO_NODE else value
+
+    def __set__(self, obj, value):
+        obj.fleet.__dict__[self.array][obj._row] = NO_NODE if value is None else value
+
+
+class OptionalField(FleetField):
+    """Liczba zmiennoprzecinkowa lub None (NaN w tablicy)"""
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        value = obj.fleet.__dict__[self.array].item(obj._row)
+        return None if value != value else value
+
+    def __set__(self, obj, value):
+        obj.fleet.__dict__[self.array][obj._row] = np.nan if value is None else value
+
+
+class StateField(FleetField):
+    """Nazwa stanu (kod stanu w tablicy)"""
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return STATES[obj.fleet.__dict__[self.array].item(obj._row)]
+
+    def __set__(self, obj, value):
+        obj.fleet.__dict__[self.array][obj._row] = STATE_CODES[value]
+
+
+class FleetPosition:
+    """Widok pozycji samolotu w FleetStore (interfejs jak movement_controller.Position)"""
+
+    __slots__ = ('fleet', '_row')
+
+    x = FleetField('x')
+    y = FleetField('y')
+    current_node = IdField('pos_current_node')
+    target_node = IdField('pos_target_node')
+    progress = FleetField('progress')
+
+    def __init__(self, fleet: FleetStore, row: int):
+        self.fleet = fleet
+        self._row = row
+
+    def __repr__(self) -> str:
+        return (f"FleetPosition(x={self.x}, y={self.y}, current_node={self.current_node}, "
+                f"target_node={self.target_node}, progress={self.progress})")
@@ -1,224 +1,678 @@
-import pandas as pd
-import networkx as nx
-from typing import Dict, List, Tuple, Optional, Any
+import os
+import zipfile
+import numpy as np
+from typing import Callable, Dict, List, Tuple, Optional, Any
+from src import graph_cache
+from src.routing import RouteTable, heuristic_scale
+
+# Dozwolone kierunki ruchu po krawędzi (względem orientacji from -> to z CSV)
+DIR_BOTH, DIR_AB, DIR_BA = 0, 1, 2
+DIRECTION_NAMES = ('AB_BA', 'AB', 'BA')
+
+
+def _holding_allowed(edge_types: np.ndarray, descs: np.ndarray) -> np.ndarray:
+    """
+    Klasyfikacja miejsc oczekiwania (wektorowo dla wszystkich krawędzi)
+
+    Dozwolone: gate/stand_link, "taxiway a/c/d/f", "runway_entry" (hold short), powietrze (poza grafem)
+    Zabronione: apron (brak w CSV jako typ), runway, "taxiway b", "runway_exit"
+    """
+    descs = descs.astype(str)
+    taxiway_b = np.char.find(descs, 'taxiway b') >= 0
+    taxiway_acdf = np.zeros(len(descs), dtype=bool)
+    for name in ('taxiway a', 'taxiway c', 'taxiway d', 'taxiway f'):
+        taxiway_acdf |= np.char.find(descs, name) >= 0
+
+    # Reguły sprawdzane od końca, żeby wcześniejsze miały pierwszeństwo
+    allowed = edge_types == 'taxiway'  # Fallback: zwykły taxiway dozwolony
+    allowed = np.where(taxiway_acdf, True, allowed)
+    allowed = np.where(taxiway_b, False, allowed)
+    allowed = np.where(edge_types == 'runway_entry', True, allowed)
+    allowed = np.where(np.isin(edge_types, ('runway', 'runway_exit')), False, allowed)
+    allowed = np.where(edge_types == 'stand_link', True, allowed)
+    return allowed.astype(bool)
+
 
 class AirportGraph:
     """
     Klasa reprezentująca strukturę lotniska jako graf
+
+    Dane grafu trzymane są w tablicach NumPy (węzły i krawędzie pod gęstymi
+    indeksami, sąsiedztwo w formacie CSR). Grafy networkx (`graph`, `digraph`)
+    budowane są leniwie, dopiero gdy ktoś ich potrzebuje. Jeśli istnieje aktualny
+    skompilowany cache (src/graph_cache.py), graf wczytywany jest z niego bez pandas.
     """
-    
-    def __init__(self, nodes_file: str, edges_file: str):
+
+    def __init__(self, nodes_file: str, edges_file: str, use_cache: bool = True,
+                 cache_dir: Optional[str] = None, route_strategy: str = "astar"):
         """
         Inicjalizacja grafu lotniska z plików CSV
-        
+
         Args:
             nodes_file: ścieżka do pliku nodes.csv
             edges_file: ścieżka do pliku edges.csv
+            use_cache: czy wczytać skompilowany cache, jeśli pasuje do plików CSV
+            cache_dir: katalog cache (domyślnie .airport_cache obok nodes.csv)
+            route_strategy: strategia zapytań spoza policzonej tablicy tras
+                            ("table", "dijkstra" lub "astar", patrz src/routing.py)
         """
-        self.nodes_df = pd.read_csv(nodes_file)
-        self.edges_df = pd.read_csv(edges_file)
-        
-        # Nieskierowany graf do przechowywania pełnych danych geometrycznych/atr.
-        self.graph = nx.Graph()
-        # Skierowany graf do planowania tras (respektuje jednokierunkowość)
-        self.digraph = nx.DiGraph()
-        # Słownik punktów konfliktów: id -> lista (u,v) lub node_id
+        # Punkty konfliktów: id -> {'description', 'edges': [(u,v)], 'nodes': [node_id]}
         self.conflict_points: Dict[int, Dict[str, Any]] = {}
-        
-        # Dodawanie węzłów
-        for _, node in self.nodes_df.iterrows():
-            self.graph.add_node(
-                node['id'],
-                type=node['type'],
-                name=node['name'],
-                x=node['x'],
-                y=node['y'],
-                notes=node['notes']
-            )
-            # Węzły również w digraph (dla spójności)
-            self.digraph.add_node(node['id'])
-        
-        # Dodawanie krawędzi - wszystkie jako dwukierunkowe
-        for _, edge in self.edges_df.iterrows():
-            u = int(edge['from'])
-            v = int(edge['to'])
-            
-            # Sprawdź czy węzły istnieją
-            if u not in self.graph.nodes or v not in self.graph.nodes:
+        # Obserwatorzy zmian krawędzi: callback(edge_id, zmiana), patrz add_listener
+        self._listeners: List[Callable[[int, str], None]] = []
+        # Wersja grafu - zwiększana przy zmianie struktury, unieważnia tablicę tras
+        # (zamknięcia i kierunki krawędzi poprawiają tablicę przyrostowo, bez zmiany wersji)
+        self.version = 0
+        self._routes: Optional[RouteTable] = None
+        self._route_strategy = route_strategy
+        # Leniwe widoki networkx
+        self._graph = None
+        self._digraph = None
+
+        compiled = self._read_cache(nodes_file, edges_file, cache_dir) if use_cache else None
+        if compiled is not None:
+            self._load_compiled(compiled)
+        else:
+            self._load_csv(nodes_file, edges_file)
+            self._build_core()
+            # Tablica tras budowana raz przy wczytaniu grafu
+            self._routes = self._build_route_table()
+
+    # --- Wczytywanie ---
+    @staticmethod
+    def _read_cache(nodes_file: str, edges_file: str,
+                    cache_dir: Optional[str] = None) -> Optional[Dict[str, np.ndarray]]:
+        """Tablice ze skompilowanego cache lub None, gdy brak aktualnego pliku"""
+        path = graph_cache.cache_path(nodes_file, edges_file, cache_dir)
+        if not os.path.exists(path):
+            return None
+        try:
+            return graph_cache.load_graph_arrays(path)
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            print(f"Błąd podczas wczytywania cache grafu {path}: {e}")
+            return None
+
+    def _load_compiled(self, compiled: Dict[str, np.ndarray]):
+        """Odtwarza graf z tablic cache (bez parsowania CSV i bez liczenia tras)"""
+        for name in graph_cache.GRAPH_ARRAYS:
+            setattr(self, name, compiled[name])
+        self.edge_conflict_points = {}
+        self._build_lookups()
+
+        offsets = compiled['edge_type_offsets'].tolist()
+        type_ids = compiled['edge_type_ids']
+        edge_ids_by_type = {}
+        for i, edge_type in enumerate(compiled['edge_type_names'].tolist()):
+            ids = type_ids[offsets[i]:offsets[i + 1]].astype(np.int32)
+            ids.flags.writeable = False
+            edge_ids_by_type[edge_type] = ids
+        self._build_type_indexes(edge_ids_by_type)
+
+        self._routes = self._build_route_table(precompute=False)
+        self._routes.import_rows(compiled['route_sources'], compiled['route_pred'], compiled['route_dist'])
+
+    def _load_csv(self, nodes_file: str, edges_file: str):
+        """Wczytuje CSV do tablic węzłów i krawędzi (bez pętli po wierszach)"""
+        import pandas as pd
+
+        nodes_df = pd.read_csv(nodes_file)
+        edges_df = pd.read_csv(edges_file)
+
+        # Węzły: gęsty indeks = pozycja w pliku
+        self.node_ids = nodes_df['id'].to_numpy(dtype=np.int64)
+        self.node_x = nodes_df['x'].to_numpy(dtype=np.float64)
+        self.node_y = nodes_df['y'].to_numpy(dtype=np.float64)
+        self.node_types = nodes_df['type'].astype(str).to_numpy(dtype=str)
+        self.node_names = nodes_df['name'].astype(str).to_numpy(dtype=str)
+        self.node_notes = nodes_df['notes'].astype(str).to_numpy(dtype=str)
+
+        # Krawędzie: mapowanie id węzłów na gęste indeksy
+        order = np.argsort(self.node_ids, kind='stable')
+        sorted_ids = self.node_ids[order]
+        src = edges_df['from'].to_numpy(dtype=np.int64)
+        dst = edges_df['to'].to_numpy(dtype=np.int64)
+        src_pos = np.clip(np.searchsorted(sorted_ids, src), 0, max(len(sorted_ids) - 1, 0))
+        dst_pos = np.clip(np.searchsorted(sorted_ids, dst), 0, max(len(sorted_ids) - 1, 0))
+        # Pomiń krawędzie do nieistniejących węzłów
+        valid = (sorted_ids[src_pos] == src) & (sorted_ids[dst_pos] == dst)
+        u = order[src_pos][valid]
+        v = order[dst_pos][valid]
+
+        if 'type' in edges_df:
+            edge_types = edges_df['type'].astype(str).to_numpy(dtype=str)[valid]
+        else:
+            edge_types = np.full(len(u), 'taxiway')
+        if 'length' in edges_df:
+            lengths = edges_df['length'].to_numpy(dtype=np.float64)[valid]
+        else:
+            lengths = np.zeros(len(u))
+        if 'desc' in edges_df:
+            descs = edges_df['desc'].astype(str).str.strip().str.lower().to_numpy(dtype=str)[valid]
+        else:
+            descs = np.full(len(u), '')
+
+        # Powtórzona krawędź (u,v) zachowuje pierwszą pozycję i ostatnie atrybuty (jak networkx)
+        n = max(len(self.node_ids), 1)
+        keys = np.minimum(u, v) * n + np.maximum(u, v)
+        _, first = np.unique(keys, return_index=True)
+        _, last_rev = np.unique(keys[::-1], return_index=True)
+        last = len(keys) - 1 - last_rev
+        rows = last[np.argsort(first, kind='stable')]
+
+        self.edge_u = u[rows].astype(np.int32)
+        self.edge_v = v[rows].astype(np.int32)
+        self.edge_types = edge_types[rows]
+        self.edge_length = lengths[rows]
+        self.edge_desc = descs[rows]
+        self.edge_holding = _holding_allowed(self.edge_types, self.edge_desc)
+        # Atrybuty rozszerzone (domyślnie puste)
+        self.edge_capacity = np.zeros(len(rows), dtype=np.int32)  # 0 = brak limitu w danych
+        self.edge_speed_straight = np.full(len(rows), np.nan)
+        self.edge_speed_turn = np.full(len(rows), np.nan)
+        # Punkty konfliktów przypięte do krawędzi: id krawędzi -> lista id punktów
+        self.edge_conflict_points: Dict[int, List[int]] = {}
+
+    def _build_core(self):
+        """Buduje sąsiedztwo CSR i indeksy z tablic węzłów i krawędzi"""
+        num_nodes = len(self.node_ids)
+        num_edges = len(self.edge_u)
+
+        # CSR: łuki skierowane w obu kierunkach, kolejność jak w pliku krawędzi
+        arc_src = np.empty(2 * num_edges, dtype=np.int32)
+        arc_dst = np.empty(2 * num_edges, dtype=np.int32)
+        arc_src[0::2], arc_src[1::2] = self.edge_u, self.edge_v
+        arc_dst[0::2], arc_dst[1::2] = self.edge_v, self.edge_u
+        arc_edge = np.repeat(np.arange(num_edges, dtype=np.int32), 2)
+        keep = np.ones(2 * num_edges, dtype=bool)
+        keep[1::2] = self.edge_u != self.edge_v  # pętla własna tylko raz
+        arc_src, arc_dst, arc_edge = arc_src[keep], arc_dst[keep], arc_edge[keep]
+        order = np.argsort(arc_src, kind='stable')
+        self.csr_indices = arc_dst[order]
+        self.csr_edge = arc_edge[order]
+        self.csr_indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(arc_src, minlength=num_nodes), out=self.csr_indptr[1:])
+
+        self._build_lookups()
+        self._build_type_indexes()
+
+    def _build_lookups(self):
+        """Słowniki id -> indeks gęsty dla węzłów i krawędzi"""
+        node_id_list = self.node_ids.tolist()
+        self._node_index: Dict[int, int] = {node_id: i for i, node_id in enumerate(node_id_list)}
+        self._node_pos: List[Tuple[float, float]] = list(zip(self.node_x.tolist(), self.node_y.tolist()))
+        # Gęsta tablica id -> indeks (-1 = brak węzła) dla zapytań wektorowych
+        size = int(self.node_ids.max()) + 1 if len(self.node_ids) else 0
+        self._node_lookup = np.full(max(size, 0), -1, dtype=np.int64)
+        self._node_lookup[self.node_ids[self.node_ids >= 0]] = np.flatnonzero(self.node_ids >= 0)
+
+        # (u,v) w obu orientacjach -> id krawędzi
+        u_ids = self.node_ids[self.edge_u].tolist()
+        v_ids = self.node_ids[self.edge_v].tolist()
+        self._edge_ids: Dict[Tuple[int, int], int] = {}
+        for edge_id, (a, b) in enumerate(zip(u_ids, v_ids)):
+            self._edge_ids[(a, b)] = edge_id
+            self._edge_ids[(b, a)] = edge_id
+        self._edge_types_list: List[str] = self.edge_types.tolist()
+        self._build_arc_state()
+
+    def _build_arc_state(self):
+        """Stan zmienny w trakcie symulacji: kierunki, zamknięcia i włączone łuki CSR"""
+        num_edges = self.num_edges
+        self.edge_allowed_dir = np.zeros(num_edges, dtype=np.int8)
+        self.edge_closed = np.zeros(num_edges, dtype=bool)
+        arc_src = np.repeat(np.arange(self.num_nodes, dtype=np.int32), np.diff(self.csr_indptr))
+        # Łuk "do przodu" = zgodny z orientacją krawędzi from -> to
+        self.csr_forward = self.edge_u[self.csr_edge] == arc_src
+        self.arc_enabled = np.ones(len(self.csr_indices), dtype=bool)
+        # id krawędzi -> (łuk from->to, łuk to->from), -1 gdy brak (pętla własna)
+        self._edge_arcs = np.full((num_edges, 2), -1, dtype=np.int64)
+        backward = ~self.csr_forward
+        self._edge_arcs[self.csr_edge[self.csr_forward], 0] = np.flatnonzero(self.csr_forward)
+        self._edge_arcs[self.csr_edge[backward], 1] = np.flatnonzero(backward)
+
+    # --- Indeksy typów ---
+    def _build_type_indexes(self, edge_ids_by_type: Optional[Dict[str, np.ndarray]] = None):
+        """Buduje niezmienne indeksy krawędzi i węzłów według typu (raz, przy wczytaniu)"""
+        if edge_ids_by_type is None:
+            edge_ids_by_type = {}
+            types, inverse = np.unique(self.edge_types, return_inverse=True)
+            order = np.argsort(inverse, kind='stable')
+            bounds = np.searchsorted(inverse[order], np.arange(len(types) + 1))
+            for i, edge_type in enumerate(types.tolist()):
+                ids = order[bounds[i]:bounds[i + 1]].astype(np.int32)
+                ids.flags.writeable = False
+                edge_ids_by_type[edge_type] = ids
+        self._edge_ids_by_type: Dict[str, np.ndarray] = edge_ids_by_type
+        self._edge_type_counts = {t: len(ids) for t, ids in self._edge_ids_by_type.items()}
+        # Rekordy krawędzi tworzone przy pierwszym zapytaniu o dany typ
+        self._edges_by_type: Dict[str, Tuple[Dict, ...]] = {}
+        self._edges_by_types: Dict[Tuple[str, ...], Tuple[Dict, ...]] = {}
+        self._edge_records: Dict[int, Dict] = {}
+
+        self._nodes_by_type: Dict[str, Tuple[int, ...]] = {}
+        for node_type in dict.fromkeys(self.node_types.tolist()):
+            self._nodes_by_type[node_type] = tuple(self.node_ids[self.node_types == node_type].tolist())
+
+    def edge_record(self, edge_id: int) -> Dict:
+        """Rekord krawędzi {'from','to','type','length'} (współdzielony - nie modyfikować)"""
+        record = self._edge_records.get(edge_id)
+        if record is None:
+            record = {
+                'from': int(self.node_ids[self.edge_u[edge_id]]),
+                'to': int(self.node_ids[self.edge_v[edge_id]]),
+                'type': self._edge_types_list[edge_id],
+                'length': float(self.edge_length[edge_id]),
+            }
+            self._edge_records[edge_id] = record
+        return record
+
+    # --- Leniwe widoki networkx ---
+    @property
+    def graph(self) -> "nx.Graph":
+        """Nieskierowany graf z pełnymi atrybutami (budowany przy pierwszym użyciu)"""
+        if self._graph is None:
+            self._graph = self._build_nx_graph()
+        return self._graph
+
+    @property
+    def digraph(self) -> "nx.DiGraph":
+        """Skierowany graf do planowania tras (budowany przy pierwszym użyciu)"""
+        if self._digraph is None:
+            self._digraph = self._build_nx_digraph()
+        return self._digraph
+
+    def _build_nx_graph(self) -> "nx.Graph":
+        import networkx as nx
+
+        graph = nx.Graph()
+        for i, node_id in enumerate(self.node_ids.tolist()):
+            graph.add_node(node_id, **self.get_node_by_id(node_id))
+        for edge_id in range(self.num_edges):
+            record = self.edge_record(edge_id)
+            graph.add_edge(record['from'], record['to'], **self._edge_attributes(edge_id))
+        return graph
+
+    def _build_nx_digraph(self) -> "nx.DiGraph":
+        import networkx as nx
+
+        digraph = nx.DiGraph()
+        digraph.add_nodes_from(self.node_ids.tolist())
+        for edge_id in range(self.num_edges):
+            record = self.edge_record(edge_id)
+            forward, backward = self._edge_arcs[edge_id].tolist()
+            if backward < 0:
+                backward = forward
+            attrs = self._digraph_attributes(edge_id)
+            if self.arc_enabled[forward]:
+                digraph.add_edge(record['from'], record['to'], **attrs)
+            if self.arc_enabled[backward]:
+                digraph.add_edge(record['to'], record['from'], **attrs)
+        return digraph
+
+    def _digraph_attributes(self, edge_id: int) -> Dict[str, Any]:
+        record = self.edge_record(edge_id)
+        return dict(type=record['type'], length=record['length'], desc=str(self.edge_desc[edge_id]))
+
+    def _edge_attributes(self, edge_id: int) -> Dict[str, Any]:
+        """Atrybuty rozszerzone krawędzi w postaci słownika (jak w grafie nieskierowanym)"""
+        capacity = int(self.edge_capacity[edge_id])
+        straight = float(self.edge_speed_straight[edge_id])
+        turn = float(self.edge_speed_turn[edge_id])
+        edge_type = self._edge_types_list[edge_id]
+        allowed_dir = int(self.edge_allowed_dir[edge_id])
+        return dict(
+            type=edge_type,
+            segment_type=edge_type,  # spójność nazewnicza
+            length=float(self.edge_length[edge_id]),
+            bidirectional=allowed_dir == DIR_BOTH,
+            one_way=allowed_dir != DIR_BOTH,
+            allowed_dir=DIRECTION_NAMES[allowed_dir],  # względem orientacji from -> to
+            closed=bool(self.edge_closed[edge_id]),
+            capacity=capacity if capacity > 0 else None,  # liczba samolotów (opcjonalnie)
+            speed_limit_straight_kts=None if np.isnan(straight) else straight,
+            speed_limit_turn_kts=None if np.isnan(turn) else turn,
+            conflict_points=list(self.edge_conflict_points.get(edge_id, [])),
+            runway_exit_class=None,  # {first, middle, last} dla zjazdów z pasa
+            desc=str(self.edge_desc[edge_id]),
+            holding_allowed=bool(self.edge_holding[edge_id]),
+        )
+
+    @property
+    def num_nodes(self) -> int:
+        return len(self.node_ids)
+
+    @property
+    def num_edges(self) -> int:
+        return len(self.edge_u)
+
+    def node_indices(self, node_ids: np.ndarray) -> np.ndarray:
+        """Wektorowy node_index: indeksy gęste dla tablicy id (-1 dla nieznanych i None = -1)"""
+        node_ids = np.asarray(node_ids, dtype=np.int64)
+        valid = (node_ids >= 0) & (node_ids < len(self._node_lookup))
+        out = np.full(len(node_ids), -1, dtype=np.int64)
+        out[valid] = self._node_lookup[node_ids[valid]]
+        return out
+
+    def node_index(self, node_id: int) -> Optional[int]:
+        """Gęsty indeks węzła lub None"""
+        return self._node_index.get(node_id)
+
+    # --- Tablica tras ---
+    def _build_route_table(self, precompute: Optional[bool] = None) -> RouteTable:
+        euclid = np.hypot(self.node_x[self.edge_u] - self.node_x[self.edge_v],
+                          self.node_y[self.edge_u] - self.node_y[self.edge_v])
+        return RouteTable(
+            self.node_ids.tolist(),
+            self.csr_indptr,
+            self.csr_indices,
+            np.where(self.arc_enabled, self.edge_length[self.csr_edge], np.inf),
+            version=self.version,
+            precompute=precompute,
+            index=self._node_index,
+            strategy=self._route_strategy,
+            coords=(self.node_x, self.node_y),
+            scale=heuristic_scale(self.edge_length, euclid),
+        )
+
+    @property
+    def route_strategy(self) -> str:
+        """Strategia zapytań spoza policzonej tablicy tras ("table", "dijkstra", "astar")"""
+        return self._route_strategy
+
+    @route_strategy.setter
+    def route_strategy(self, strategy: str):
+        self._route_strategy = RouteTable.check_strategy(strategy)
+        if self._routes is not None:
+            # Przełączenie bez przebudowy policzonych wierszy
+            self._routes.strategy = strategy
+
+    def invalidate_routes(self):
+        """Oznacza graf jako zmieniony - tablica tras zostanie przebudowana przy następnym zapytaniu"""
+        self.version += 1
+
+    @property
+    def routes(self) -> RouteTable:
+        """Aktualna tablica tras (przebudowywana automatycznie po zmianie wersji grafu)"""
+        if self._routes is None or self._routes.version != self.version:
+            self._routes = self._build_route_table()
+        return self._routes
+
+    # --- Modyfikacje grafu w trakcie działania ---
+    def add_listener(self, callback: Callable[[int, str], None]):
+        """
+        Rejestruje obserwatora zmian krawędzi. Wywoływany jako callback(edge_id, zmiana),
+        gdzie zmiana to 'direction', 'capacity', 'speed' lub 'conflict'.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback: Callable[[int, str], None]):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _require_edge(self, u: int, v: int) -> int:
+        edge_id = self._edge_ids.get((u, v))
+        if edge_id is None:
+            raise ValueError(f"Brak krawędzi ({u}, {v}) w grafie")
+        return edge_id
+
+    def _edge_changed(self, edge_id: int, change: str):
+        """Odświeża atrybuty krawędzi w zbudowanym grafie networkx i powiadamia obserwatorów"""
+        if self._graph is not None:
+            record = self.edge_record(edge_id)
+            self._graph.edges[record['from'], record['to']].update(self._edge_attributes(edge_id))
+        for callback in list(self._listeners):
+            callback(edge_id, change)
+
+    def _update_arcs(self, edge_id: int):
+        """Włącza/wyłącza łuki krawędzi i poprawia tylko dotknięte wpisy tablicy tras"""
+        allowed_dir = int(self.edge_allowed_dir[edge_id])
+        closed = bool(self.edge_closed[edge_id])
+        record = self.edge_record(edge_id)
+        for backward, a in enumerate(self._edge_arcs[edge_id].tolist()):
+            if a < 0:
+                continue
+            enabled = not closed and allowed_dir in (DIR_BOTH, DIR_BA if backward else DIR_AB)
+            if enabled == self.arc_enabled[a]:
                 continue
-            
-            edge_type = edge.get('type', 'taxiway')
-            length = float(edge.get('length', 0.0))
-            desc = str(edge.get('desc', '')).strip().lower()
-
-            # Klasyfikacja miejsc oczekiwania
-            # Dozwolone: gate/stand_link, "taxiway a/c/d/f", "runway_entry" (hold short), powietrze (poza grafem)
-            # Zabronione: apron (brak w CSV jako typ), runway, "taxiway b", "runway_exit"
-            def is_holding_allowed_local(edge_type: str, desc: str) -> bool:
-                if edge_type in ('stand_link',):
-                    return True
-                if edge_type in ('runway', 'runway_exit'):
-                    return False
-                if edge_type == 'runway_entry':
-                    return True
-                # taxiway
-                if 'taxiway b' in desc:
-                    return False
-                if any(x in desc for x in ['taxiway a', 'taxiway c', 'taxiway d', 'taxiway f']):
-                    return True
-                # Fallback: zwykły taxiway dozwolony
-                if edge_type == 'taxiway':
-                    return True
-                return False
-
-            # Atrybuty rozszerzone na krawędzi w grafie nieskierowanym
-            self.graph.add_edge(
-                u,
-                v,
-                type=edge_type,
-                segment_type=edge_type,  # spójność nazewnicza
-                length=length,
-                bidirectional=True,  # Zawsze True
-                one_way=False,  # Zawsze False
-                allowed_dir='AB_BA',  # Zawsze oba kierunki
-                capacity=None,  # liczba samolotów (opcjonalnie)
-                speed_limit_straight_kts=None,
-                speed_limit_turn_kts=None,
-                conflict_points=[],  # lista ID punktów konfliktów związanych z tą krawędzią
-                runway_exit_class=None,  # {first, middle, last} dla zjazdów z pasa
-                desc=desc,
-                holding_allowed=is_holding_allowed_local(edge_type, desc)
-            )
-
-            # Wszystkie krawędzie dodawane w obu kierunkach do digraph
-            self.digraph.add_edge(u, v, type=edge_type, length=length, desc=desc)
-            self.digraph.add_edge(v, u, type=edge_type, length=length, desc=desc)
-    
+            self.arc_enabled[a] = enabled
+            if self._routes is not None and self._routes.version == self.version:
+                self._routes.set_arc_weight(a, float(self.edge_length[edge_id]) if enabled else np.inf)
+            if self._digraph is not None:
+                src, dst = (record['to'], record['from']) if backward else (record['from'], record['to'])
+                if enabled:
+                    self._digraph.add_edge(src, dst, **self._digraph_attributes(edge_id))
+                elif self._digraph.has_edge(src, dst):
+                    self._digraph.remove_edge(src, dst)
+        self._edge_changed(edge_id, 'direction')
+
+    def set_one_way(self, u: int, v: int, direction: str = 'AB'):
+        """Krawędź jednokierunkowa: 'AB' = ruch tylko u -> v, 'BA' = tylko v -> u"""
+        if direction not in ('AB', 'BA'):
+            raise ValueError(f"Nieznany kierunek: {direction} (dozwolone 'AB', 'BA')")
+        edge_id = self._require_edge(u, v)
+        along = self.edge_record(edge_id)['from'] == u
+        self.edge_allowed_dir[edge_id] = DIR_AB if (direction == 'AB') == along else DIR_BA
+        self._update_arcs(edge_id)
+
+    def set_bidirectional(self, u: int, v: int):
+        """Przywraca ruch w obu kierunkach na krawędzi (u,v)"""
+        edge_id = self._require_edge(u, v)
+        self.edge_allowed_dir[edge_id] = DIR_BOTH
+        self._update_arcs(edge_id)
+
+    def close_edge(self, u: int, v: int):
+        """Zamyka krawędź (np. drogę kołowania) bez przebudowy tablicy tras"""
+        edge_id = self._require_edge(u, v)
+        self.edge_closed[edge_id] = True
+        self._update_arcs(edge_id)
+
+    def open_edge(self, u: int, v: int):
+        """Ponownie otwiera zamkniętą krawędź (z zachowaniem ustawionego kierunku)"""
+        edge_id = self._require_edge(u, v)
+        self.edge_closed[edge_id] = False
+        self._update_arcs(edge_id)
+
+    def is_edge_closed(self, u: int, v: int) -> bool:
+        edge_id = self._edge_ids.get((u, v))
+        return edge_id is not None and bool(self.edge_closed[edge_id])
+
+    def can_traverse(self, u: int, v: int) -> bool:
+        """Czy wolno przejechać krawędzią w kierunku u -> v"""
+        edge_id = self._edge_ids.get((u, v))
+        if edge_id is None:
+            return False
+        forward, backward = self._edge_arcs[edge_id].tolist()
+        along = self.edge_record(edge_id)['from'] == u
+        a = forward if along or backward < 0 else backward
+        return bool(self.arc_enabled[a])
+
+    def set_edge_capacity(self, u: int, v: int, capacity: Optional[int] = None):
+        """Pojemność segmentu (liczba samolotów); None lub 0 = domyślna wg typu krawędzi"""
+        if capacity is not None and capacity < 0:
+            raise ValueError(f"Pojemność nie może być ujemna: {capacity}")
+        edge_id = self._require_edge(u, v)
+        self.edge_capacity[edge_id] = capacity or 0
+        self._edge_changed(edge_id, 'capacity')
+
+    def set_edge_speed_limits(self, u: int, v: int, straight_kts: Optional[float] = None,
+                              turn_kts: Optional[float] = None):
+        """Limity prędkości na krawędzi [kt] na prostej i w zakręcie (None = brak limitu)"""
+        edge_id = self._require_edge(u, v)
+        self.edge_speed_straight[edge_id] = np.nan if straight_kts is None else straight_kts
+        self.edge_speed_turn[edge_id] = np.nan if turn_kts is None else turn_kts
+        self._edge_changed(edge_id, 'speed')
+
+    def add_conflict_point(self, point_id: int, description: str = "",
+                           edges: Optional[List[Tuple[int, int]]] = None,
+                           nodes: Optional[List[int]] = None):
+        """Dodaje punkt konfliktu (np. skrzyżowanie z pasem) obejmujący krawędzie i/lub węzły"""
+        edges = list(edges or [])
+        nodes = list(nodes or [])
+        edge_ids = [self._require_edge(u, v) for u, v in edges]
+        for node_id in nodes:
+            if node_id not in self._node_index:
+                raise ValueError(f"Brak węzła {node_id} w grafie")
+        self.conflict_points[point_id] = {'description': description, 'edges': edges, 'nodes': nodes}
+        for edge_id in edge_ids:
+            points = self.edge_conflict_points.setdefault(edge_id, [])
+            if point_id not in points:
+                points.append(point_id)
+            self._edge_changed(edge_id, 'conflict')
+
+    def get_conflict_points(self, u: int, v: int) -> List[int]:
+        """Id punktów konfliktu przypiętych do krawędzi (u,v)"""
+        edge_id = self._edge_ids.get((u, v))
+        if edge_id is None:
+            return []
+        return list(self.edge_conflict_points.get(edge_id, []))
+
     def get_node_by_id(self, node_id: int) -> Optional[Dict]:
         """Pobiera węzeł po ID"""
-        if node_id in self.graph.nodes:
-            return self.graph.nodes[node_id]
-        return None
-    
-    def get_edges_by_type(self, edge_type: str) -> List[Dict]:
-        """Pobiera krawędzie po typie"""
-        edges = []
-        for _, row in self.edges_df.iterrows():
-            if row.get('type') == edge_type:
-                edges.append({
-                    'from': int(row['from']),
-                    'to': int(row['to']),
-                    'type': row.get('type', ''),
-                    'length': float(row.get('length', 0.0))
-                })
+        i = self._node_index.get(node_id)
+        if i is None:
+            return None
+        x, y = self._node_pos[i]
+        return {
+            'type': str(self.node_types[i]),
+            'name': str(self.node_names[i]),
+            'x': x,
+            'y': y,
+            'notes': str(self.node_notes[i]),
+        }
+
+    def get_edges_by_type(self, edge_type: str) -> Tuple[Dict, ...]:
+        """Pobiera krawędzie po typie (krotka współdzielonych rekordów - nie modyfikować)"""
+        edges = self._edges_by_type.get(edge_type)
+        if edges is None:
+            edges = tuple(self.edge_record(i) for i in self.get_edge_ids_by_type(edge_type).tolist())
+            self._edges_by_type[edge_type] = edges
         return edges
-    
+
+    def get_edges_by_types(self, edge_types: Tuple[str, ...]) -> Tuple[Dict, ...]:
+        """Pobiera krawędzie kilku typów (w kolejności typów), wynik zapamiętywany"""
+        edges = self._edges_by_types.get(edge_types)
+        if edges is None:
+            edges = tuple(e for t in edge_types for e in self.get_edges_by_type(t))
+            self._edges_by_types[edge_types] = edges
+        return edges
+
+    def get_edge_ids_by_type(self, edge_type: str) -> np.ndarray:
+        """Pobiera id krawędzi danego typu (tablica tylko do odczytu)"""
+        ids = self._edge_ids_by_type.get(edge_type)
+        if ids is None:
+            ids = np.empty(0, dtype=np.int32)
+        return ids
+
+    def get_edge_id(self, u: int, v: int) -> Optional[int]:
+        """Zwraca id krawędzi (u,v) niezależnie od kierunku lub None"""
+        return self._edge_ids.get((u, v))
+
     def list_all_edges(self) -> List[Dict]:
         """Zwraca listę wszystkich krawędzi w grafie"""
         edges = []
-        for u, v, data in self.graph.edges(data=True):
+        for edge_id in range(self.num_edges):
+            record = self.edge_record(edge_id)
             edges.append({
-                'from': u,
-                'to': v,
-                'type': data.get('type', 'unknown'),
-                'length': data.get('length', 0.0),
-                'bidirectional': data.get('bidirectional', True),
-                'desc': data.get('desc', '')
+                'from': record['from'],
+                'to': record['to'],
+                'type': record['type'],
+                'length': record['length'],
+                'bidirectional': int(self.edge_allowed_dir[edge_id]) == DIR_BOTH,
+                'desc': str(self.edge_desc[edge_id])
             })
         return edges
-    
+
     def get_edge_count_by_type(self) -> Dict[str, int]:
         """Zwraca liczbę krawędzi według typu"""
-        counts = {}
-        for _, row in self.edges_df.iterrows():
-            edge_type = row.get('type', 'unknown')
-            counts[edge_type] = counts.get(edge_type, 0) + 1
-        return counts
+        return dict(self._edge_type_counts)
 
     # --- Helpery klasyfikacji/holding ---
     def is_edge_holding_allowed(self, u: int, v: int) -> bool:
         """Czy na krawędzi (u,v) można oczekiwać (stać w kolejce)."""
-        if self.graph.has_edge(u, v):
-            return bool(self.graph[u][v].get('holding_allowed', False))
+        edge_id = self._edge_ids.get((u, v))
+        if edge_id is not None:
+            return bool(self.edge_holding[edge_id])
         return False
 
     def is_edge_type(self, u: int, v: int, t: str) -> bool:
-        if self.graph.has_edge(u, v):
-            return self.graph[u][v].get('type') == t
+        edge_id = self._edge_ids.get((u, v))
+        if edge_id is not None:
+            return self._edge_types_list[edge_id] == t
         return False
-    
-    def get_node_position(self, node_id: int) -> Optional[Tuple[int, int]]:
+
+    def get_node_position(self, node_id: int) -> Optional[Tuple[float, float]]:
         """Pobiera pozycję węzła (x, y)"""
-        node = self.get_node_by_id(node_id)
-        if node:
-            return (node['x'], node['y'])
+        i = self._node_index.get(node_id)
+        if i is not None:
+            return self._node_pos[i]
         return None
-    
+
     def get_neighbors(self, node_id: int) -> List[int]:
         """Pobiera sąsiadów węzła"""
-        return list(self.graph.neighbors(node_id))
-    
-    def get_nodes_by_type(self, node_type: str) -> List[int]:
+        i = self._node_index[node_id]
+        neighbors = self.csr_indices[self.csr_indptr[i]:self.csr_indptr[i + 1]]
+        return self.node_ids[neighbors].tolist()
+
+    def get_nodes_by_type(self, node_type: str) -> Tuple[int, ...]:
         """Pobiera wszystkie węzły określonego typu"""
-        return [node_id for node_id, data in self.graph.nodes(data=True) 
-                if data['type'] == node_type]
-    
-    def get_runway_nodes(self) -> List[int]:
+        return self._nodes_by_type.get(node_type, ())
+
+    def get_runway_nodes(self) -> Tuple[int, ...]:
         """Pobiera węzły pasów startowych"""
         return self.get_nodes_by_type('runway_thr')
-    
-    def get_stand_nodes(self) -> List[int]:
+
+    def get_stand_nodes(self) -> Tuple[int, ...]:
         """Pobiera węzły stanowisk postojowych"""
         return self.get_nodes_by_type('stand')
-    
-    def get_apron_nodes(self) -> List[int]:
+
+    def get_apron_nodes(self) -> Tuple[int, ...]:
         """Pobiera węzły płyt postojowych"""
         return self.get_nodes_by_type('apron')
-    
-    def get_taxiway_nodes(self) -> List[int]:
+
+    def get_taxiway_nodes(self) -> Tuple[int, ...]:
         """Pobiera węzły dróg kołowania"""
         return self.get_nodes_by_type('taxiway')
-    
+
     def find_shortest_path(self, start: int, end: int) -> List[int]:
         """Znajduje najkrótszą ścieżkę między dwoma węzłami (respektuje jednokierunkowość)"""
-        try:
-            return nx.shortest_path(self.digraph, start, end, weight="length")
-        except nx.NetworkXNoPath:
-            return []
-    
-    def find_all_paths(self, start: int, end: int, max_length: int = 10) -> List[List[int]]:
-        """Znajduje wszystkie ścieżki między dwoma węzłami (ograniczone długością), z kierunkami"""
-        try:
-            paths = list(nx.all_simple_paths(self.digraph, start, end, cutoff=max_length))
-            # Sortuj według długości
-            paths.sort(key=len)
-            return paths
-        except nx.NetworkXNoPath:
-            return []
-    
+        return self.routes.path(start, end)
+
+    def find_k_shortest_paths(self, start: int, end: int, k: int) -> List[List[int]]:
+        """Znajduje k najkrótszych ścieżek bez pętli (według długości), z kierunkami"""
+        return self.routes.k_shortest(start, end, k)
+
+    def find_all_paths(self, start: int, end: int, max_length: int = 10, k: int = 10) -> List[List[int]]:
+        """
+        Znajduje alternatywne ścieżki między dwoma węzłami: do k najkrótszych (według długości)
+        spośród tych, które mają co najwyżej max_length krawędzi
+        """
+        if max_length >= self.num_nodes:
+            return self.find_k_shortest_paths(start, end, k)
+        return self.routes.k_shortest(start, end, k, max_hops=max_length)
+
     def get_edge_length(self, from_node: int, to_node: int) -> float:
         """Pobiera długość krawędzi między węzłami"""
-        if self.graph.has_edge(from_node, to_node):
-            return self.graph[from_node][to_node]['length']
+        edge_id = self._edge_ids.get((from_node, to_node))
+        if edge_id is not None:
+            return float(self.edge_length[edge_id])
         return 0.0
-    
+
     def get_all_nodes(self) -> List[int]:
         """Pobiera wszystkie węzły"""
-        return list(self.graph.nodes())
-    
-    def get_graph_bounds(self) -> Tuple[int, int, int, int]:
+        return self.node_ids.tolist()
+
+    def get_graph_bounds(self) -> Tuple[float, float, float, float]:
         """Pobiera granice grafu (min_x, max_x, min_y, max_y)"""
-        x_coords = [data['x'] for _, data in self.graph.nodes(data=True)]
-        y_coords = [data['y'] for _, data in self.graph.nodes(data=True)]
-        
-        return (min(x_coords), max(x_coords), min(y_coords), max(y_coords))
-    
+        return (float(self.node_x.min()), float(self.node_x.max()),
+                float(self.node_y.min()), float(self.node_y.max()))
+
     def is_connected(self, node1: int, node2: int) -> bool:
         """Sprawdza czy węzły są połączone"""
-        return self.graph.has_edge(node1, node2)
-    
+        return (node1, node2) in self._edge_ids
+
     def get_edge_type(self, from_node: int, to_node: int) -> Optional[str]:
         """Pobiera typ krawędzi między węzłami"""
-        if self.graph.has_edge(from_node, to_node):
-            return self.graph[from_node][to_node]['type']
-        return None
\ No newline at end of file
+        edge_id = self._edge_ids.get((from_node, to_node))
+        if edge_id is not None:
+            return self._edge_types_list[edge_id]
+        return None
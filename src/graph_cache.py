@@ -0,0 +1,93 @@
+"""
+Skompilowany cache grafu lotniska (.npz)
+
+Krok kompilacji zapisuje gęste tablice grafu, indeksy typów i tablicę tras
+do pliku binarnego, którego nazwa zawiera skrót plików CSV. AirportGraph
+wczytuje taki plik, jeśli jest aktualny, i pomija wtedy pandas oraz networkx.
+
+Użycie:
+    python -m src.graph_cache nodes.csv edges.csv
+"""
+
+import hashlib
+import os
+import sys
+from typing import Dict, Optional
+
+import numpy as np
+
+# Zmienić przy każdej zmianie zawartości pliku - stare pliki przestaną pasować
+CACHE_FORMAT_VERSION = 1
+CACHE_DIR_NAME = ".airport_cache"
+
+# Tablice grafu zapisywane 1:1 pod tymi samymi nazwami atrybutów
+GRAPH_ARRAYS = (
+    'node_ids', 'node_x', 'node_y', 'node_types', 'node_names', 'node_notes',
+    'edge_u', 'edge_v', 'edge_types', 'edge_length', 'edge_desc', 'edge_holding',
+    'edge_capacity', 'edge_speed_straight', 'edge_speed_turn',
+    'csr_indptr', 'csr_indices', 'csr_edge',
+)
+
+
+def csv_digest(nodes_file: str, edges_file: str) -> str:
+    """Skrót zawartości plików CSV (i wersji formatu cache)"""
+    h = hashlib.sha1(f"airport-graph-v{CACHE_FORMAT_VERSION}".encode())
+    for path in (nodes_file, edges_file):
+        with open(path, 'rb') as f:
+            h.update(f.read())
+        h.update(b'\0')
+    return h.hexdigest()
+
+
+def cache_path(nodes_file: str, edges_file: str, cache_dir: Optional[str] = None) -> str:
+    """Ścieżka pliku cache dla danej pary CSV"""
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(nodes_file)), CACHE_DIR_NAME)
+    return os.path.join(cache_dir, f"airport_{csv_digest(nodes_file, edges_file)[:16]}.npz")
+
+
+def save_graph(graph, path: str):
+    """Zapisuje tablice grafu, indeksy typów i tablicę tras do pliku .npz"""
+    arrays: Dict[str, np.ndarray] = {name: getattr(graph, name) for name in GRAPH_ARRAYS}
+
+    # Indeksy typów: nazwy + skonkatenowane id z przesunięciami
+    type_names = list(graph._edge_ids_by_type.keys())
+    type_ids = [graph._edge_ids_by_type[t] for t in type_names]
+    arrays['edge_type_names'] = np.array(type_names, dtype=str)
+    arrays['edge_type_offsets'] = np.cumsum([0] + [len(ids) for ids in type_ids]).astype(np.int64)
+    arrays['edge_type_ids'] = np.concatenate(type_ids) if type_ids else np.empty(0, dtype=np.int32)
+
+    arrays['route_sources'], arrays['route_pred'], arrays['route_dist'] = graph.routes.export_rows()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+
+
+def load_graph_arrays(path: str) -> Dict[str, np.ndarray]:
+    """Wczytuje wszystkie tablice z pliku cache"""
+    with np.load(path, allow_pickle=False) as data:
+        return {name: data[name] for name in data.files}
+
+
+def compile_graph(nodes_file: str, edges_file: str, cache_dir: Optional[str] = None) -> str:
+    """
+    Buduje graf z CSV i zapisuje go do cache. Zwraca ścieżkę pliku.
+
+    Tablica tras zapisywana jest w całości dla grafów liczonych gęsto
+    (MAX_PRECOMPUTE_NODES); dla większych wiersze liczone są leniwie po wczytaniu.
+    """
+    from src.graph import AirportGraph
+
+    graph = AirportGraph(nodes_file, edges_file, use_cache=False)
+    path = cache_path(nodes_file, edges_file, cache_dir)
+    save_graph(graph, path)
+    return path
+
+
+if __name__ == "__main__":
+    nodes = sys.argv[1] if len(sys.argv) > 1 else "nodes.csv"
+    edges = sys.argv[2] if len(sys.argv) > 2 else "edges.csv"
+    print(f"Zapisano skompilowany graf: {compile_graph(nodes, edges)}")
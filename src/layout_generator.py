@@ -0,0 +1,227 @@
+"""
+Generator syntetycznych układów lotniska do testów skalowania
+
+Tworzy pliki nodes.csv / edges.csv w tym samym formacie i z tymi samymi typami
+węzłów i krawędzi co mapa Balic, więc AirportGraph, SegmentManager
+i RunwayController działają na nich bez zmian:
+
+- pasy: węzły 'runway_thr' na końcach (pierwszy pas ma progi o id 1 = RWY_07
+  i 2 = RWY_25, bo z nich korzysta RunwayController), krawędzie 'runway'
+  przez węzły zjazdów,
+- wjazdy 'runway_entry' (taxiway -> próg) i zjazdy 'runway_exit' (pas -> taxiway),
+- równoległe drogi kołowania 'taxiway' z łącznikami (gęstość skrzyżowań),
+- płyty: pasy węzłów 'connector' połączone 'apron_link', stanowiska 'stand'
+  przez 'stand_link' (po dwa na węzeł płyty).
+
+Pasy leżą na przemian nad i pod płytą (kolejne coraz dalej od środka).
+Dalszy pas łączy się z resztą lotniska przez węzły zjazdów bliższego pasa
+(skrzyżowanie drogi kołowania z pasem).
+
+Użycie:
+    python -m src.layout_generator katalog [--runways 2] [--taxiways 2]
+        [--stands 2000] [--crossing-density 0.3] [--columns N] [--seed 0]
+"""
+
+import argparse
+import csv
+import math
+import os
+import random
+from typing import Dict, List, Optional, Tuple
+
+NODE_FIELDS = ('id', 'type', 'name', 'x', 'y', 'notes')
+EDGE_FIELDS = ('from', 'to', 'type', 'length', 'bidirectional', 'desc')
+
+# Odstępy siatki (jednostki współrzędnych jak w nodes.csv)
+COLUMN_SPACING = 6.0
+TAXIWAY_SPACING = 5.0
+APRON_LANE_SPACING = 4.0
+STAND_OFFSET = 1.5
+# Co ile kolumn zjazd z pasa
+EXIT_EVERY = 4
+
+
+class LayoutBuilder:
+    """Zbiera węzły i krawędzie układu (id węzłów nadawane kolejno)"""
+
+    def __init__(self, first_id: int = 1):
+        self.nodes: List[Dict] = []
+        self.edges: List[Dict] = []
+        self._pos: Dict[int, Tuple[float, float]] = {}
+        self._next_id = first_id
+
+    def add_node(self, node_type: str, name: str, x: float, y: float, notes: str = "",
+                 node_id: Optional[int] = None) -> int:
+        if node_id is None:
+            node_id = self._next_id
+        self._next_id = max(self._next_id, node_id + 1)
+        self.nodes.append({'id': node_id, 'type': node_type, 'name': name,
+                           'x': round(x, 3), 'y': round(y, 3), 'notes': notes})
+        self._pos[node_id] = (x, y)
+        return node_id
+
+    def add_edge(self, u: int, v: int, edge_type: str, desc: str = "", bidirectional: bool = True):
+        (x1, y1), (x2, y2) = self._pos[u], self._pos[v]
+        # Długość = odległość euklidesowa (heurystyka A* pozostaje dopuszczalna)
+        self.edges.append({'from': u, 'to': v, 'type': edge_type,
+                           'length': math.hypot(x2 - x1, y2 - y1),
+                           'bidirectional': bidirectional, 'desc': desc})
+
+
+def _taxiway_name(runway: int, line: int) -> str:
+    # Prefiks "T" - nazwy nie pokrywają się z regułami oczekiwania dla taxiway A/B/C/D/F
+    return f"T{runway + 1}{chr(ord('A') + line % 26)}"
+
+
+def generate_layout(runways: int = 2, parallel_taxiways: int = 2, stands: int = 2000,
+                    crossing_density: float = 0.3, columns: Optional[int] = None,
+                    seed: int = 0) -> Tuple[List[Dict], List[Dict]]:
+    """
+    Generuje układ lotniska. Zwraca (węzły, krawędzie) jako listy słowników
+    z kolumnami nodes.csv / edges.csv.
+
+    Args:
+        runways: liczba pasów (>= 1)
+        parallel_taxiways: liczba równoległych dróg kołowania przy każdym pasie (>= 1)
+        stands: liczba stanowisk postojowych
+        crossing_density: prawdopodobieństwo łącznika w danej kolumnie między sąsiednimi
+                          drogami kołowania / pasami płyty (skrajne kolumny zawsze połączone)
+        columns: liczba kolumn siatki (domyślnie ~ pierwiastek z liczby stanowisk)
+        seed: ziarno generatora losowego
+    """
+    if runways < 1 or parallel_taxiways < 1:
+        raise ValueError("Wymagany co najmniej jeden pas i jedna droga kołowania")
+    rng = random.Random(seed)
+    if columns is None:
+        columns = max(8, math.ceil(math.sqrt(max(stands, 1))))
+    lanes = max(1, math.ceil(stands / (2 * columns)))
+    # Id 1 i 2 zarezerwowane dla progów pierwszego pasa
+    builder = LayoutBuilder(first_id=3)
+    xs = [c * COLUMN_SPACING for c in range(columns)]
+
+    def crosses(c: int) -> bool:
+        return c in (0, columns - 1) or rng.random() < crossing_density
+
+    # --- Płyta: pasy węzłów connector ze stanowiskami ---
+    apron_height = (lanes - 1) * APRON_LANE_SPACING
+    lane_nodes: List[List[int]] = []
+    stand_no = 0
+    for k in range(lanes):
+        y = k * APRON_LANE_SPACING - apron_height / 2
+        row = [builder.add_node('connector', f"APRON_{k}_{c}", x, y, f"Płyta {k}") for c, x in enumerate(xs)]
+        for a, b in zip(row, row[1:]):
+            builder.add_edge(a, b, 'apron_link')
+        for c, node in enumerate(row):
+            for side in (1, -1):
+                if stand_no >= stands:
+                    break
+                stand_no += 1
+                stand = builder.add_node('stand', f"STAND_{stand_no}", xs[c], y + side * STAND_OFFSET,
+                                         f"Stanowisko postojowe {stand_no}")
+                builder.add_edge(node, stand, 'stand_link', f"Stand {stand_no}")
+        if lane_nodes:
+            for c in range(columns):
+                if crosses(c):
+                    builder.add_edge(lane_nodes[-1][c], row[c], 'apron_link')
+        lane_nodes.append(row)
+
+    # --- Pasy z równoległymi drogami kołowania ---
+    # Po każdej stronie płyty: węzły, do których podłącza się kolejny blok (płyta lub
+    # poprzedni pas), oraz odległość od środka
+    attach: Dict[int, List[Optional[int]]] = {1: list(lane_nodes[-1]), -1: list(lane_nodes[0])}
+    attach_type = {1: 'apron_link', -1: 'apron_link'}
+    offset = {1: apron_height / 2, -1: apron_height / 2}
+    for r in range(runways):
+        side = 1 if r % 2 == 0 else -1
+        lines = []
+        for j in range(parallel_taxiways):
+            offset[side] += TAXIWAY_SPACING
+            y = side * offset[side]
+            name = _taxiway_name(r, j)
+            row = [builder.add_node('taxiway', f"TWY_{name}_{c}", x, y, f"Taxiway {name}")
+                   for c, x in enumerate(xs)]
+            for a, b in zip(row, row[1:]):
+                builder.add_edge(a, b, 'taxiway', f"Taxiway {name}")
+            lines.append((name, row))
+
+        # Połączenie z płytą lub przecięcie bliższego pasa (tylko przez jego węzły)
+        name, first = lines[0]
+        candidates = [c for c in range(columns) if attach[side][c] is not None]
+        linked = [c for c in candidates if c in (candidates[0], candidates[-1]) or rng.random() < crossing_density]
+        for c in linked:
+            desc = f"Taxiway {name}X" if attach_type[side] == 'taxiway' else ""
+            builder.add_edge(attach[side][c], first[c], attach_type[side], desc)
+        for (_, a), (name, b) in zip(lines, lines[1:]):
+            for c in range(columns):
+                if crosses(c):
+                    builder.add_edge(a[c], b[c], 'taxiway', f"Taxiway {name}X")
+
+        # Pas: progi na końcach, węzły zjazdów co EXIT_EVERY kolumn
+        offset[side] += TAXIWAY_SPACING
+        y = side * offset[side]
+        name, outer = lines[-1]
+        suffix = f"_{r + 1}" if r else ""
+        thr_west = builder.add_node('runway_thr', f"RWY_07{suffix}", xs[0] - COLUMN_SPACING, y,
+                                    f"Threshold runway 07{suffix}", node_id=1 if r == 0 else None)
+        thr_east = builder.add_node('runway_thr', f"RWY_25{suffix}", xs[-1] + COLUMN_SPACING, y,
+                                    f"Threshold runway 25{suffix}", node_id=2 if r == 0 else None)
+        runway_row: List[Optional[int]] = [None] * columns
+        chain = [thr_west]
+        for c in range(EXIT_EVERY // 2, columns - 1, EXIT_EVERY):
+            node = builder.add_node('taxiway', f"RWY{r + 1}_EXIT_{c}", xs[c], y, f"Zjazd z pasa {r + 1}")
+            runway_row[c] = node
+            chain.append(node)
+            builder.add_edge(node, outer[c], 'runway_exit', f"Taxiway {name}{c}", bidirectional=False)
+        chain.append(thr_east)
+        for a, b in zip(chain, chain[1:]):
+            builder.add_edge(a, b, 'runway', 'runway')
+        builder.add_edge(outer[0], thr_west, 'runway_entry', f"Taxiway {name}W", bidirectional=False)
+        builder.add_edge(outer[-1], thr_east, 'runway_entry', f"Taxiway {name}E", bidirectional=False)
+        attach[side] = runway_row
+        attach_type[side] = 'taxiway'
+
+    # Progi 1 i 2 na początku pliku, jak w mapie Balic
+    builder.nodes.sort(key=lambda node: node['id'] > 2)
+    return builder.nodes, builder.edges
+
+
+def write_layout(directory: str, **params) -> Tuple[str, str]:
+    """Generuje układ (parametry jak generate_layout) i zapisuje nodes.csv / edges.csv"""
+    nodes, edges = generate_layout(**params)
+    return save_layout(directory, nodes, edges)
+
+
+def save_layout(directory: str, nodes: List[Dict], edges: List[Dict]) -> Tuple[str, str]:
+    """Zapisuje węzły i krawędzie do nodes.csv / edges.csv w katalogu"""
+    os.makedirs(directory, exist_ok=True)
+    nodes_file = os.path.join(directory, "nodes.csv")
+    edges_file = os.path.join(directory, "edges.csv")
+    with open(nodes_file, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=NODE_FIELDS)
+        writer.writeheader()
+        writer.writerows(nodes)
+    with open(edges_file, "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=EDGE_FIELDS)
+        writer.writeheader()
+        writer.writerows(edges)
+    return nodes_file, edges_file
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Generator syntetycznego układu lotniska")
+    parser.add_argument("directory", help="katalog docelowy nodes.csv / edges.csv")
+    parser.add_argument("--runways", type=int, default=2)
+    parser.add_argument("--taxiways", type=int, default=2, help="równoległe drogi kołowania na pas")
+    parser.add_argument("--stands", type=int, default=2000)
+    parser.add_argument("--crossing-density", type=float, default=0.3)
+    parser.add_argument("--columns", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    nodes, edges = generate_layout(args.runways, args.taxiways, args.stands,
+                                   args.crossing_density, args.columns, args.seed)
+    nodes_file, edges_file = save_layout(args.directory, nodes, edges)
+    print(f"Zapisano {len(nodes)} węzłów do {nodes_file} i {len(edges)} krawędzi do {edges_file}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,15 @@ from src.graph import AirportGraph
 from src.agents.airplane import Airplane
 from src.agents.runway_controler import RunwayController
 from src.segment_manager import SegmentManager
+from src.fleet import FleetStore
+from src.event_engine import EventEngine
+from src.scheduler import ActiveSetScheduler
 from mesa import Model
+import numpy as np
 import os
 
 DEFAULTS = {
+    'tick_s': 30,  # sekund na tick (pushback 90 s = 3 ticki)
     'taxi_speed_straight_kts': 20,
     'taxi_speed_turn_kts': 10,
     'min_headway_m': 100,
@@ -22,8 +27,10 @@ DEFAULTS = {
 
 class AirportModel(Model):
     def __init__(self, num_arriving_airplanes=5, wind_direction="07", 
-                 arrival_rate=0.1, nodes_file="nodes.csv", edges_file="edges.csv"):
+                 arrival_rate=0.1, nodes_file="nodes.csv", edges_file="edges.csv", engine="tick"):
         super().__init__()
+        if engine not in ("tick", "event"):
+            raise ValueError(f"Nieznany silnik symulacji: {engine}")
         
         # Inicjalizacja grafu lotniska
         self.graph = AirportGraph(nodes_file, edges_file)
@@ -37,9 +44,17 @@ class AirportModel(Model):
         self.arrival_rate = arrival_rate  # Prawdopodobieństwo pojawienia się nowego samolotu
         self.wind_direction = wind_direction  # Kierunek wiatru "07" lub "25"
         self.defaults = DEFAULTS
+        self.step_count = 0
+        # Stan floty w tablicach (wiersz na samolot)
+        self.fleet = FleetStore()
+        # Kroki tylko samolotów, które mogą zmienić stan (rejestracja przez register_agent)
+        self.scheduler = ActiveSetScheduler(self)
+        # Silnik zdarzeń (engine="event") - tworzony po samolotach początkowych
+        self.event_engine = None
         
         # Segment manager do zarządzania rezerwacjami
         self.segment_manager = SegmentManager(self)  # Przekaż referencję do modelu
+        self.segment_manager.add_unpark_listener(self.scheduler.wake_id)
 
         # Runway controller z kierunkiem wiatru
         self.runway_controller = RunwayController(self, 1, wind_direction=wind_direction)
@@ -52,24 +67,38 @@ class AirportModel(Model):
         self.create_initial_arrivals()
 
         self.running = True
-        self.step_count = 0
+        # Silnik: "tick" - krok w każdym ticku, "event" - skoki do najbliższego zdarzenia (run_until)
+        self.engine = engine
+        self.event_engine = EventEngine(self) if engine == "event" else None
+
+    def register_agent(self, agent):
+        """Rejestracja agenta Mesa; samoloty trafiają też do harmonogramu aktywnych"""
+        super().register_agent(agent)
+        if isinstance(agent, Airplane):
+            self.scheduler.add(agent)
+
+    def deregister_agent(self, agent):
+        super().deregister_agent(agent)
+        self.scheduler.remove(agent)
+        if self.event_engine is not None:
+            self.event_engine.remove(agent)
 
     def create_initial_arrivals(self):
         """Tworzy początkowe samoloty przybywające do lądowania"""
         for i in range(self.num_arriving_airplanes):
-            airplane = Airplane(self, self.next_airplane_id, airplane_type="arrival")
-            # Samoloty przybywające nie mają jeszcze pozycji (są w powietrzu)
-            airplane.current_node = None
-            self.airplanes.append(airplane)
-            self.next_airplane_id += 1
+            self.add_arrival()
+
+    def add_arrival(self):
+        """Dodaje samolot przybywający (w powietrzu - bez pozycji na płycie)"""
+        airplane = Airplane(self, self.next_airplane_id, airplane_type="arrival")
+        airplane.current_node = None
+        self.airplanes.append(airplane)
+        self.next_airplane_id += 1
     
     def spawn_new_arrival(self):
         """Spawuje nowy samolot przybywający"""
         if self.random.random() < self.arrival_rate:
-            airplane = Airplane(self, self.next_airplane_id, airplane_type="arrival")
-            airplane.current_node = None
-            self.airplanes.append(airplane)
-            self.next_airplane_id += 1
+            self.add_arrival()
 
     def log_airplanes_status(self):
         """Loguje stan wszystkich samolotów"""
@@ -83,10 +112,7 @@ class AirportModel(Model):
             print(f"Aktualna operacja: {self.runway_controller.current_operation} - Samolot {self.runway_controller.current_airplane.unique_id}")
         
         # Statystyki stanów
-        states_count = {}
-        for airplane in self.airplanes:
-            state = airplane.state
-            states_count[state] = states_count.get(state, 0) + 1
+        states_count = self.fleet.state_counts()
         print(f"Stany: {', '.join([f'{k}: {v}' for k, v in sorted(states_count.items())])}")
         
         print(f"\n{'ID':<6} {'Typ':<10} {'Stan':<20} {'Węzeł':<8} {'Cel':<8} {'Ścieżka':<8} {'Blokady':<8} {'Kolejka':<8} {'Czeka':<8}")
@@ -104,25 +130,62 @@ class AirportModel(Model):
         
         print(f"{'='*80}\n")
 
-    def step(self):
-        """Krok symulacji"""
+    def advance_movement(self):
+        """
+        Przesuwa wszystkie poruszające się samoloty: kolejki na zajętych krawędziach
+        (pojedynczo, tylko tam, gdzie krawędź jest zajęta), potem jeden wektorowy krok
+        postępu i pozycji. Zakończenie ruchu tylko dla samolotów z postępem >= 1.0.
+        """
+        fleet = self.fleet
+        rows = fleet.moving_rows()
+        if len(rows) == 0:
+            return
+        fleet.advanced_at[rows] = self.step_count
+        edges = fleet.movement_edge[rows]
+        on_edge = edges >= 0
+        occupied = np.zeros(len(rows), dtype=bool)
+        occupied[on_edge] = self.segment_manager.edge_occupancy[edges[on_edge]] > 0
+        if occupied.any():
+            held = [fleet.owner[row]._hold_on_edge() for row in rows[occupied].tolist()]
+            keep = np.ones(len(rows), dtype=bool)
+            keep[np.flatnonzero(occupied)[held]] = False
+            rows = rows[keep]
+        for row in Airplane.movement_controller.advance(fleet, rows, self.graph, self.step_count).tolist():
+            airplane = fleet.owner[row]
+            airplane._finish_movement()
+            self.scheduler.wake(airplane)
+
+    def step(self, spawned=None):
+        """Krok symulacji (spawned=True - przylot już wylosowany przez silnik zdarzeń)"""
         self.step_count += 1
         print(self.segment_manager.airport_queue)
         # Czasami spawuj nowe samoloty
-        self.spawn_new_arrival()
+        if spawned:
+            self.add_arrival()
+        else:
+            self.spawn_new_arrival()
         # Wyczyść stare rezerwacje
         self.segment_manager.cleanup_old_reservations(self.step_count)
         # Krok dla wszystkich agentów
         # Najpierw runway controller
         self.runway_controller.step()
+        # Faza ruchu: wszystkie samoloty między węzłami naraz
+        self.advance_movement()
         
-        # Potem wszystkie samoloty (kopiujemy listę, bo może się zmienić)
-        for airplane in self.airplanes[:]:
-            airplane.step()
+        # Potem samoloty - tylko aktywne (uśpione czekają na budzik albo zdarzenie)
+        self.scheduler.step(self.step_count)
         
         # Loguj stan wszystkich samolotów
         #self.log_airplanes_status()
 
+    def run_until(self, until: int):
+        """Symuluje do ticku until: krok po kroku albo skokami między zdarzeniami (engine="event")"""
+        if self.event_engine is not None:
+            self.event_engine.run_until(until)
+            return
+        while self.running and self.step_count < until:
+            self.step()
+
 
     def portray_cell(cell_type):
         colors = {
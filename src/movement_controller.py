@@ -1,7 +1,10 @@
 import math
+import weakref
 from typing import Tuple, Optional, Dict
 from dataclasses import dataclass
 
+import numpy as np
+
 @dataclass
 class Position:
     """Pozycja samolotu z interpolacją między węzłami"""
@@ -11,10 +14,36 @@ class Position:
     target_node: Optional[int] = None
     progress: float = 0.0  # 0.0 = na początku, 1.0 = na końcu ścieżki
 
+
+@dataclass
+class TraversalTable:
+    """
+    Czasy przejazdu krawędzi w tickach: ticks[krawędź, typ ruchu] na prostej oraz
+    turns[(poprzednia krawędź, krawędź)] - wiersz czasów po zakręcie, tylko tam,
+    gdzie limit prędkości w zakręcie wydłuża przejazd.
+    """
+    version: int
+    types: Dict[str, int]
+    ticks: np.ndarray
+    turns: Dict[Tuple[int, int], np.ndarray]
+
+
 class MovementController:
     """Kontroler ruchu samolotów z prędkością i interpolacją"""
+
+    # Od tylu samolotów krok ruchu idzie przez NumPy (mniej - zwykła pętla)
+    VECTORIZE_FROM = 16
+    # Zmiana kursu [stopnie], od której obowiązuje limit prędkości w zakręcie
+    TURN_ANGLE_DEG = 30.0
     
-    def __init__(self):
+    def __init__(self, defaults: Optional[Dict] = None):
+        defaults = defaults or {}
+        # Prędkość kołowania [kt] odpowiadająca speeds["taxiing"] - przelicznik limitów z krawędzi
+        self.taxi_speed_kts = defaults.get('taxi_speed_straight_kts', 20)
+        # Tablice czasów przejazdu per graf (TraversalTable)
+        self._tables = weakref.WeakKeyDictionary()
+        # Grafy, w których zarejestrowano już słuchacza zmian limitów (jeden na graf)
+        self._listening = weakref.WeakSet()
         # Prędkości w jednostkach na tick (dostosowane do skali lotniska)
         self.speeds = {
             "taxiing": 0.5,      # Wolny ruch taxi
@@ -43,6 +72,89 @@ class MovementController:
         
         # Zawsze minimum określony czas
         return max(calculated_time, min_time)
+
+    def edge_movement_type(self, graph, edge_id: int, state: str) -> str:
+        """Typ ruchu na krawędzi: na pasie prędkość pasa, poza nim wg stanu samolotu"""
+        if graph.edge_types[edge_id] == "runway":
+            return "landing"
+        return self.get_movement_type_for_state(state)
+
+    def movement_ticks(self, graph, edge_id: int, movement_type: str,
+                       prev_edge: Optional[int] = None) -> int:
+        """Czas przejazdu krawędzi w tickach z tablicy (po zakręcie z prev_edge, jeśli podana)"""
+        table = self.traversal_table(graph)
+        column = table.types.get(movement_type)
+        if column is None:
+            # Typ bez ruchu (prędkość 0) - poza tablicą
+            u, v = graph.edge_u[edge_id], graph.edge_v[edge_id]
+            distance = self.calculate_distance(graph._node_pos[u], graph._node_pos[v])
+            return self.calculate_movement_time(distance, movement_type)
+        turn = table.turns.get((prev_edge, edge_id)) if prev_edge is not None else None
+        if turn is not None:
+            return turn.item(column)
+        return table.ticks.item(edge_id, column)
+
+    def traversal_table(self, graph) -> TraversalTable:
+        """Tablica czasów przejazdu dla grafu (liczona raz, odświeżana po zmianie grafu lub limitów)"""
+        tables = self._tables
+        table = tables.get(graph)
+        if table is None or table.version != graph.version:
+            if graph not in self._listening:
+                graph.add_listener(self._edge_changed_callback(tables, graph))
+                self._listening.add(graph)
+            table = tables[graph] = self._build_table(graph)
+        return table
+
+    def invalidate(self, graph):
+        """Odrzuca tablicę przejazdów grafu - następne zapytanie liczy ją od nowa"""
+        self._tables.pop(graph, None)
+
+    def _edge_changed_callback(self, tables, graph):
+        graph_ref = weakref.ref(graph)
+
+        def callback(edge_id: int, change: str):
+            owner = graph_ref()
+            if change == 'speed' and owner is not None:
+                tables.pop(owner, None)
+        return callback
+
+    def _build_table(self, graph) -> TraversalTable:
+        types = {name: i for i, name in enumerate(name for name, speed in self.speeds.items() if speed > 0)}
+        base = np.array([self.speeds[name] for name in types], dtype=np.float64)
+        min_time = np.array([self.min_transit_times.get(name, 1) for name in types], dtype=np.int64)
+        # Limity [kt] przeliczone na jednostki na tick (NaN = brak limitu)
+        per_kt = self.speeds["taxiing"] / self.taxi_speed_kts
+
+        u, v = graph.edge_u, graph.edge_v
+        distance = np.sqrt((graph.node_x[v] - graph.node_x[u]) ** 2 + (graph.node_y[v] - graph.node_y[u]) ** 2)
+
+        def ticks_for(distance, limit_kts):
+            speed = np.fmin(base[None, :], (limit_kts * per_kt)[:, None])
+            ticks = np.maximum(1, np.floor(distance[:, None] / speed)).astype(np.int64)
+            return np.maximum(ticks, min_time[None, :])
+
+        ticks = ticks_for(distance, graph.edge_speed_straight)
+
+        # Zakręty: pary (krawędź wjazdowa, krawędź z limitem w zakręcie) przy wspólnym węźle
+        turns: Dict[Tuple[int, int], np.ndarray] = {}
+        cos_limit = math.cos(math.radians(self.TURN_ANGLE_DEG))
+        for edge_id in np.flatnonzero(~np.isnan(graph.edge_speed_turn)).tolist():
+            limit = np.fmin(graph.edge_speed_turn[edge_id], graph.edge_speed_straight[edge_id])
+            turn_ticks = ticks_for(distance[edge_id:edge_id + 1], np.array([limit]))[0]
+            if np.array_equal(turn_ticks, ticks[edge_id]):
+                continue
+            for node, other in ((u[edge_id], v[edge_id]), (v[edge_id], u[edge_id])):
+                out = (graph.node_x[other] - graph.node_x[node], graph.node_y[other] - graph.node_y[node])
+                start, end = graph.csr_indptr[node], graph.csr_indptr[node + 1]
+                for prev_edge, prev_node in zip(graph.csr_edge[start:end].tolist(),
+                                                graph.csr_indices[start:end].tolist()):
+                    if prev_edge == edge_id:
+                        continue
+                    into = (graph.node_x[node] - graph.node_x[prev_node], graph.node_y[node] - graph.node_y[prev_node])
+                    norm = math.hypot(*into) * math.hypot(*out)
+                    if norm and (into[0] * out[0] + into[1] * out[1]) / norm < cos_limit:
+                        turns[(prev_edge, edge_id)] = turn_ticks
+        return TraversalTable(graph.version, types, ticks, turns)
     
     def interpolate_position(self, start_pos: Tuple[float, float], 
                            end_pos: Tuple[float, float], 
@@ -58,6 +170,47 @@ class MovementController:
         
         return (x, y)
     
+    def advance(self, fleet, rows: np.ndarray, graph, now: int) -> np.ndarray:
+        """
+        Wektorowy krok ruchu dla wierszy floty: postęp z czasu ruchu, limit zatrzymania
+        i pozycja jak w interpolate_position. Zwraca wiersze, które dotarły do celu.
+        """
+        if len(rows) < self.VECTORIZE_FROM:
+            return self._advance_rows(fleet, rows, graph, now)
+        elapsed = now - fleet.movement_start[rows]
+        progress = np.maximum(0.0, np.minimum(1.0, elapsed / fleet.movement_duration[rows]))
+        limit = fleet.hold_limit[rows]
+        capped = progress >= limit  # NaN (brak limitu) daje False
+        progress[capped] = limit[capped]
+
+        start = graph.node_indices(fleet.pos_current_node[rows])
+        end = graph.node_indices(fleet.pos_target_node[rows])
+        known = (start >= 0) & (end >= 0)
+        moved, p, start, end = rows[known], progress[known], start[known], end[known]
+        for coords, out in ((graph.node_x, fleet.x), (graph.node_y, fleet.y)):
+            a, b = coords[start], coords[end]
+            out[moved] = np.where(p <= 0.0, a, np.where(p >= 1.0, b, a + (b - a) * p))
+        fleet.progress[moved] = p
+        return rows[progress >= 1.0]
+
+    def _advance_rows(self, fleet, rows: np.ndarray, graph, now: int) -> np.ndarray:
+        """advance dla kilku wierszy - zwykła pętla (te same wzory)"""
+        arrived = []
+        for row in rows.tolist():
+            elapsed = now - fleet.movement_start.item(row)
+            progress = max(0.0, min(1.0, elapsed / fleet.movement_duration.item(row)))
+            limit = fleet.hold_limit.item(row)
+            if progress >= limit:
+                progress = limit
+            start = graph.get_node_position(fleet.pos_current_node.item(row))
+            end = graph.get_node_position(fleet.pos_target_node.item(row))
+            if start and end:
+                fleet.x[row], fleet.y[row] = self.interpolate_position(start, end, progress)
+                fleet.progress[row] = progress
+            if progress >= 1.0:
+                arrived.append(row)
+        return np.array(arrived, dtype=np.int64)
+
     def calculate_distance(self, pos1: Tuple[float, float], 
                           pos2: Tuple[float, float]) -> float:
         """Oblicza odległość euklidesową między dwoma pozycjami"""
@@ -0,0 +1,262 @@
+"""
+Kolejki samolotów o stałym koszcie operacji
+
+OrderedQueue - kolejka FIFO bez powtórzeń (zbiór z zachowaniem kolejności
+wstawiania): przynależność, sprawdzenie czoła i usunięcie dowolnego elementu
+w O(1), pozycja elementu w O(log n) (drzewo Fenwicka po numerach wstawienia).
+
+IndexedPriorityQueue - kopiec binarny z indeksem pozycji elementów, klucz
+(priorytet, czas wstawienia): wstawienie, zdjęcie, zmiana priorytetu i usunięcie
+dowolnego elementu w O(log n), k pierwszych w kolejności w O(k log k).
+"""
+
+import heapq
+from collections import deque
+from typing import Dict, Hashable, Iterator, List, Optional, Tuple
+
+
+class OrderedQueue:
+    """Kolejka FIFO bez duplikatów z szybkim usuwaniem ze środka"""
+
+    def __init__(self, items=()):
+        # element -> numer wstawienia (rosnący)
+        self._seq: Dict[Hashable, int] = {}
+        # Kolejność wstawień; usunięte elementy pomijane leniwie przy odczycie czoła
+        self._order: deque = deque()
+        self._next = 0
+        # Drzewo Fenwicka: 1 pod numerem wstawienia obecnego elementu
+        self._tree: List[int] = [0]
+        for item in items:
+            self.append(item)
+
+    def __len__(self) -> int:
+        return len(self._seq)
+
+    def __bool__(self) -> bool:
+        return bool(self._seq)
+
+    def __contains__(self, item) -> bool:
+        return item in self._seq
+
+    def __iter__(self) -> Iterator:
+        return (item for item, seq in self._order if self._seq.get(item) == seq)
+
+    def __repr__(self) -> str:
+        return f"OrderedQueue({list(self)})"
+
+    def _add(self, seq: int, delta: int):
+        i = seq + 1
+        while i < len(self._tree):
+            self._tree[i] += delta
+            i += i & -i
+
+    def _prefix(self, seq: int) -> int:
+        """Liczba obecnych elementów o numerze wstawienia < seq"""
+        total = 0
+        i = seq
+        while i > 0:
+            total += self._tree[i]
+            i -= i & -i
+        return total
+
+    def _rebuild(self):
+        """Nadaje elementom kolejne numery od 0 (gdy numeracja urosła względem długości kolejki)"""
+        items = list(self)
+        self._seq = {}
+        self._order = deque()
+        self._next = 0
+        self._tree = [0] * (2 * len(items) + 2)
+        for item in items:
+            self.append(item)
+
+    def append(self, item) -> bool:
+        """Dodaje element na koniec; zwraca False, jeśli już jest w kolejce"""
+        if item in self._seq:
+            return False
+        if self._next + 1 >= len(self._tree):
+            if self._next > 2 * len(self._seq) + 16:
+                self._rebuild()
+            if self._next + 1 >= len(self._tree):
+                # Fenwick: powiększenie tablicy wymaga przebudowy sum częściowych
+                items = list(self)
+                size = 2 * len(self._tree)
+                self._tree = [0] * size
+                for other in items:
+                    self._add(self._seq[other], 1)
+        seq = self._next
+        self._next += 1
+        self._seq[item] = seq
+        self._order.append((item, seq))
+        self._add(seq, 1)
+        return True
+
+    def remove(self, item):
+        """Usuwa element z dowolnego miejsca (ValueError, gdy go nie ma - jak deque.remove)"""
+        seq = self._seq.pop(item, None)
+        if seq is None:
+            raise ValueError(f"{item} nie ma w kolejce")
+        self._add(seq, -1)
+
+    def discard(self, item) -> bool:
+        if item not in self._seq:
+            return False
+        self.remove(item)
+        return True
+
+    def head(self) -> Optional[Hashable]:
+        """Pierwszy element lub None (zamortyzowane O(1))"""
+        order = self._order
+        while order and self._seq.get(order[0][0]) != order[0][1]:
+            order.popleft()
+        return order[0][0] if order else None
+
+    def is_head(self, item) -> bool:
+        return item in self._seq and self.head() == item
+
+    def popleft(self):
+        item = self.head()
+        if item is None:
+            raise IndexError("pop z pustej kolejki")
+        self.remove(item)
+        return item
+
+    def index(self, item) -> int:
+        """Pozycja elementu liczona od czoła (ValueError, gdy go nie ma - jak deque.index)"""
+        seq = self._seq.get(item)
+        if seq is None:
+            raise ValueError(f"{item} nie ma w kolejce")
+        return self._prefix(seq)
+
+
+class IndexedPriorityQueue:
+    """
+    Kolejka priorytetowa bez duplikatów. Wyższy priorytet wychodzi pierwszy
+    (jak Airplane.priority), przy równym - kolejność wstawienia (FIFO).
+    """
+
+    def __init__(self):
+        # Kopiec par (klucz, element), klucz = (-priorytet, numer wstawienia)
+        self._heap: List[Tuple[Tuple[int, int], Hashable]] = []
+        # element -> indeks w kopcu
+        self._pos: Dict[Hashable, int] = {}
+        self._next = 0
+        # Uporządkowana migawka, liczona leniwie i ważna do następnej zmiany
+        self._snapshot: Optional[Tuple] = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def __bool__(self) -> bool:
+        return bool(self._heap)
+
+    def __contains__(self, item) -> bool:
+        return item in self._pos
+
+    def __iter__(self) -> Iterator:
+        return iter(self.snapshot())
+
+    def __repr__(self) -> str:
+        return f"IndexedPriorityQueue({list(self.snapshot())})"
+
+    def _swap(self, i: int, j: int):
+        heap = self._heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self._pos[heap[i][1]] = i
+        self._pos[heap[j][1]] = j
+
+    def _sift_up(self, i: int):
+        heap = self._heap
+        while i > 0:
+            parent = (i - 1) >> 1
+            if heap[i][0] >= heap[parent][0]:
+                break
+            self._swap(i, parent)
+            i = parent
+
+    def _sift_down(self, i: int):
+        heap = self._heap
+        n = len(heap)
+        while True:
+            child = 2 * i + 1
+            if child >= n:
+                break
+            if child + 1 < n and heap[child + 1][0] < heap[child][0]:
+                child += 1
+            if heap[i][0] <= heap[child][0]:
+                break
+            self._swap(i, child)
+            i = child
+
+    def push(self, item, priority: int = 0) -> bool:
+        """Dodaje element; zwraca False, jeśli już jest w kolejce"""
+        if item in self._pos:
+            return False
+        self._heap.append(((-priority, self._next), item))
+        self._next += 1
+        self._pos[item] = len(self._heap) - 1
+        self._sift_up(len(self._heap) - 1)
+        self._snapshot = None
+        return True
+
+    def peek(self):
+        """Pierwszy element lub None"""
+        return self._heap[0][1] if self._heap else None
+
+    def pop(self):
+        if not self._heap:
+            raise IndexError("pop z pustej kolejki")
+        item = self._heap[0][1]
+        self.remove(item)
+        return item
+
+    def remove(self, item):
+        """Usuwa element z dowolnego miejsca (ValueError, gdy go nie ma)"""
+        i = self._pos.pop(item, None)
+        if i is None:
+            raise ValueError(f"{item} nie ma w kolejce")
+        last = self._heap.pop()
+        if i < len(self._heap):
+            self._heap[i] = last
+            self._pos[last[1]] = i
+            self._sift_up(i)
+            self._sift_down(self._pos[last[1]])
+        self._snapshot = None
+
+    def discard(self, item) -> bool:
+        if item not in self._pos:
+            return False
+        self.remove(item)
+        return True
+
+    def priority(self, item) -> int:
+        return -self._heap[self._pos[item]][0][0]
+
+    def update(self, item, priority: int):
+        """Zmienia priorytet elementu (czas wstawienia zostaje)"""
+        i = self._pos[item]
+        key, _ = self._heap[i]
+        self._heap[i] = ((-priority, key[1]), item)
+        self._sift_up(i)
+        self._sift_down(self._pos[item])
+        self._snapshot = None
+
+    def smallest(self, k: int) -> List:
+        """k pierwszych elementów w kolejności wyjścia (bez zmiany kopca)"""
+        heap = self._heap
+        if k >= len(heap):
+            return list(self.snapshot())
+        result = []
+        frontier = [(heap[0][0], 0)] if heap else []
+        while frontier and len(result) < k:
+            _, i = heapq.heappop(frontier)
+            result.append(heap[i][1])
+            for child in (2 * i + 1, 2 * i + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child][0], child))
+        return result
+
+    def snapshot(self) -> Tuple:
+        """Elementy w kolejności wyjścia; ta sama krotka, dopóki kolejka się nie zmieni"""
+        if self._snapshot is None:
+            self._snapshot = tuple(item for _, item in sorted(self._heap, key=lambda entry: entry[0]))
+        return self._snapshot
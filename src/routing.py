@@ -0,0 +1,550 @@
+import heapq
+import math
+from itertools import count
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+import numpy as np
+
+# Powyżej tej liczby węzłów wiersze tablicy liczone są leniwie (przy pierwszym zapytaniu)
+MAX_PRECOMPUTE_NODES = 2000
+
+# Strategie zapytań, które nie trafiły w policzony wiersz tablicy:
+#   "table"    - policz cały wiersz Dijkstry dla węzła startowego
+#   "dijkstra" - Dijkstra dla jednej pary (z wczesnym zakończeniem)
+#   "astar"    - A* z heurystyką euklidesową po współrzędnych węzłów
+ROUTE_STRATEGIES = ("table", "dijkstra", "astar")
+
+
+def heuristic_scale(lengths: np.ndarray, euclid: np.ndarray) -> float:
+    """
+    Współczynnik heurystyki A*: największe k, dla którego k * odległość_euklidesowa
+    nie przekracza długości żadnej krawędzi. Heurystyka k * |v - cel| jest wtedy
+    dopuszczalna i spójna (nierówność trójkąta).
+    """
+    mask = euclid > 0
+    if not mask.any():
+        return 0.0
+    scale = float(np.min(lengths[mask] / euclid[mask]))
+    return max(0.0, min(scale, 1.0)) if np.isfinite(scale) else 0.0
+
+
+def astar_search(indptr: Sequence[int], indices: Sequence[int], weights: Sequence[float],
+                 xs: Sequence[float], ys: Sequence[float], scale: float,
+                 source: int, target: int, blocked_nodes: Optional[Set[int]] = None,
+                 blocked_arcs: Optional[Set[Tuple[int, int]]] = None) -> Tuple[Optional[List[int]], int]:
+    """
+    A* dla jednej pary po indeksach gęstych. Zwraca (ścieżka indeksów lub None, liczba rozwiniętych węzłów).
+    Dla scale = 0 jest to zwykła Dijkstra z wczesnym zakończeniem. Opcjonalnie pomija
+    zablokowane węzły i łuki (v, u) - używane przez algorytm Yena.
+    """
+    tx, ty = xs[target], ys[target]
+    g: Dict[int, float] = {source: 0.0}
+    pred: Dict[int, int] = {}
+    closed: Set[int] = set(blocked_nodes) if blocked_nodes else set()
+    c = count()
+    fringe = [(scale * math.hypot(xs[source] - tx, ys[source] - ty), next(c), source)]
+    expanded = 0
+    while fringe:
+        _, _, v = heapq.heappop(fringe)
+        if v in closed:
+            continue
+        closed.add(v)
+        expanded += 1
+        if v == target:
+            path = [v]
+            while v != source:
+                v = pred[v]
+                path.append(v)
+            path.reverse()
+            return path, expanded
+        gv = g[v]
+        for a in range(indptr[v], indptr[v + 1]):
+            u = indices[a]
+            if u in closed or (blocked_arcs and (v, u) in blocked_arcs):
+                continue
+            ng = gv + weights[a]
+            if ng < g.get(u, math.inf):
+                g[u] = ng
+                pred[u] = v
+                h = scale * math.hypot(xs[u] - tx, ys[u] - ty) if scale else 0.0
+                heapq.heappush(fringe, (ng + h, next(c), u))
+    return None, expanded
+
+
+def hop_limited_search(indptr: Sequence[int], indices: Sequence[int], weights: Sequence[float],
+                       xs: Sequence[float], ys: Sequence[float], scale: float,
+                       source: int, target: int, max_hops: int, blocked_nodes: Optional[Set[int]] = None,
+                       blocked_arcs: Optional[Set[Tuple[int, int]]] = None) -> Optional[List[int]]:
+    """
+    A* po stanach (węzeł, liczba krawędzi): najkrótsza ścieżka source -> target
+    o co najwyżej max_hops krawędziach (lub None). Stan jest pomijany, jeśli węzeł
+    zamknięto już przy nie większej liczbie krawędzi - ma wtedy nie mniejszą długość.
+    """
+    tx, ty = xs[target], ys[target]
+    blocked = blocked_nodes or ()
+    closed_hops: Dict[int, int] = {}
+    pred: Dict[Tuple[int, int], Tuple[int, int]] = {}
+    g: Dict[Tuple[int, int], float] = {(source, 0): 0.0}
+    c = count()
+    fringe = [(scale * math.hypot(xs[source] - tx, ys[source] - ty), next(c), source, 0)]
+    while fringe:
+        _, _, v, hops = heapq.heappop(fringe)
+        if v in blocked or closed_hops.get(v, max_hops + 1) <= hops:
+            continue
+        closed_hops[v] = hops
+        if v == target:
+            state = (v, hops)
+            path = [v]
+            while state[0] != source:
+                state = pred[state]
+                path.append(state[0])
+            path.reverse()
+            return path
+        if hops == max_hops:
+            continue
+        gv = g[(v, hops)]
+        for a in range(indptr[v], indptr[v + 1]):
+            u = indices[a]
+            if u in blocked or closed_hops.get(u, max_hops + 1) <= hops + 1:
+                continue
+            if blocked_arcs and (v, u) in blocked_arcs:
+                continue
+            ng = gv + weights[a]
+            state = (u, hops + 1)
+            if ng < g.get(state, math.inf):
+                g[state] = ng
+                pred[state] = (v, hops)
+                h = scale * math.hypot(xs[u] - tx, ys[u] - ty) if scale else 0.0
+                heapq.heappush(fringe, (ng + h, next(c), u, hops + 1))
+    return None
+
+
+def dijkstra_row(indptr: Sequence[int], indices: Sequence[int], weights: Sequence[float],
+                 source: int, pred_row: np.ndarray, dist_row: np.ndarray):
+    """
+    Dijkstra z jednego źródła po indeksach gęstych (sąsiedztwo w formacie CSR).
+
+    Odległości są dokładne, ale przy ścieżkach równej długości drzewo poprzedników
+    może wybrać inną niż nx.shortest_path (ta dla pary używa Dijkstry dwukierunkowej) -
+    ścieżki dla par wyznacza bidirectional_dijkstra.
+    """
+    dist: Dict[int, float] = {}
+    pred: Dict[int, int] = {}
+    seen: Dict[int, float] = {source: 0.0}
+    c = count()
+    fringe = [(0.0, next(c), source)]
+    while fringe:
+        d, _, v = heapq.heappop(fringe)
+        if v in dist:
+            continue
+        dist[v] = d
+        for a in range(indptr[v], indptr[v + 1]):
+            u = indices[a]
+            if u in dist:
+                continue
+            vu_dist = d + weights[a]
+            if vu_dist == math.inf:  # łuk wyłączony (zamknięty / zakaz kierunku)
+                continue
+            if u not in seen or vu_dist < seen[u]:
+                seen[u] = vu_dist
+                pred[u] = v
+                heapq.heappush(fringe, (vu_dist, next(c), u))
+
+    for v, d in dist.items():
+        dist_row[v] = d
+    for u, v in pred.items():
+        pred_row[u] = v
+
+
+def bidirectional_dijkstra(indptr: Sequence[int], indices: Sequence[int], weights: Sequence[float],
+                           arc_src: Sequence[int], rev_indptr: Sequence[int], rev_arcs: Sequence[int],
+                           source: int, target: int) -> Optional[List[int]]:
+    """
+    Dijkstra dwukierunkowa dla jednej pary (indeksy gęste) - przeniesiona z networkx
+    łącznie z rozstrzyganiem remisów, więc zwraca tę samą ścieżkę co nx.shortest_path
+    na grafie skierowanym zbudowanym w kolejności pliku krawędzi.
+    Kierunek wsteczny idzie po łukach wchodzących: rev_arcs[rev_indptr[v]:rev_indptr[v + 1]]
+    to numery łuków kończących się w v (w kolejności poprzedników networkx).
+    """
+    if source == target:
+        return [source]
+    dists: List[Dict[int, float]] = [{}, {}]
+    paths: List[Dict[int, List[int]]] = [{source: [source]}, {target: [target]}]
+    seen: List[Dict[int, float]] = [{source: 0.0}, {target: 0.0}]
+    c = count()
+    fringe: List[List[Tuple[float, int, int]]] = [[(0.0, next(c), source)], [(0.0, next(c), target)]]
+    final_path: List[int] = []
+    final_dist = math.inf
+    direction = 1
+    while fringe[0] and fringe[1]:
+        direction = 1 - direction
+        d, _, v = heapq.heappop(fringe[direction])
+        done = dists[direction]
+        if v in done:
+            continue
+        done[v] = d
+        if v in dists[1 - direction]:
+            return final_path
+        if direction == 0:
+            arcs = range(indptr[v], indptr[v + 1])
+        else:
+            arcs = rev_arcs[rev_indptr[v]:rev_indptr[v + 1]]
+        seen_dir, paths_dir = seen[direction], paths[direction]
+        for a in arcs:
+            cost = weights[a]
+            if cost == math.inf:  # łuk wyłączony - w networkx nie istnieje
+                continue
+            u = indices[a] if direction == 0 else arc_src[a]
+            vu_dist = d + cost
+            if u in done:
+                continue
+            if u not in seen_dir or vu_dist < seen_dir[u]:
+                seen_dir[u] = vu_dist
+                heapq.heappush(fringe[direction], (vu_dist, next(c), u))
+                paths_dir[u] = paths_dir[v] + [u]
+                if u in seen[0] and u in seen[1]:
+                    total = seen[0][u] + seen[1][u]
+                    if not final_path or final_dist > total:
+                        final_dist = total
+                        final_path = paths[0][u] + paths[1][u][-2::-1]
+    return None
+
+
+def path_cost(indptr: Sequence[int], indices: Sequence[int], weights: Sequence[float],
+              path: Sequence[int]) -> float:
+    """Suma wag łuków ścieżki (indeksy gęste)"""
+    total = 0.0
+    for v, u in zip(path, path[1:]):
+        for a in range(indptr[v], indptr[v + 1]):
+            if indices[a] == u:
+                total += weights[a]
+                break
+        else:
+            return math.inf
+    return total
+
+
+def k_shortest_paths(indptr: Sequence[int], indices: Sequence[int], weights: Sequence[float],
+                     xs: Sequence[float], ys: Sequence[float], scale: float,
+                     source: int, target: int, max_hops: Optional[int] = None) -> Iterator[List[int]]:
+    """
+    Algorytm Yena: leniwie generuje ścieżki bez pętli source -> target
+    w kolejności rosnącej długości (kolejna ścieżka liczona dopiero na żądanie).
+    Z max_hops - tylko ścieżki o co najwyżej max_hops krawędziach (ograniczenie
+    obowiązuje już w wyszukiwaniu odgałęzień, więc nie trzeba odrzucać kandydatów).
+    """
+    def search(spur: int, hops_used: int, blocked_nodes=None, blocked_arcs=None) -> Optional[List[int]]:
+        if max_hops is None:
+            return astar_search(indptr, indices, weights, xs, ys, scale, spur, target,
+                                blocked_nodes=blocked_nodes, blocked_arcs=blocked_arcs)[0]
+        return hop_limited_search(indptr, indices, weights, xs, ys, scale, spur, target,
+                                  max_hops - hops_used, blocked_nodes, blocked_arcs)
+
+    first = search(source, 0)
+    if first is None:
+        return
+    found = [first]
+    seen = {tuple(first)}
+    c = count()
+    candidates: List[Tuple[float, int, List[int]]] = []
+    yield first
+    while True:
+        previous = found[-1]
+        for i in range(len(previous) - 1):
+            spur = previous[i]
+            root = previous[:i + 1]
+            blocked_arcs = {(p[i], p[i + 1]) for p in found if len(p) > i + 1 and p[:i + 1] == root}
+            spur_path = search(spur, i, set(root[:-1]), blocked_arcs)
+            if spur_path is None:
+                continue
+            candidate = root[:-1] + spur_path
+            key = tuple(candidate)
+            if key not in seen:
+                seen.add(key)
+                heapq.heappush(candidates, (path_cost(indptr, indices, weights, candidate), next(c), candidate))
+        if not candidates:
+            return
+        _, _, best = heapq.heappop(candidates)
+        # Kandydat mógł stracić ważność, jeśli w międzyczasie wyłączono łuk
+        while not math.isfinite(path_cost(indptr, indices, weights, best)):
+            if not candidates:
+                return
+            _, _, best = heapq.heappop(candidates)
+        found.append(best)
+        yield best
+
+
+class RouteTable:
+    """
+    Tablica najkrótszych tras dla wszystkich par węzłów.
+
+    Przechowuje wiersze poprzedników i odległości (wiersz = węzeł startowy)
+    oraz negatywny cache par nieosiągalnych. Odczyt trasy kosztuje O(długość ścieżki).
+    Dla małych grafów wiersze leżą w pełnych macierzach n x n liczonych od razu,
+    dla dużych - zapytanie bez policzonego wiersza obsługuje wybrana strategia
+    (ROUTE_STRATEGIES), a wynik trafia do cache par.
+    Tablica jest związana z wersją grafu - po zmianie struktury grafu należy zbudować
+    nową. Zmiany wag łuków (zamknięcia, jednokierunkowość) obsługuje set_arc_weight,
+    unieważniając tylko dotknięte wpisy.
+    """
+
+    def __init__(self, node_ids: Sequence[int], indptr: np.ndarray, indices: np.ndarray,
+                 weights: np.ndarray, version: int = 0, precompute: Optional[bool] = None,
+                 index: Optional[Dict[int, int]] = None, strategy: str = "astar",
+                 coords: Optional[Tuple[np.ndarray, np.ndarray]] = None, scale: float = 0.0):
+        self.version = version
+        self.node_ids = list(node_ids)
+        if index is None:
+            index = {node_id: i for i, node_id in enumerate(self.node_ids)}
+        self.index: Dict[int, int] = index
+        # Listy Pythona - szybsze od tablic NumPy przy dostępie element po elemencie
+        self.indptr: List[int] = np.asarray(indptr).tolist()
+        self.indices: List[int] = np.asarray(indices).tolist()
+        self.weights: List[float] = np.asarray(weights, dtype=np.float64).tolist()
+        n = len(self.node_ids)
+        self.arc_src: List[int] = np.repeat(np.arange(n), np.diff(np.asarray(indptr))).tolist()
+        self.rev_indptr, self.rev_arcs = self._incoming_arcs(n)
+        self.dense = n <= MAX_PRECOMPUTE_NODES
+        if self.dense:
+            self.pred = np.full((n, n), -1, dtype=np.int32)
+            self.dist = np.full((n, n), np.inf, dtype=np.float64)
+        # Policzone wiersze: indeks źródła -> (poprzednicy, odległości)
+        self.rows: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+        # Czy tablica była kompletna - wtedy unieważnione wiersze liczymy ponownie w całości
+        self.complete = False
+        # Negatywny cache: pary (start, cel) o których wiemy, że nie mają ścieżki
+        self.unreachable: Set[Tuple[int, int]] = set()
+        # Ścieżki (indeksy gęste) znalezione zapytaniami dla pojedynczych par
+        self.pair_paths: Dict[Tuple[int, int], Tuple[int, ...]] = {}
+
+        self.strategy = self.check_strategy(strategy)
+        if coords is None:
+            self.xs: List[float] = [0.0] * n
+            self.ys: List[float] = [0.0] * n
+            scale = 0.0
+        else:
+            self.xs = np.asarray(coords[0], dtype=np.float64).tolist()
+            self.ys = np.asarray(coords[1], dtype=np.float64).tolist()
+        self.scale = scale
+        # Liczba węzłów rozwiniętych przez ostatnie zapytanie dla pary (do pomiarów)
+        self.last_expanded = 0
+        # k najkrótszych ścieżek: (start, cel[, limit krawędzi]) -> (już wygenerowane ścieżki, generator Yena)
+        self.k_paths: Dict[Tuple[int, int], Tuple[List[List[int]], Iterator[List[int]]]] = {}
+
+        if precompute is None:
+            precompute = self.dense
+        if precompute:
+            self.precompute()
+
+    def _incoming_arcs(self, n: int) -> Tuple[List[int], List[int]]:
+        """
+        Łuki wchodzące do każdego węzła (CSR po końcach łuków). Kolejność jak poprzedników
+        w nx.DiGraph: łuk u -> v stoi na pozycji łuku v -> u wśród wychodzących z v.
+        """
+        indptr, indices, arc_src = self.indptr, self.indices, self.arc_src
+        arc_of = {(v, u): a for a, (v, u) in enumerate(zip(arc_src, indices))}
+        incoming: List[List[int]] = [[] for _ in range(n)]
+        for v in range(n):
+            for a in range(indptr[v], indptr[v + 1]):
+                b = arc_of.get((indices[a], v))
+                if b is not None:
+                    incoming[v].append(b)
+        for b, (u, v) in enumerate(zip(arc_src, indices)):
+            if (v, u) not in arc_of:
+                incoming[v].append(b)
+        rev_indptr = [0]
+        for arcs in incoming:
+            rev_indptr.append(rev_indptr[-1] + len(arcs))
+        return rev_indptr, [b for arcs in incoming for b in arcs]
+
+    @staticmethod
+    def check_strategy(strategy: str) -> str:
+        if strategy not in ROUTE_STRATEGIES:
+            raise ValueError(f"Nieznana strategia wyznaczania tras: {strategy}")
+        return strategy
+
+    def precompute(self):
+        """Liczy wszystkie wiersze tablicy"""
+        for i in range(len(self.node_ids)):
+            self.row(i)
+        self.complete = True
+
+    def row(self, i: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Wiersz (poprzednicy, odległości) dla źródła o indeksie i"""
+        row = self.rows.get(i)
+        if row is None:
+            if self.dense:
+                pred_row, dist_row = self.pred[i], self.dist[i]
+            else:
+                n = len(self.node_ids)
+                pred_row = np.full(n, -1, dtype=np.int32)
+                dist_row = np.full(n, np.inf, dtype=np.float64)
+            dijkstra_row(self.indptr, self.indices, self.weights, i, pred_row, dist_row)
+            row = (pred_row, dist_row)
+            self.rows[i] = row
+        return row
+
+    def export_rows(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Policzone wiersze jako tablice (źródła, poprzednicy, odległości) - do zapisu w cache"""
+        sources = np.array(sorted(self.rows), dtype=np.int32)
+        n = len(self.node_ids)
+        if len(sources) == 0:
+            return sources, np.empty((0, n), dtype=np.int32), np.empty((0, n), dtype=np.float64)
+        pred = np.stack([self.rows[i][0] for i in sources.tolist()])
+        dist = np.stack([self.rows[i][1] for i in sources.tolist()])
+        return sources, pred, dist
+
+    def import_rows(self, sources: np.ndarray, pred: np.ndarray, dist: np.ndarray):
+        """Wczytuje gotowe wiersze (np. z cache) zamiast liczyć je od nowa"""
+        for k, i in enumerate(sources.tolist()):
+            if self.dense:
+                self.pred[i] = pred[k]
+                self.dist[i] = dist[k]
+                self.rows[i] = (self.pred[i], self.dist[i])
+            else:
+                self.rows[i] = (pred[k], dist[k])
+        self.complete = len(self.rows) == len(self.node_ids)
+
+    def distance(self, start: int, end: int) -> float:
+        """Długość najkrótszej ścieżki (inf gdy brak)"""
+        s = self.index.get(start)
+        t = self.index.get(end)
+        if s is None or t is None:
+            return float('inf')
+        return float(self.row(s)[1][t])
+
+    def path(self, start: int, end: int) -> List[int]:
+        """
+        Zwraca nową listę węzłów najkrótszej ścieżki lub [] gdy brak ścieżki.
+        Przy policzonej tablicy i strategiach "table"/"dijkstra" ścieżka jest ta sama
+        co z nx.shortest_path (Dijkstra dwukierunkowa); A* może wybrać inną spośród
+        ścieżek równej długości.
+        """
+        key = (start, end)
+        if key in self.unreachable:
+            return []
+        s = self.index.get(start)
+        t = self.index.get(end)
+        if s is None or t is None:
+            self.unreachable.add(key)
+            return []
+        if s == t:
+            return [start]
+        if s not in self.rows and not self.complete and self.strategy != "table":
+            return self._pair_path(s, t, key)
+        if not np.isfinite(self.row(s)[1][t]):
+            self.unreachable.add(key)
+            return []
+        return self._pair_path(s, t, key)
+
+    def _pair_path(self, s: int, t: int, key: Tuple[int, int]) -> List[int]:
+        """Zapytanie dla jednej pary (Dijkstra dwukierunkowa lub A*) z zapamiętaniem wyniku"""
+        dense_path = self.pair_paths.get((s, t))
+        if dense_path is None:
+            if self.strategy == "astar" and s not in self.rows and not self.complete:
+                found, self.last_expanded = astar_search(
+                    self.indptr, self.indices, self.weights, self.xs, self.ys, self.scale, s, t)
+            else:
+                found = bidirectional_dijkstra(self.indptr, self.indices, self.weights, self.arc_src,
+                                               self.rev_indptr, self.rev_arcs, s, t)
+            if found is None:
+                self.unreachable.add(key)
+                return []
+            dense_path = tuple(found)
+            self.pair_paths[(s, t)] = dense_path
+        node_ids = self.node_ids
+        return [node_ids[i] for i in dense_path]
+
+    def k_shortest(self, start: int, end: int, k: int, max_hops: Optional[int] = None) -> List[List[int]]:
+        """
+        Do k najkrótszych ścieżek bez pętli (kopie list id węzłów), rosnąco według długości,
+        opcjonalnie tylko o co najwyżej max_hops krawędziach.
+        Wynik zapamiętywany dla pary - kolejne zapytania z tym samym lub mniejszym k
+        nie liczą nic, a większe k tylko dociąga brakujące ścieżki z generatora.
+        """
+        s = self.index.get(start)
+        t = self.index.get(end)
+        if s is None or t is None or (start, end) in self.unreachable:
+            return []
+        if s == t:
+            return [[start]]
+        key = (start, end) if max_hops is None else (start, end, max_hops)
+        entry = self.k_paths.get(key)
+        if entry is None:
+            generator = k_shortest_paths(self.indptr, self.indices, self.weights,
+                                         self.xs, self.ys, self.scale, s, t, max_hops)
+            entry = ([], generator)
+            self.k_paths[key] = entry
+        paths, generator = entry
+        while len(paths) < k:
+            dense_path = next(generator, None)
+            if dense_path is None:
+                break
+            paths.append([self.node_ids[i] for i in dense_path])
+        if not paths and max_hops is None:
+            self.unreachable.add((start, end))
+        return [list(p) for p in paths[:k]]
+
+    def _drop_rows(self, sources: Sequence[int]):
+        for i in sources:
+            del self.rows[i]
+            if self.dense:
+                self.pred[i] = -1
+                self.dist[i] = np.inf
+
+    def _lower_bound(self, i: int, j: int) -> float:
+        """Dolne ograniczenie długości ścieżki i -> j (heurystyka euklidesowa)"""
+        return self.scale * math.hypot(self.xs[i] - self.xs[j], self.ys[i] - self.ys[j])
+
+    def set_arc_weight(self, a: int, weight: float):
+        """
+        Zmienia wagę łuku a (inf = łuk wyłączony) i unieważnia tylko wpisy, na które
+        zmiana może wpłynąć:
+        - wzrost wagi: wiersze, których drzewo najkrótszych ścieżek używa łuku,
+          oraz ścieżki par zawierające łuk,
+        - spadek wagi: wiersze, w których łuk skraca odległość do jego końca,
+          ścieżki par, które łuk mógłby skrócić, i nieosiągalne pary, którym łuk
+          mógł dać połączenie.
+        """
+        old = self.weights[a]
+        if weight == old:
+            return
+        self.weights[a] = weight
+        v, u = self.arc_src[a], self.indices[a]
+        sources = list(self.rows)
+
+        if weight > old:
+            if self.dense and sources:
+                rows = np.array(sources)
+                stale = rows[self.pred[rows, u] == v].tolist()
+            else:
+                stale = [i for i in sources if self.rows[i][0][u] == v]
+            self._drop_rows(stale)
+            for key, dense_path in list(self.pair_paths.items()):
+                if any(x == v and y == u for x, y in zip(dense_path, dense_path[1:])):
+                    del self.pair_paths[key]
+            for key, (paths, _) in list(self.k_paths.items()):
+                v_id, u_id = self.node_ids[v], self.node_ids[u]
+                if any(x == v_id and y == u_id for p in paths for x, y in zip(p, p[1:])):
+                    del self.k_paths[key]
+            return
+
+        if self.dense and sources:
+            rows = np.array(sources)
+            stale = rows[self.dist[rows, v] + weight < self.dist[rows, u]].tolist()
+        else:
+            stale = [i for i in sources if self.rows[i][1][v] + weight < self.rows[i][1][u]]
+        self._drop_rows(stale)
+        for (s, t), dense_path in list(self.pair_paths.items()):
+            bound = self._lower_bound(s, v) + weight + self._lower_bound(u, t)
+            if bound <= path_cost(self.indptr, self.indices, self.weights, dense_path):
+                del self.pair_paths[(s, t)]
+        for start, end in list(self.unreachable):
+            s = self.index.get(start)
+            if s is None or self.index.get(end) is None:
+                continue
+            row = self.rows.get(s)
+            if row is None or np.isfinite(row[1][v]):
+                self.unreachable.discard((start, end))
+        # Stanu generatora Yena nie da się poprawić - liczymy od nowa przy następnym zapytaniu
+        self.k_paths.clear()
@@ -0,0 +1,106 @@
+"""
+Sekwencjonowanie mieszanej kolejki lądowań i startów
+
+Okno pierwszych `window` samolotów z kolejki pasa jest przestawiane tak, by
+zminimalizować czas zakończenia ostatniej operacji (sumę separacji).
+Programowanie dynamiczne po typach operacji: w obrębie typu zachowana jest
+kolejność FIFO, więc stan to (liczba ułożonych lądowań, liczba ułożonych
+startów, ostatnia operacja) - O(window^2) stanów. Ograniczenie przesunięć
+(constrained position shifting, CPS): samolot może zmienić pozycję najwyżej
+o `max_shift` miejsc, a każde pominięcie zużywa jego budżet, więc nikt nie
+czeka w nieskończoność. Wyniki są zapamiętywane po wzorcu typów w oknie.
+"""
+
+from functools import lru_cache
+from typing import Dict, Optional, Sequence, Tuple
+
+# Indeksy operacji jak w AtcController: start, lądowanie
+TAKEOFF, LANDING = 0, 1
+OP_INDEX = {"T": TAKEOFF, "L": LANDING}
+
+
+class RunwaySequencer:
+    """Wybór kolejności operacji na pasie w ograniczonym oknie"""
+
+    def __init__(self, gaps: Tuple[Tuple[int, int], Tuple[int, int]], window: int = 8, max_shift: int = 2):
+        """
+        Args:
+            gaps: minimalny odstęp w tickach [poprzednia][następna] operacja (T=0, L=1)
+            window: liczba samolotów z czoła kolejki branych pod uwagę
+            max_shift: maksymalne przesunięcie samolotu względem kolejności FIFO
+        """
+        self.gaps = gaps
+        self.window = window
+        self.max_shift = max_shift
+        # ID samolotu -> o ile miejsc już go wyprzedzono
+        self.deferred: Dict[int, int] = {}
+        self._order = lru_cache(maxsize=4096)(self._solve)
+
+    def order(self, ops: Sequence[str], ready: Tuple[int, int] = (0, 0),
+              budgets: Optional[Sequence[int]] = None) -> Tuple[int, ...]:
+        """
+        Najlepsza kolejność okna jako indeksy w `ops` ("T"/"L" w kolejności FIFO).
+
+        Args:
+            ready: za ile ticków pas dopuszcza pierwszy start / pierwsze lądowanie
+            budgets: ile miejsc każdy samolot może jeszcze zostać wyprzedzony
+                     (domyślnie max_shift)
+        """
+        ops = tuple(OP_INDEX[op] for op in ops[:self.window])
+        if budgets is None:
+            budgets = (self.max_shift,) * len(ops)
+        budgets = tuple(min(b, self.max_shift) for b in budgets[:len(ops)])
+        return self._order(ops, tuple(ready), budgets)
+
+    def _solve(self, ops: Tuple[int, ...], ready: Tuple[int, int], budgets: Tuple[int, ...]) -> Tuple[int, ...]:
+        positions = ([i for i, op in enumerate(ops) if op == TAKEOFF],
+                     [i for i, op in enumerate(ops) if op == LANDING])
+        n_t, n_l = len(positions[TAKEOFF]), len(positions[LANDING])
+        gaps, max_shift = self.gaps, self.max_shift
+        # (ułożone starty, ułożone lądowania, ostatnia operacja) -> ((czas, przesunięcia), poprzedni stan, indeks)
+        best = {(0, 0, None): ((0, 0), None, None)}
+        # Stany przeglądane warstwami po liczbie ułożonych samolotów
+        layer = [(0, 0, None)]
+        for placed in range(len(ops)):
+            next_layer = {}
+            for state in layer:
+                t, l, last = state
+                (time, shift), _, _ = best[state]
+                for op, count in ((TAKEOFF, t), (LANDING, l)):
+                    if count == (n_t if op == TAKEOFF else n_l):
+                        continue
+                    index = positions[op][count]
+                    # CPS: do przodu najwyżej max_shift, do tyłu najwyżej budżet samolotu
+                    if placed < index - max_shift or placed > index + budgets[index]:
+                        continue
+                    at = ready[op] if last is None else time + gaps[last][op]
+                    cost = (at, shift + abs(placed - index))
+                    key = (t + (op == TAKEOFF), l + (op == LANDING), op)
+                    if key not in best or cost < best[key][0]:
+                        best[key] = (cost, state, index)
+                        next_layer[key] = None
+            layer = list(next_layer)
+        finals = [state for state in layer if state[0] == n_t and state[1] == n_l]
+        if not finals:
+            return tuple(range(len(ops)))
+        state = min(finals, key=lambda s: best[s][0])
+        order = []
+        while best[state][1] is not None:
+            order.append(best[state][2])
+            state = best[state][1]
+        return tuple(reversed(order))
+
+    def choose(self, airplanes: Sequence, ready: Tuple[int, int] = (0, 0)) -> int:
+        """Indeks samolotu z kolejki, który powinien operować jako następny"""
+        window = airplanes[:self.window]
+        if len(window) <= 1:
+            return 0
+        ops = ["L" if a.airplane_type == "arrival" else "T" for a in window]
+        budgets = [max(0, self.max_shift - self.deferred.get(a.unique_id, 0)) for a in window]
+        return self.order(ops, ready, budgets)[0]
+
+    def served(self, airplanes: Sequence, index: int):
+        """Zapisuje obsłużenie samolotu `index` - wyprzedzeni przed nim zużywają budżet"""
+        self.deferred.pop(airplanes[index].unique_id, None)
+        for airplane in airplanes[:index]:
+            self.deferred[airplane.unique_id] = self.deferred.get(airplane.unique_id, 0) + 1
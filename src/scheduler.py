@@ -0,0 +1,143 @@
+"""
+Harmonogram aktywnych samolotów dla AirportModel
+
+W ticku krok wykonują tylko samoloty, które mogą zmienić stan; pozostałe są
+uśpione do ticku budzika (Airplane.next_step_time) albo do zdarzenia, które je
+budzi: koniec ruchu w fazie ruchu, przydział operacji na pasie, zwolnienie
+segmentu, na który czekały (SegmentManager.unpark). Kroki idą w kolejności
+rejestracji agentów (jak lista model.airplanes), a samolot obudzony w trakcie
+ticku wykonuje krok jeszcze w tym ticku, jeśli jego kolej nie minęła - tak jak
+w pętli po wszystkich samolotach. Uśpionym liczniki czasu w stanach zwiększa
+jedna operacja na tablicach floty.
+"""
+
+import heapq
+from itertools import count
+from typing import Dict, List, Optional, Set, Tuple
+
+import numpy as np
+
+
+class ActiveSetScheduler:
+    """Zbiory aktywnych i uśpionych samolotów sterowane budzikami i zdarzeniami"""
+
+    def __init__(self, model):
+        self.model = model
+        self._seq = count()
+        # Agent -> numer rejestracji (kolejność kroków)
+        self._order: Dict[object, int] = {}
+        self._by_id: Dict[int, object] = {}
+        # Budziki uśpionych: kopiec (tick, numer, wpis, agent) z leniwym usuwaniem wg _due
+        self._timers: List[Tuple[int, int, int, object]] = []
+        self._entries = count()
+        self._due: Dict[object, int] = {}
+        # Aktywni w bieżącym ticku: kopiec (numer, agent)
+        self._ready: List[Tuple[int, object]] = []
+        self._ready_set: Set[object] = set()
+        self._current: Optional[int] = None
+        # Samoloty dodane, obudzone lub po kroku od ostatniego odczytu - zbierane
+        # tylko na żądanie (EventEngine ustawia pusty zbiór)
+        self.touched: Optional[Set[object]] = None
+
+    def __len__(self) -> int:
+        return len(self._order)
+
+    def __contains__(self, agent) -> bool:
+        return agent in self._order
+
+    def add(self, agent):
+        """Rejestruje samolot - aktywny od najbliższego ticku"""
+        if agent in self._order:
+            return
+        self._order[agent] = next(self._seq)
+        if self.touched is not None:
+            self.touched.add(agent)
+        self._schedule(agent, self.model.step_count)
+
+    def remove(self, agent):
+        """Wyrejestrowuje samolot (np. po odlocie)"""
+        self._order.pop(agent, None)
+        self._due.pop(agent, None)
+        self._ready_set.discard(agent)
+        if self.touched is not None:
+            self.touched.discard(agent)
+        if self._by_id.get(agent.unique_id) is agent:
+            del self._by_id[agent.unique_id]
+
+    def is_dormant(self, agent) -> bool:
+        """Czy samolot śpi (bez kroku w następnym ticku, o ile nic go nie obudzi)"""
+        if agent in self._ready_set:
+            return False
+        due = self._due.get(agent)
+        return due is None or due > self.model.step_count + 1
+
+    def wake(self, agent):
+        """Budzi samolot: krok jeszcze w tym ticku, jeśli jego kolej nie minęła"""
+        seq = self._order.get(agent)
+        if seq is None or agent in self._ready_set:
+            return
+        if self.touched is not None:
+            self.touched.add(agent)
+        if self._current is not None and seq > self._current:
+            self._due.pop(agent, None)
+            self._ready_set.add(agent)
+            heapq.heappush(self._ready, (seq, agent))
+        else:
+            self._schedule(agent, self.model.step_count + (self._current is not None))
+
+    def wake_id(self, airplane_id: int):
+        """wake po ID samolotu (dla obserwatorów SegmentManager)"""
+        agent = self._by_id.get(airplane_id)
+        if agent is None:
+            self._by_id = {agent.unique_id: agent for agent in self._order}
+            agent = self._by_id.get(airplane_id)
+        if agent is not None:
+            self.wake(agent)
+
+    def _schedule(self, agent, tick: Optional[int]):
+        """Ustawia budzik (zostaje wcześniejszy z istniejącym); None - śpi do zdarzenia"""
+        if tick is None or agent in self._ready_set:
+            return
+        due = self._due.get(agent)
+        if due is None or tick < due:
+            self._due[agent] = tick
+            heapq.heappush(self._timers, (tick, self._order[agent], next(self._entries), agent))
+
+    def step(self, now: int):
+        """Kroki aktywnych samolotów w ticku now, potem liczniki czasu uśpionych"""
+        timers, due = self._timers, self._due
+        while timers and timers[0][0] <= now:
+            tick, seq, _, agent = heapq.heappop(timers)
+            if due.get(agent) == tick:
+                del due[agent]
+                self._ready_set.add(agent)
+                heapq.heappush(self._ready, (seq, agent))
+
+        fleet = self.model.fleet
+        stepped = []
+        ready = self._ready
+        touched = self.touched
+        while ready:
+            seq, agent = heapq.heappop(ready)
+            self._ready_set.discard(agent)
+            if agent not in self._order:
+                continue
+            self._current = seq
+            row = agent._row
+            agent.step()
+            if agent in self._order:
+                stepped.append(row)
+                if touched is not None:
+                    touched.add(agent)
+                self._schedule(agent, agent.next_step_time(now))
+        self._current = None
+
+        # Pominięte kroki zwiększyłyby tylko liczniki czasu w stanie
+        if len(stepped) == len(self._order):
+            return
+        rows = fleet.active_rows()
+        if stepped:
+            skipped = np.ones(fleet.capacity, dtype=bool)
+            skipped[stepped] = False
+            rows = rows[skipped[rows]]
+        fleet.add_state_time(rows)
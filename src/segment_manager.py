@@ -1,11 +1,16 @@
-import time
-import inspect
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 from enum import Enum
-from math import isfinite
+from math import ceil, isfinite
+from bisect import bisect_right
+import heapq
 from collections import deque
 
+import numpy as np
+
+from src.queues import OrderedQueue
+from src.wait_for import WaitForGraph
+
 
 
 
@@ -15,62 +20,91 @@ class AtcController:
     """
     Prosty kontroler ATC dla pasa: zarządza separacjami T/T, L/L, T/L, L/T
     oraz czasem blokady pasa dla line-up / takeoff roll / landing roll + bufor.
-    """
 
+    Parametry w sekundach (jak DEFAULTS w model.py), czas symulacji w tickach
+    (tick_s sekund na tick). Separacje leżą w macierzy [poprzednia][następna]
+    operacja, a najwcześniejszy dozwolony czas każdej operacji jest liczony przy
+    przydziale - sprawdzenie can_takeoff/can_land to jedno porównanie.
+    """
 
-    def __init__(self):
-        # separacje w sekundach (proste stałe)
-        self.sep_TT_s = 60
-        self.sep_LL_s = 70
-        self.sep_TL_s = 90
-        self.sep_LT_s = 90
+    # Indeksy operacji w macierzy separacji
+    OPS = {"T": 0, "L": 1}
+    TAKEOFF, LANDING = 0, 1
+
+    def __init__(self, defaults: Optional[Dict] = None):
+        defaults = defaults or {}
+        self.tick_s = defaults.get('tick_s', 1)
+        # separacje w sekundach
+        self.sep_TT_s = defaults.get('sep_TT_s', 60)
+        self.sep_LL_s = defaults.get('sep_LL_s', 70)
+        self.sep_TL_s = defaults.get('sep_TL_s', 90)
+        self.sep_LT_s = defaults.get('sep_LT_s', 90)
         # czasy zajęcia pasa
-        self.lineup_block_s = 20
-        self.takeoff_roll_time_s = 35
-        self.landing_roll_time_s = 40
-        self.runway_buffer_after_exit_s = 15
+        self.lineup_block_s = defaults.get('runway_lineup_block_s', 20)
+        self.takeoff_roll_time_s = defaults.get('takeoff_roll_time_s', 35)
+        self.landing_roll_time_s = defaults.get('landing_roll_time_s', 40)
+        self.runway_buffer_after_exit_s = defaults.get('runway_buffer_after_exit_s', 15)
+        # separacje i blokady w tickach: sep[poprzednia][następna]
+        self.sep = ((self._ticks(self.sep_TT_s), self._ticks(self.sep_TL_s)),
+                    (self._ticks(self.sep_LT_s), self._ticks(self.sep_LL_s)))
+        self.lineup_block = self._ticks(self.lineup_block_s)
+        self.takeoff_occupancy = self._ticks(self.takeoff_roll_time_s + self.runway_buffer_after_exit_s)
+        self.landing_occupancy = self._ticks(self.landing_roll_time_s + self.runway_buffer_after_exit_s)
+        # minimalny odstęp kolejnych operacji: separacja albo zajęcie pasa przez poprzednią
+        occupancy = (self.takeoff_occupancy, self.landing_occupancy)
+        self.gaps = tuple(tuple(max(sep, occupancy[prev]) for sep in row) for prev, row in enumerate(self.sep))
         # stan
         self.last_takeoff_time: int = -10**9
         self.last_landing_time: int = -10**9
         self.runway_lock_until: int = 0
-        self.last_op: str = ""  # "T" albo "L" 
-        
-
+        self.last_op: str = ""  # "T" albo "L"
+        # najwcześniejszy tick startu / lądowania
+        self.next_allowed = [0, 0]
+
+    def _ticks(self, seconds: float) -> int:
+        return ceil(seconds / self.tick_s)
+
+    def _update_next_allowed(self):
+        """Przelicza najwcześniejsze czasy obu operacji po zmianie stanu pasa"""
+        lock = self.runway_lock_until
+        if not self.last_op:
+            self.next_allowed = [lock, lock]
+            return
+        last = self.OPS[self.last_op]
+        last_time = self.last_takeoff_time if last == self.TAKEOFF else self.last_landing_time
+        row = self.sep[last]
+        self.next_allowed = [max(lock, last_time + row[0]), max(lock, last_time + row[1])]
+
+    def earliest(self, op: str) -> int:
+        """Najwcześniejszy tick operacji "T" albo "L" przy obecnym stanie pasa"""
+        return self.next_allowed[self.OPS[op]]
 
     def can_line_up(self, now: int) -> bool:
         return now >= self.runway_lock_until
 
     def grant_line_up(self, now: int):
-        self.runway_lock_until = max(self.runway_lock_until, now + self.lineup_block_s)
+        self.runway_lock_until = max(self.runway_lock_until, now + self.lineup_block)
         self.last_op = "T"  # line-up poprzedza start
+        self._update_next_allowed()
 
     def can_takeoff(self, now: int) -> bool:
-        # separacja zależna od poprzedniej operacji
-        if self.last_op == "T":
-            return (now - self.last_takeoff_time) >= self.sep_TT_s and now >= self.runway_lock_until
-        if self.last_op == "L":
-            return (now - self.last_landing_time) >= self.sep_LT_s and now >= self.runway_lock_until
-        return now >= self.runway_lock_until
+        return now >= self.next_allowed[self.TAKEOFF]
 
     def grant_takeoff(self, now: int):
-        occ = self.takeoff_roll_time_s + self.runway_buffer_after_exit_s
-        self.runway_lock_until = max(self.runway_lock_until, now + occ)
+        self.runway_lock_until = max(self.runway_lock_until, now + self.takeoff_occupancy)
         self.last_takeoff_time = now
         self.last_op = "T"
+        self._update_next_allowed()
 
     def can_land(self, eta: int) -> bool:
         # zakładamy sprawdzenie na czas przylotu (ETA)
-        if self.last_op == "L":
-            return (eta - self.last_landing_time) >= self.sep_LL_s and eta >= self.runway_lock_until
-        if self.last_op == "T":
-            return (eta - self.last_takeoff_time) >= self.sep_TL_s and eta >= self.runway_lock_until
-        return eta >= self.runway_lock_until
+        return eta >= self.next_allowed[self.LANDING]
 
     def grant_landing(self, now_touchdown: int):
-        occ = self.landing_roll_time_s + self.runway_buffer_after_exit_s
-        self.runway_lock_until = max(self.runway_lock_until, now_touchdown + occ)
+        self.runway_lock_until = max(self.runway_lock_until, now_touchdown + self.landing_occupancy)
         self.last_landing_time = now_touchdown
         self.last_op = "L"
+        self._update_next_allowed()
 
 @dataclass
 class SegmentReservation:
@@ -82,6 +116,192 @@ class SegmentReservation:
     priority: int = 1  # Wyższa liczba = wyższy priorytet
     reservation_type: str = "movement"  # movement, holding, emergency
 
+
+class SegmentCalendar:
+    """
+    Kalendarz rezerwacji jednego segmentu.
+
+    Rezerwacje leżą w "pasmach": w każdym paśmie przedziały się nie nakładają,
+    więc posortowane są jednocześnie po początku i po końcu - zapytania o okno
+    czasowe to wyszukiwanie binarne. Przeterminowane rezerwacje odcina wskaźnik
+    początku pasma (head), przesuwany wyszukiwaniem binarnym po końcach.
+    """
+
+    # Po ilu odciętych wpisach fizycznie skracamy listy pasma
+    COMPACT_AFTER = 64
+
+    def __init__(self):
+        # Pasmo: [początki, końce, rezerwacje, head]
+        self.lanes: List[list] = []
+
+    def __bool__(self) -> bool:
+        return any(lane[3] < len(lane[2]) for lane in self.lanes)
+
+    def active(self) -> List[SegmentReservation]:
+        """Aktywne (nieprzeterminowane) rezerwacje, pasmo po paśmie"""
+        return [r for lane in self.lanes for r in lane[2][lane[3]:]]
+
+    @staticmethod
+    def _overlapping(lane: list, t0: int, t1: int, exclude_airplane: Optional[int] = None) -> List[SegmentReservation]:
+        starts, ends, items, head = lane
+        i = bisect_right(ends, t0, head)
+        found = []
+        while i < len(items) and starts[i] < t1:
+            if items[i].airplane_id != exclude_airplane:
+                found.append(items[i])
+            i += 1
+        return found
+
+    def add(self, reservation: SegmentReservation):
+        t0, t1 = reservation.start_time, reservation.end_time
+        for lane in self.lanes:
+            if not self._overlapping(lane, t0, t1):
+                break
+        else:
+            lane = [[], [], [], 0]
+            self.lanes.append(lane)
+        i = bisect_right(lane[0], t0, lane[3])
+        lane[0].insert(i, t0)
+        lane[1].insert(i, t1)
+        lane[2].insert(i, reservation)
+
+    def count_overlapping(self, t0: int, t1: int, exclude_airplane: Optional[int] = None) -> int:
+        return sum(len(self._overlapping(lane, t0, t1, exclude_airplane)) for lane in self.lanes)
+
+    def blocked_lanes(self, t0: int, t1: int, exclude_airplane: Optional[int] = None) -> int:
+        """Liczba pasm z rezerwacją w [t0, t1) - ograniczenie górne liczby samolotów naraz"""
+        return sum(1 for lane in self.lanes if self._overlapping(lane, t0, t1, exclude_airplane))
+
+    def earliest_free(self, t0: int, duration: int, capacity: int = 1,
+                      airplane_id: Optional[int] = None) -> int:
+        """Najwcześniejsze t >= t0, dla którego okno [t, t + duration) ma wolne miejsce"""
+        t = t0
+        while True:
+            blocking_ends = []
+            for lane in self.lanes:
+                found = self._overlapping(lane, t, t + duration, airplane_id)
+                if found:
+                    blocking_ends.append(min(r.end_time for r in found))
+            if len(blocking_ends) < capacity:
+                return t
+            # Wcześniej żadna z kolidujących rezerwacji się nie skończy
+            t = min(blocking_ends)
+
+    def expire(self, now: int) -> List[SegmentReservation]:
+        """Odcina rezerwacje zakończone do chwili now (end_time <= now) i zwraca je"""
+        expired = []
+        for lane in self.lanes:
+            head = bisect_right(lane[1], now, lane[3])
+            expired.extend(lane[2][lane[3]:head])
+            lane[3] = head
+            if head == len(lane[2]):
+                for k in range(3):
+                    lane[k].clear()
+                lane[3] = 0
+            elif head >= self.COMPACT_AFTER and 2 * head >= len(lane[2]):
+                for k in range(3):
+                    del lane[k][:head]
+                lane[3] = 0
+        self.lanes = [lane for lane in self.lanes if lane[2]]
+        return expired
+
+    def remove_airplane(self, airplane_id: int) -> int:
+        removed = 0
+        for lane in self.lanes:
+            head = lane[3]
+            kept = [k for k in range(head, len(lane[2])) if lane[2][k].airplane_id != airplane_id]
+            removed += len(lane[2]) - head - len(kept)
+            lane[0], lane[1], lane[2] = ([lane[j][k] for k in kept] for j in range(3))
+            lane[3] = 0
+        self.lanes = [lane for lane in self.lanes if lane[2]]
+        return removed
+
+
+class ReservationTable:
+    """
+    Tablica rezerwacji segmentów w czasie: segment_id -> SegmentCalendar.
+    Rezerwacja zajmuje segment w przedziale [start_time, end_time).
+    """
+
+    def __init__(self):
+        self.calendars: Dict[int, SegmentCalendar] = {}
+        # Segmenty, na których samolot ma rezerwacje: samolot -> {segment: liczba rezerwacji}
+        self.segments_by_airplane: Dict[int, Dict[int, int]] = {}
+        # Kopiec (koniec rezerwacji, segment) - expire odwiedza tylko segmenty z zakończonymi
+        self._expiry: List[Tuple[int, int]] = []
+
+    @property
+    def by_segment(self) -> Dict[int, List[SegmentReservation]]:
+        """Aktywne rezerwacje według segmentu"""
+        return {segment_id: calendar.active() for segment_id, calendar in self.calendars.items() if calendar}
+
+    def add(self, reservation: SegmentReservation):
+        calendar = self.calendars.get(reservation.segment_id)
+        if calendar is None:
+            calendar = self.calendars[reservation.segment_id] = SegmentCalendar()
+        calendar.add(reservation)
+        segments = self.segments_by_airplane.setdefault(reservation.airplane_id, {})
+        segments[reservation.segment_id] = segments.get(reservation.segment_id, 0) + 1
+        heapq.heappush(self._expiry, (reservation.end_time, reservation.segment_id))
+
+    def count_overlapping(self, segment_id: int, t0: int, t1: int,
+                          exclude_airplane: Optional[int] = None) -> int:
+        """Liczba rezerwacji segmentu nachodzących na [t0, t1) (bez rezerwacji danego samolotu)"""
+        calendar = self.calendars.get(segment_id)
+        return calendar.count_overlapping(t0, t1, exclude_airplane) if calendar else 0
+
+    def is_free(self, segment_id: int, t0: int, t1: int, capacity: int = 1,
+                airplane_id: Optional[int] = None) -> bool:
+        """Czy segment ma wolne miejsce w całym przedziale [t0, t1)"""
+        calendar = self.calendars.get(segment_id)
+        return calendar is None or calendar.blocked_lanes(t0, t1, airplane_id) < capacity
+
+    def earliest_free(self, segment_id: int, t0: int, duration: int, capacity: int = 1,
+                      airplane_id: Optional[int] = None) -> int:
+        """Początek najwcześniejszego wolnego okna długości duration, nie wcześniej niż t0"""
+        calendar = self.calendars.get(segment_id)
+        return calendar.earliest_free(t0, duration, capacity, airplane_id) if calendar else t0
+
+    def expire(self, now: int):
+        """Usuwa rezerwacje zakończone do chwili now - tylko w segmentach zdjętych z kopca końców"""
+        expiry = self._expiry
+        segment_ids = set()
+        while expiry and expiry[0][0] <= now:
+            segment_ids.add(heapq.heappop(expiry)[1])
+        for segment_id in segment_ids:
+            # Wpis po anulowanej rezerwacji (remove_airplane) może wskazywać pusty segment
+            calendar = self.calendars.get(segment_id)
+            if calendar is None:
+                continue
+            for reservation in calendar.expire(now):
+                self._forget(reservation.airplane_id, segment_id)
+            if not calendar.lanes:
+                del self.calendars[segment_id]
+
+    def _forget(self, airplane_id: int, segment_id: int):
+        segments = self.segments_by_airplane.get(airplane_id)
+        if segments is None:
+            return
+        left = segments.get(segment_id, 0) - 1
+        if left > 0:
+            segments[segment_id] = left
+        else:
+            segments.pop(segment_id, None)
+            if not segments:
+                del self.segments_by_airplane[airplane_id]
+
+    def remove_airplane(self, airplane_id: int) -> int:
+        """Usuwa wszystkie rezerwacje samolotu, zwraca ich liczbę"""
+        removed = 0
+        for segment_id in self.segments_by_airplane.pop(airplane_id, ()):
+            calendar = self.calendars.get(segment_id)
+            if calendar is None:
+                continue
+            removed += calendar.remove_airplane(airplane_id)
+            if not calendar.lanes:
+                del self.calendars[segment_id]
+        return removed
+
 @dataclass
 class ConflictProposal:
     """Propozycja rozwiązania konfliktu"""
@@ -94,41 +314,106 @@ class ConflictProposal:
 from typing import Dict, List, Tuple, Optional
 
 
-def _edge_key(u: int, v: int) -> Tuple[int, int]:
-    """Zapewnia deterministyczny klucz krawędzi (kolejność bez znaczenia)."""
-    return (u, v) if u <= v else (v, u)
-
-
 class SegmentManager:
     """Uproszczony menedżer rezerwacji segmentów lotniska."""
 
     def __init__(self, model=None):
         self.model = model
-        # Rezerwacje krawędzi: (u,v) -> lista ID samolotów zajmujących segment
-        self.edge_reservations: Dict[Tuple[int, int], deque[int]] = {}
+        # Rezerwacje krawędzi w tablicach indeksowanych id krawędzi:
+        # pojemność, liczba zajmujących i ich ID w kolejności wjazdu (sloty, -1 = wolny)
+        num_edges = model.graph.num_edges if model is not None else 0
+        self.edge_capacity = np.ones(num_edges, dtype=np.int32)
+        self.edge_occupancy = np.zeros(num_edges, dtype=np.int32)
+        self.edge_occupants = np.full((num_edges, 1), -1, dtype=np.int64)
+        if model is not None:
+            self._build_capacity_table()
+        # Indeks odwrotny: samolot -> id trzymanych krawędzi (źródło prawdy o jego blokadach)
+        self._held: Dict[int, set] = {}
         # Rezerwacje węzłów: node_id -> ID samolotu (pojemność = 1)
         self.node_reservations: Dict[int, int] = {}
+        # Kontroler ATC pasa (separacje i blokady wg DEFAULTS modelu)
+        self.atc = AtcController(getattr(model, 'defaults', None))
         # Prosty lock pushbacku (1 tug)
         self.pushback_lock_until: int = 0
         self.pushback_active_aircraft: Optional[int] = None
         self.default_pushback_time: int = 3  # liczba ticków pushbacku (prosty model)
-        self.airport_queue: deque[int] = deque()
+        # Kolejka do płyty (FIFO, bez duplikatów): członkostwo, czoło i usuwanie w O(1)
+        self.airport_queue = OrderedQueue()
+        # Uśpione prośby: samolot -> (priorytet, numer kolejny, segmenty), segment -> oczekujący
+        self._parked: Dict[int, Tuple[int, int, Tuple[int, ...]]] = {}
+        self._edge_waiters: Dict[int, Dict[int, None]] = {}
+        self._blockers: Dict[int, set] = {}
+        self._park_seq = 0
+        # Obudzeni, którzy jeszcze nie ponowili prośby: samolot -> segmenty, na których go obudzono
+        self._woken_for: Dict[int, set] = {}
+        # Ostatnio obudzeni, w kolejności budzenia (podgląd) i licznik pobudek
+        self.woken: deque = deque(maxlen=256)
+        self.wakeups = 0
+        # Graf oczekiwania: samolot -> {segment: (czy czeka w kolejce na krawędzi, trzymający)},
+        # segment -> czekające samoloty; wykryte cykle i słuchacze zakleszczeń
+        self.wait_for = WaitForGraph()
+        self._wait_holders: Dict[int, Dict[int, Tuple[bool, set]]] = {}
+        self._segment_waiting: Dict[int, set] = {}
+        self.deadlocks: deque = deque(maxlen=64)
+        self._deadlock_listeners = []
+        # Słuchacze zwolnienia uśpionego samolotu (callback(id samolotu))
+        self._unpark_listeners = []
+        # Sekcje lotniska: nazwa -> (id krawędzi, rekordy krawędzi)
+        self._sections: Dict[str, Tuple[np.ndarray, Tuple[Dict, ...]]] = {}
+        # Rezerwacje czasowe (planowane trasy) i planer przestrzeń-czas (tworzony leniwie)
+        self.reservation_table = ReservationTable()
+        self._planner = None
+        if model is not None:
+            model.graph.add_listener(self._on_edge_changed)
+
+    def _on_edge_changed(self, edge_id: int, change: str):
+        """Zmiana krawędzi w grafie (zamknięcie, kierunek, pojemność...)"""
+        if change == 'direction' and self._planner is not None:
+            self._planner.update_edge(edge_id)
+        elif change == 'speed' and self._planner is not None:
+            from src.agents.airplane import Airplane
+
+            # Słuchacz MovementController może być wywołany dopiero po nas - tablicę odrzucamy sami
+            Airplane.movement_controller.invalidate(self.model.graph)
+            self._planner.edge_ticks[edge_id] = self._edge_ticks()[edge_id]
+            self._planner.update_edge(edge_id)
+        elif change == 'capacity':
+            graph = self.model.graph
+            capacity = self._capacity_rule(graph.edge_capacity[edge_id:edge_id + 1],
+                                           graph.edge_types[edge_id:edge_id + 1])
+            self.edge_capacity[edge_id] = capacity[0]
+            self._ensure_slots(int(capacity[0]))
+            self._wake_segment(edge_id)
     # ------------------------------------------------------------------
     # Pomocnicze
     # ------------------------------------------------------------------
+    @staticmethod
+    def _capacity_rule(capacities: np.ndarray, edge_types: np.ndarray) -> np.ndarray:
+        """Pojemność z grafu, a bez niej: zjazdy/wjazdy na pas mieszczą kolejkę (5), reszta 1 samolot"""
+        default = np.where(np.isin(edge_types, ("runway_entry", "runway_exit")), 5, 1)
+        return np.where(capacities > 0, capacities, default).astype(np.int32)
+
+    def _build_capacity_table(self):
+        graph = self.model.graph
+        self.edge_capacity = self._capacity_rule(graph.edge_capacity, graph.edge_types)
+        self._ensure_slots(int(self.edge_capacity.max()) if len(self.edge_capacity) else 1)
+
+    def _ensure_slots(self, capacity: int):
+        """Poszerza tablicę slotów, jeśli pojemność krawędzi wzrosła ponad jej szerokość"""
+        width = self.edge_occupants.shape[1]
+        if capacity > width:
+            extra = np.full((len(self.edge_occupants), capacity - width), -1, dtype=np.int64)
+            self.edge_occupants = np.hstack([self.edge_occupants, extra])
+
     def _edge_capacity(self, u: int, v: int) -> int:
-        if self.model and self.model.graph.graph.has_edge(u, v):
-            capacity = self.model.graph.graph[u][v].get("capacity")
-            if isinstance(capacity, int) and capacity > 0:
-                return capacity
-            # Jeśli to runway – domyślnie 1
-            edge_type = self.model.graph.graph[u][v].get("type")
-            if ["runway_entry", "runway_exit"].__contains__(edge_type):
-                return 5
-            else:
-                return 1
+        edge_id = self.model.graph.get_edge_id(u, v) if self.model else None
+        if edge_id is not None:
+            return int(self.edge_capacity[edge_id])
         return 1
 
+    def _edge_capacity_by_id(self, edge_id: int) -> int:
+        return int(self.edge_capacity[edge_id])
+
     # ------------------------------------------------------------------
     # Rezerwacje węzłów
     # ------------------------------------------------------------------
@@ -148,108 +433,490 @@ class SegmentManager:
     # Rezerwacje krawędzi
     # ------------------------------------------------------------------
     def request_edge(self, u: int, v: int, airplane_id: int) -> bool:
-        key = _edge_key(u, v)
-        q: deque = self.edge_reservations.setdefault(key, deque())            
-        if airplane_id in q:
-            return True
-        capacity = self._edge_capacity(u, v)
-        if len(q) < capacity:
-            q.append(airplane_id)
+        edge_id = self.model.graph.get_edge_id(u, v) if self.model else None
+        if edge_id is None:
+            return False
+        return self.request_edge_id(edge_id, airplane_id)
+
+    def request_edge_id(self, edge_id: int, airplane_id: int) -> bool:
+        """Rezerwacja krawędzi po id: O(pojemność), bez alokacji"""
+        count = self.edge_occupancy[edge_id]
+        slots = self.edge_occupants[edge_id]
+        for i in range(count):
+            if slots[i] == airplane_id:
+                self._granted(airplane_id)
+                return True
+        if count < self.edge_capacity[edge_id]:
+            slots[count] = airplane_id
+            self.edge_occupancy[edge_id] = count + 1
+            self._held.setdefault(airplane_id, set()).add(int(edge_id))
+            if edge_id in self._segment_waiting:
+                self._holder_added(edge_id, airplane_id)
+            self._granted(airplane_id)
             return True
+        self._blocked_on(airplane_id, (edge_id,))
         return False
 
     def release_edge(self, u: int, v: int, airplane_id: int):
-        key = _edge_key(u, v)
-        q: deque = self.edge_reservations.get(key)
-        print(f"release_edge {u} {v}: {airplane_id} -> {list(q) if q else 'None'}")
-
-
-        if key in self.edge_reservations and q:
-            try:
-                q.remove(airplane_id)
-                print(f"release_edge: after remove -> {list(q)}")
-                if not self.edge_reservations[key]:
-                    del self.edge_reservations[key]
-                    print(f"release_edge: queue empty, key removed")
-            except ValueError:
-                print(f"release_edge: airplane {airplane_id} not in queue {key}")
-                pass
+        edge_id = self.model.graph.get_edge_id(u, v) if self.model else None
+        if edge_id is not None:
+            self.release_edge_id(edge_id, airplane_id)
+
+    def release_edge_id(self, edge_id: int, airplane_id: int) -> bool:
+        """Zwalnia krawędź; pozostali zajmujący zachowują kolejność wjazdu"""
+        count = int(self.edge_occupancy[edge_id])
+        slots = self.edge_occupants[edge_id]
+        for i in range(count):
+            if slots[i] == airplane_id:
+                slots[i:count - 1] = slots[i + 1:count]
+                slots[count - 1] = -1
+                self.edge_occupancy[edge_id] = count - 1
+                self._forget_held(airplane_id, (int(edge_id),))
+                if edge_id in self._segment_waiting:
+                    self._holder_removed(edge_id, airplane_id)
+                if edge_id in self._edge_waiters:
+                    self._wake_segment(edge_id)
+                return True
+        return False
+
+    def _forget_held(self, airplane_id: int, edge_ids):
+        held = self._held.get(airplane_id)
+        if held is not None:
+            held.difference_update(edge_ids)
+            if not held:
+                del self._held[airplane_id]
+
+    def holds(self, airplane_id: int, u: int, v: int) -> bool:
+        """Czy samolot trzyma krawędź (u, v) - O(1)"""
+        edge_id = self.model.graph.get_edge_id(u, v) if self.model else None
+        return edge_id is not None and self.holds_edge_id(airplane_id, edge_id)
+
+    def holds_edge_id(self, airplane_id: int, edge_id: int) -> bool:
+        held = self._held.get(airplane_id)
+        return held is not None and edge_id in held
+
+    def held_edge_ids(self, airplane_id: int) -> List[int]:
+        """Id krawędzi trzymanych przez samolot (rosnąco)"""
+        return sorted(self._held.get(airplane_id, ()))
+
+    def held_count(self, airplane_id: int) -> int:
+        return len(self._held.get(airplane_id, ()))
+
+    def release_all(self, airplane_id: int, keep: Tuple[int, ...] = ()) -> int:
+        """
+        Zwalnia wszystkie krawędzie samolotu poza tymi z `keep` - O(k) dla k
+        trzymanych krawędzi. Zwraca liczbę zwolnionych.
+        """
+        held = self._held.get(airplane_id)
+        if not held or (len(held) <= len(keep) and held.issubset(keep)):
+            return 0
+        edge_ids = [edge_id for edge_id in held if edge_id not in keep]
+        if edge_ids:
+            self.release_edge_ids(edge_ids, airplane_id)
+        return len(edge_ids)
+
     # ------------------------------------------------------------------
     # Rezerwacje sekcji lotniska 
     # ------------------------------------------------------------------
+    # Sekcje lotniska: nazwa -> typy krawędzi
+    SECTION_EDGE_TYPES = {
+        "runway": ("runway",),
+        "taxiway_inbound": ("runway_entry",),
+        "taxiway_outbound": ("runway_exit",),
+        "airport_deck": ("apron_link", "stand_link", "taxiway"),
+    }
+
+    # Od tylu krawędzi operacje zbiorcze idą przez NumPy (mniejsze - zwykła pętla)
+    VECTORIZE_FROM = 16
+
+    def _section(self, section: str) -> Tuple[np.ndarray, Tuple[Dict, ...]]:
+        """Id krawędzi sekcji i ich rekordy (w tej samej kolejności), liczone raz"""
+        cached = self._sections.get(section)
+        if cached is None:
+            graph = self.model.graph
+            edge_types = self.SECTION_EDGE_TYPES[section]
+            ids = np.concatenate([graph.get_edge_ids_by_type(t) for t in edge_types]).astype(np.int64)
+            cached = (ids, graph.get_edges_by_types(edge_types))
+            self._sections[section] = cached
+        return cached
+
+    def _grantable(self, edge_ids: np.ndarray, airplane_id: int) -> np.ndarray:
+        """Maska krawędzi, które samolot już trzyma albo które mają wolne miejsce"""
+        held = (self.edge_occupants[edge_ids] == airplane_id).any(axis=1)
+        return held | (self.edge_occupancy[edge_ids] < self.edge_capacity[edge_ids])
+
+    def request_edges_atomic(self, edge_ids: np.ndarray, airplane_id: int) -> bool:
+        """
+        Rezerwuje cały zbiór krawędzi albo nic: najpierw wektorowe sprawdzenie
+        zajętości wszystkich krawędzi, potem zapis bez kolejnych warunków.
+        Id krawędzi muszą być unikalne.
+        """
+        edge_ids = np.asarray(edge_ids, dtype=np.int64)
+        held = (self.edge_occupants[edge_ids] == airplane_id).any(axis=1)
+        free = self.edge_occupancy[edge_ids] < self.edge_capacity[edge_ids]
+        grantable = held | free
+        if not grantable.all():
+            self._blocked_on(airplane_id, edge_ids[~grantable].tolist())
+            return False
+        new = edge_ids[~held]
+        self.edge_occupants[new, self.edge_occupancy[new]] = airplane_id
+        self.edge_occupancy[new] += 1
+        new = new.tolist()
+        self._held.setdefault(airplane_id, set()).update(new)
+        if self._segment_waiting:
+            for edge_id in new:
+                if edge_id in self._segment_waiting:
+                    self._holder_added(edge_id, airplane_id)
+        self._granted(airplane_id)
+        return True
+
+    def release_edge_ids(self, edge_ids: np.ndarray, airplane_id: int):
+        """Zwalnia krawędzie wektorowo; pozostali zajmujący zachowują kolejność wjazdu"""
+        if len(edge_ids) < self.VECTORIZE_FROM:
+            for edge_id in edge_ids:
+                self.release_edge_id(edge_id, airplane_id)
+            return
+        edge_ids = np.unique(np.asarray(edge_ids, dtype=np.int64))
+        rows = self.edge_occupants[edge_ids]
+        mine = rows == airplane_id
+        hit = mine.any(axis=1)
+        if not hit.any():
+            return
+        edge_ids, rows, mine = edge_ids[hit], rows[hit], mine[hit]
+        # Stabilne sortowanie po masce przesuwa zwalniany slot na koniec bez zmiany kolejności reszty
+        order = np.argsort(mine, axis=1, kind='stable')
+        rows = np.take_along_axis(rows, order, axis=1)
+        rows[np.take_along_axis(mine, order, axis=1)] = -1
+        self.edge_occupants[edge_ids] = rows
+        self.edge_occupancy[edge_ids] -= 1
+        self._forget_held(airplane_id, edge_ids.tolist())
+        if self._segment_waiting:
+            for edge_id in edge_ids.tolist():
+                if edge_id in self._segment_waiting:
+                    self._holder_removed(edge_id, airplane_id)
+        if self._edge_waiters:
+            for edge_id in edge_ids.tolist():
+                if edge_id in self._edge_waiters:
+                    self._wake_segment(edge_id)
+
     def request_airport_section(self, section: str, airplane_id: int) -> Tuple[bool, List[Dict]]:
-        success = True
-        blocked_edges = []
-        match section:
-            case "runway":
-                for edge in self.model.graph.get_edges_by_type("runway"):
-                    if not self.request_edge(edge['from'], edge['to'], airplane_id):
-                        success = False
-                        break
-                    else:
-                        blocked_edges.append(edge)
-            case "taxiway_inbound":
-                success = False
-                for edge in self.model.graph.get_edges_by_type("runway_entry"):
-                    if self.request_edge(edge['from'], edge['to'], airplane_id):
-                        success = True
-                        blocked_edges.append(edge)
-                        break
-            case "taxiway_outbound":
-                success = False
-                for edge in self.model.graph.get_edges_by_type("runway_exit"):
-                    if self.request_edge(edge['from'], edge['to'], airplane_id):
-                        success = True
-                        blocked_edges.append(edge)
-                        break
-            case "airport_deck":
-                if airplane_id not in self.airport_queue:
-                    self.airport_queue.append(airplane_id)
-                print(f"Airport queue: {list(self.airport_queue)} index of {airplane_id}: {self.airport_queue.index(airplane_id)}")
-                if self.airport_queue.index(airplane_id) == 0:
-                    edges = self.model.graph.get_edges_by_type("apron_link")
-                    edges.extend(self.model.graph.get_edges_by_type("stand_link"))
-                    edges.extend(self.model.graph.get_edges_by_type("taxiway"))
-                    for edge in edges:
-                        if not self.request_edge(edge['from'], edge['to'], airplane_id):
-                            self.apron_queue.append(airplane_id)
-                            success = False
-                            return False, blocked_edges
-                        else:
-                            blocked_edges.append(edge)
-                    return success, blocked_edges
-                return False, blocked_edges
-                
-                
-            case _:
-                return False, blocked_edges
-
-
-        if not success:
-            self.release_edges(blocked_edges, airplane_id)
-            return False, blocked_edges
-        return success, blocked_edges
+        """
+        Rezerwacja sekcji lotniska. Zwraca (sukces, zarezerwowane krawędzie); przy
+        niepowodzeniu nic nie zostaje zarezerwowane (lista jest pusta).
+        "runway" i "airport_deck" - wszystkie krawędzie sekcji albo nic,
+        "taxiway_inbound"/"taxiway_outbound" - pierwsza dostępna krawędź wjazdu/zjazdu.
+        """
+        if section not in self.SECTION_EDGE_TYPES:
+            return False, []
+        if section == "airport_deck":
+            self.airport_queue.append(airplane_id)
+            if not self.airport_queue.is_head(airplane_id):
+                self._blocked_on(airplane_id, (self.DECK_HEAD,))
+                return False, []
+        edge_ids, records = self._section(section)
+        if section in ("taxiway_inbound", "taxiway_outbound"):
+            candidates = np.flatnonzero(self._grantable(edge_ids, airplane_id))
+            if len(candidates) == 0:
+                self._blocked_on(airplane_id, edge_ids.tolist())
+                return False, []
+            first = int(candidates[0])
+            self.request_edge_id(int(edge_ids[first]), airplane_id)
+            return True, [records[first]]
+        if not self.request_edges_atomic(edge_ids, airplane_id):
+            return False, []
+        return True, list(records)
 
     def release_edges(self, edges: List[Dict], airplane_id: int):
-        for edge in edges:
-            self.release_edge(edge['from'], edge['to'], airplane_id)
+        if edges:
+            graph = self.model.graph
+            self.release_edge_ids([graph.get_edge_id(edge['from'], edge['to']) for edge in edges], airplane_id)
         return True
-    
+
     def remove_airplane_from_airport_queue(self, airplane_id: int):
-        if airplane_id in self.airport_queue:
-            self.airport_queue.remove(airplane_id)
+        old_head = self.airport_queue.head()
+        if self.airport_queue.discard(airplane_id):
+            head = self.airport_queue.head()
+            if head != old_head and self.DECK_HEAD in self._segment_waiting:
+                self._holder_removed(self.DECK_HEAD, old_head)
+                if head is not None:
+                    self._holder_added(self.DECK_HEAD, head)
+            if head is not None and head in self._parked:
+                self._wake_segment(self.DECK_HEAD, only=head)
             return True
         return False
 
+    # ------------------------------------------------------------------
+    # Oczekiwanie na zwolnienie (zamiast ponawiania prośby co tick)
+    # ------------------------------------------------------------------
+    # Pseudo-segment: "samolot zostanie czołem kolejki do płyty"
+    DECK_HEAD = -1
+
+    def _blocked_on(self, airplane_id: int, segments):
+        """
+        Zapamiętuje segmenty, przez które prośba samolotu została odrzucona
+        (do następnej udanej prośby, park() albo usunięcia samolotu)
+        """
+        self._blockers.setdefault(airplane_id, set()).update(segments)
+
+    def _granted(self, airplane_id: int):
+        """
+        Udana prośba: zapomina odrzucenia, budzi samolot, jeśli spał (prosił za niego
+        kontroler pasa), i oddaje dalej miejsca, na które go obudzono
+        """
+        self._blockers.pop(airplane_id, None)
+        self.unpark(airplane_id)
+        self._pass_on(airplane_id)
+
+    def park(self, airplane_id: int, priority: int = 0) -> bool:
+        """
+        Usypia samolot po nieudanej prośbie: zapisuje go jako oczekującego na segmentach,
+        które go zablokowały. Zostanie obudzony, gdy któryś z nich zwolni miejsce
+        (release_edge/release_edges, wzrost pojemności) albo gdy zostanie czołem kolejki
+        do płyty. Zwraca False (i nie usypia), jeśli nie wiadomo, na co czekać.
+        """
+        segments = self._blockers.pop(airplane_id, None)
+        self._pass_on(airplane_id)
+        if not segments:
+            return False
+        self.unpark(airplane_id)
+        self._park_seq += 1
+        self._parked[airplane_id] = (priority, self._park_seq, tuple(segments))
+        for segment in segments:
+            self._edge_waiters.setdefault(segment, {})[airplane_id] = None
+            self._start_wait(airplane_id, segment, behind=False)
+        return True
+
+    def is_parked(self, airplane_id: int) -> bool:
+        return airplane_id in self._parked
+
+    def can_retry(self, airplane_id: int) -> bool:
+        """Czy któryś z segmentów, na które czeka uśpiony samolot, ma wolne miejsce"""
+        entry = self._parked.get(airplane_id)
+        return entry is not None and any(self._free_slots(segment) for segment in entry[2])
+
+    def add_unpark_listener(self, callback):
+        """Rejestruje callback(id samolotu) wywoływany, gdy samolot przestaje być uśpiony"""
+        self._unpark_listeners.append(callback)
+
+    def unpark(self, airplane_id: int):
+        entry = self._parked.pop(airplane_id, None)
+        if entry is None:
+            return
+        for callback in self._unpark_listeners:
+            callback(airplane_id)
+        for segment in entry[2]:
+            self._stop_wait(airplane_id, segment)
+            waiters = self._edge_waiters.get(segment)
+            if waiters is not None:
+                waiters.pop(airplane_id, None)
+                if not waiters:
+                    del self._edge_waiters[segment]
+
+    def remove_airplane(self, airplane_id: int):
+        """Zapomina oczekiwanie usuwanego samolotu: odrzucone prośby, uśpienie, graf oczekiwania"""
+        self._blockers.pop(airplane_id, None)
+        self.unpark(airplane_id)
+        self._pass_on(airplane_id)
+        for segment in list(self._wait_holders.get(airplane_id, ())):
+            self._stop_wait(airplane_id, segment)
+
+    def _free_slots(self, segment: int) -> int:
+        if segment == self.DECK_HEAD:
+            return 0
+        return max(0, int(self.edge_capacity[segment]) - int(self.edge_occupancy[segment]))
+
+    def _wake_segment(self, segment: int, only: Optional[int] = None, skip: Optional[int] = None):
+        """
+        Budzi tylu oczekujących na segmencie, ile jest na nim wolnych miejsc -
+        kolejno wg priorytetu, potem FIFO (only - tylko ten samolot, skip - z pominięciem tego)
+        """
+        waiters = self._edge_waiters.get(segment)
+        if not waiters:
+            return
+        if only is not None:
+            woken = [only] if only in waiters else []
+        else:
+            free = self._free_slots(segment)
+            if not free:
+                return
+            parked = self._parked
+            woken = heapq.nsmallest(free, (a for a in waiters if a != skip),
+                                    key=lambda a: (-parked[a][0], parked[a][1]))
+        for airplane_id in woken:
+            self.unpark(airplane_id)
+            self._woken_for.setdefault(airplane_id, set()).add(segment)
+            self.woken.append(airplane_id)
+            self.wakeups += 1
+
+    def _pass_on(self, airplane_id: int):
+        """
+        Obudzony samolot ponowił prośbę (albo zniknął): jeśli nie zajął miejsca,
+        na które go obudzono, dostaje je następny oczekujący
+        """
+        segments = self._woken_for.pop(airplane_id, None)
+        if not segments:
+            return
+        for segment in segments:
+            if segment != self.DECK_HEAD and segment in self._edge_waiters:
+                self._wake_segment(segment, skip=airplane_id)
+
+    # ------------------------------------------------------------------
+    # Graf oczekiwania i wykrywanie zakleszczeń
+    # ------------------------------------------------------------------
+    def add_deadlock_listener(self, callback):
+        """Rejestruje callback(cykl) wywoływany, gdy powstanie cykl oczekiwania"""
+        self._deadlock_listeners.append(callback)
+
+    def wait_behind(self, airplane_id: int, edge_id: int):
+        """Samolot stoi na krawędzi za samolotami, które wjechały na nią wcześniej"""
+        self._start_wait(airplane_id, edge_id, behind=True)
+
+    def is_waiting(self, airplane_id: int, segment: int) -> bool:
+        """Czy samolot jest zapisany jako oczekujący na segment (w grafie oczekiwania)"""
+        return segment in self._wait_holders.get(airplane_id, ())
+
+    def find_deadlock(self, airplane_id: int) -> Optional[List[int]]:
+        """Cykl oczekiwania, w którym jest samolot (lub None)"""
+        return self.wait_for.find_cycle(airplane_id)
+
+    def current_deadlocks(self) -> List[List[int]]:
+        """Wykryte cykle, które wciąż istnieją"""
+        return [cycle for cycle in self.deadlocks if self.wait_for.is_cycle(cycle)]
+
+    def _holders(self, segment: int, airplane_id: int, behind: bool) -> set:
+        if segment == self.DECK_HEAD:
+            head = self.airport_queue.head()
+            return {head} if head is not None and head != airplane_id else set()
+        occupants = self.get_edge_occupants(segment)
+        if behind:
+            if airplane_id not in occupants:
+                return set()
+            occupants = occupants[:occupants.index(airplane_id)]
+        return set(occupants) - {airplane_id}
+
+    def _start_wait(self, airplane_id: int, segment: int, behind: bool):
+        waits = self._wait_holders.setdefault(airplane_id, {})
+        if segment in waits:
+            return
+        holders = self._holders(segment, airplane_id, behind)
+        if behind and not holders:
+            return
+        waits[segment] = (behind, holders)
+        self._segment_waiting.setdefault(segment, set()).add(airplane_id)
+        for holder in holders:
+            self._add_wait_edge(airplane_id, holder)
+
+    def _stop_wait(self, airplane_id: int, segment: int):
+        waits = self._wait_holders.get(airplane_id)
+        entry = waits.pop(segment, None) if waits else None
+        if entry is None:
+            return
+        if not waits:
+            del self._wait_holders[airplane_id]
+        waiting = self._segment_waiting[segment]
+        waiting.discard(airplane_id)
+        if not waiting:
+            del self._segment_waiting[segment]
+        for holder in entry[1]:
+            self.wait_for.remove_wait(airplane_id, holder)
+
+    def _holder_added(self, segment: int, holder: int):
+        """Segment dostał nowego trzymającego - czekający na niego czekają też na niego"""
+        for waiter in list(self._segment_waiting.get(segment, ())):
+            if waiter == holder:
+                self._stop_wait(waiter, segment)
+                continue
+            behind, holders = self._wait_holders[waiter][segment]
+            # Kolejka na krawędzi rośnie od końca - nowy nie jest przed czekającym
+            if not behind and holder not in holders:
+                holders.add(holder)
+                self._add_wait_edge(waiter, holder)
+
+    def _holder_removed(self, segment: int, holder: int):
+        for waiter in list(self._segment_waiting.get(segment, ())):
+            if waiter == holder:
+                self._stop_wait(waiter, segment)
+                continue
+            behind, holders = self._wait_holders[waiter][segment]
+            if holder in holders:
+                holders.discard(holder)
+                self.wait_for.remove_wait(waiter, holder)
+                if behind and not holders:
+                    self._stop_wait(waiter, segment)
+
+    def _add_wait_edge(self, waiter: int, holder: int):
+        cycle = self.wait_for.add_wait(waiter, holder)
+        if cycle is not None:
+            self.deadlocks.append(cycle)
+            for callback in self._deadlock_listeners:
+                callback(cycle)
+
+    # ------------------------------------------------------------------
+    # Trasy czasowe (planer przestrzeń-czas)
+    # ------------------------------------------------------------------
+    def _edge_ticks(self) -> List[int]:
+        """Czas przejazdu każdej krawędzi w tickach (tablica przejazdów MovementController)"""
+        from src.agents.airplane import Airplane
+
+        table = Airplane.movement_controller.traversal_table(self.model.graph)
+        column = np.where(self.model.graph.edge_types == "runway",
+                          table.types["landing"], table.types["taxiing"])
+        return table.ticks[np.arange(len(column)), column].tolist()
+
+    @property
+    def planner(self):
+        """Planer przestrzeń-czas nad tablicą rezerwacji (przebudowywany po zmianie grafu)"""
+        from src.spacetime_planner import SpaceTimePlanner
+
+        if self._planner is None or self._planner.version != self.model.graph.version:
+            self._planner = SpaceTimePlanner(self.model.graph, self._edge_ticks(),
+                                             self.reservation_table, self._edge_capacity_by_id)
+        return self._planner
+
+    def plan_timed_route(self, airplane_id: int, start: int, goal: int,
+                         start_time: Optional[int] = None, book: bool = True):
+        """
+        Wyznacza trasę czasową start -> goal bez konfliktów z istniejącymi rezerwacjami.
+        Zwraca listę (węzeł, tick) lub None; przy book=True od razu rezerwuje jej segmenty.
+        """
+        if start_time is None:
+            start_time = self.model.step_count
+        route = self.planner.plan(start, goal, start_time, airplane_id)
+        if route is not None and book:
+            self.planner.book(route, airplane_id)
+        return route
+
+    def book_edge_slot(self, airplane_id: int, u: int, v: int, earliest: int, duration: int,
+                       priority: int = 1) -> Optional[int]:
+        """
+        Rezerwuje najwcześniejsze wolne okno przejazdu krawędzi (u,v) o długości duration,
+        zaczynające się nie wcześniej niż earliest. Zwraca tick początku lub None.
+        """
+        edge_id = self.model.graph.get_edge_id(u, v)
+        if edge_id is None:
+            return None
+        start = self.reservation_table.earliest_free(edge_id, earliest, duration,
+                                                     self._edge_capacity_by_id(edge_id), airplane_id)
+        self.reservation_table.add(SegmentReservation(edge_id, airplane_id, start, start + duration, priority))
+        return start
+
+    def cancel_timed_routes(self, airplane_id: int) -> int:
+        """Usuwa rezerwacje czasowe samolotu"""
+        return self.reservation_table.remove_airplane(airplane_id)
+
     # ------------------------------------------------------------------
     # Informacje
     # ------------------------------------------------------------------
+    def get_edge_occupants(self, edge_id: int) -> List[int]:
+        """ID samolotów na krawędzi w kolejności wjazdu"""
+        return self.edge_occupants[edge_id, :self.edge_occupancy[edge_id]].tolist()
+
     def get_edge_status(self, u: int, v: int) -> Dict[str, Optional[List[int]]]:
-        key = _edge_key(u, v)
-        occupants = self.edge_reservations.get(key, deque())
+        edge_id = self.model.graph.get_edge_id(u, v) if self.model else None
+        occupants = self.get_edge_occupants(edge_id) if edge_id is not None else []
         return {
             "occupied": len(occupants) > 0,
-            "airplanes": occupants.copy()
+            "airplanes": occupants
         }
 
     def get_node_status(self, node_id: int) -> Dict[str, Optional[int]]:
@@ -259,6 +926,6 @@ class SegmentManager:
             "airplane": owner
         }
 
-    def cleanup_old_reservations(self, _current_time: int):
-        """Zachowane dla kompatybilności – nic nie robi w uproszczonej wersji."""
-        pass
+    def cleanup_old_reservations(self, current_time: int):
+        """Usuwa z tablicy rezerwacji czasowych te, które już się zakończyły"""
+        self.reservation_table.expire(current_time)
@@ -0,0 +1,172 @@
+"""
+Planer tras w przestrzeni-czasie
+
+Szuka trasy po stanach (węzeł, tick) względem tablicy rezerwacji
+(ReservationTable), więc samolot dostaje w jednym zapytaniu trasę czasową
+wolną od konfliktów - łącznie z postojami w węzłach, jeśli trzeba kogoś
+przepuścić. Segmenty w tablicy rezerwacji: krawędź = id krawędzi grafu,
+węzeł = num_edges + indeks gęsty węzła.
+"""
+
+import heapq
+import math
+from itertools import count
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.routing import dijkstra_row
+from src.segment_manager import ReservationTable, SegmentReservation
+
+# Trasa czasowa: lista (węzeł, tick wejścia w stan); pierwszy element = start,
+# powtórzony węzeł oznacza postój
+TimedRoute = List[Tuple[int, int]]
+
+
+class SpaceTimePlanner:
+    """A* po stanach (węzeł, czas) z heurystyką = statyczny najkrótszy czas do celu"""
+
+    def __init__(self, graph, edge_ticks: Sequence[int], table: ReservationTable,
+                 capacity: Optional[Callable[[int], int]] = None, horizon: int = 500):
+        """
+        Args:
+            graph: AirportGraph
+            edge_ticks: czas przejazdu każdej krawędzi (id krawędzi -> liczba ticków >= 1)
+            table: tablica rezerwacji, względem której planujemy
+            capacity: pojemność krawędzi po id (domyślnie 1)
+            horizon: maksymalna liczba ticków od startu, jaką przeszukujemy
+        """
+        self.graph = graph
+        self.version = graph.version
+        self.edge_ticks: List[int] = [int(t) for t in edge_ticks]
+        self.table = table
+        self.capacity = capacity if capacity is not None else (lambda _edge_id: 1)
+        self.horizon = horizon
+        self._indptr: List[int] = graph.csr_indptr.tolist()
+        self._indices: List[int] = graph.csr_indices.tolist()
+        self._arc_edge: List[int] = graph.csr_edge.tolist()
+        # Graf odwrócony (łuki wchodzące, CSR po końcach łuków) - do heurystyki "do celu"
+        arc_src = np.repeat(np.arange(graph.num_nodes), np.diff(graph.csr_indptr))
+        order = np.argsort(graph.csr_indices, kind='stable')
+        self._rev_indptr: List[int] = np.concatenate(
+            ([0], np.cumsum(np.bincount(graph.csr_indices, minlength=graph.num_nodes)))).tolist()
+        self._rev_indices: List[int] = arc_src[order].tolist()
+        self._rev_arcs: List[int] = order.tolist()
+        enabled = graph.arc_enabled.tolist()
+        self._arc_ticks: List[float] = [float(self.edge_ticks[e]) if enabled[a] else math.inf
+                                        for a, e in enumerate(self._arc_edge)]
+        # Heurystyki: indeks celu -> najkrótszy czas z każdego węzła
+        self._time_to_goal: Dict[int, List[float]] = {}
+        # Liczba stanów rozwiniętych przez ostatnie zapytanie (do pomiarów)
+        self.last_expanded = 0
+
+    def update_edge(self, edge_id: int):
+        """Uwzględnia zamknięcie / zmianę kierunku / nowy czas przejazdu (edge_ticks) krawędzi bez przebudowy planera"""
+        reopened = False
+        for a in self.graph._edge_arcs[edge_id].tolist():
+            if a < 0:
+                continue
+            ticks = float(self.edge_ticks[edge_id]) if self.graph.arc_enabled[a] else math.inf
+            reopened |= ticks < self._arc_ticks[a]
+            self._arc_ticks[a] = ticks
+        # Heurystyka to czas do celu po łukach wchodzących: wyłączenie łuku tylko go
+        # wydłuża (stara wartość zostaje dolnym ograniczeniem), a każdy włączony łuk -
+        # także przy odwróceniu kierunku - może go skrócić, więc wtedy liczymy od nowa
+        if reopened:
+            self._time_to_goal.clear()
+
+    def node_segment(self, node_index: int) -> int:
+        return self.graph.num_edges + node_index
+
+    def _heuristic(self, goal: int) -> List[float]:
+        h = self._time_to_goal.get(goal)
+        if h is None:
+            n = self.graph.num_nodes
+            pred = np.full(n, -1, dtype=np.int32)
+            dist = np.full(n, np.inf)
+            # Dijkstra od celu po łukach wchodzących = najkrótszy czas do celu (także przy jednokierunkowych)
+            weights = [self._arc_ticks[a] for a in self._rev_arcs]
+            dijkstra_row(self._rev_indptr, self._rev_indices, weights, goal, pred, dist)
+            h = dist.tolist()
+            self._time_to_goal[goal] = h
+        return h
+
+    def plan(self, start: int, goal: int, start_time: int,
+             airplane_id: Optional[int] = None) -> Optional[TimedRoute]:
+        """Najwcześniej kończąca się trasa czasowa start -> goal lub None (brak w horyzoncie)"""
+        s = self.graph.node_index(start)
+        g = self.graph.node_index(goal)
+        self.last_expanded = 0
+        if s is None or g is None:
+            return None
+        h = self._heuristic(g)
+        if not np.isfinite(h[s]):
+            return None
+
+        table = self.table
+        num_edges = self.graph.num_edges
+        deadline = start_time + self.horizon
+        parent: Dict[Tuple[int, int], Optional[Tuple[int, int]]] = {(s, start_time): None}
+        closed = set()
+        c = count()
+        fringe = [(start_time + h[s], next(c), s, start_time)]
+        while fringe:
+            _, _, v, t = heapq.heappop(fringe)
+            if (v, t) in closed:
+                continue
+            closed.add((v, t))
+            self.last_expanded += 1
+            if v == g:
+                return self._reconstruct(parent, (v, t))
+            if t >= deadline:
+                continue
+
+            # Postój w węźle
+            state = (v, t + 1)
+            if state not in parent and table.is_free(num_edges + v, t + 1, t + 2, 1, airplane_id):
+                parent[state] = (v, t)
+                heapq.heappush(fringe, (t + 1 + h[v], next(c), v, t + 1))
+
+            # Przejazd krawędzią
+            for a in range(self._indptr[v], self._indptr[v + 1]):
+                if self._arc_ticks[a] == math.inf:
+                    continue
+                u = self._indices[a]
+                edge_id = self._arc_edge[a]
+                nt = t + self.edge_ticks[edge_id]
+                state = (u, nt)
+                if state in parent:
+                    continue
+                if not table.is_free(edge_id, t, nt, self.capacity(edge_id), airplane_id):
+                    continue
+                if not table.is_free(num_edges + u, nt, nt + 1, 1, airplane_id):
+                    continue
+                parent[state] = (v, t)
+                heapq.heappush(fringe, (nt + h[u], next(c), u, nt))
+        return None
+
+    def _reconstruct(self, parent, state) -> TimedRoute:
+        route = []
+        node_ids = self.graph.node_ids
+        while state is not None:
+            route.append((int(node_ids[state[0]]), state[1]))
+            state = parent[state]
+        route.reverse()
+        return route
+
+    def book(self, route: TimedRoute, airplane_id: int, priority: int = 1) -> List[SegmentReservation]:
+        """Rezerwuje w tablicy segmenty trasy czasowej (krawędzie i zajęte węzły)"""
+        reservations = []
+        for i, (node_id, t) in enumerate(route):
+            v = self.graph.node_index(node_id)
+            reservations.append(SegmentReservation(self.node_segment(v), airplane_id, t, t + 1,
+                                                   priority, "holding"))
+            if i + 1 < len(route):
+                next_node, next_t = route[i + 1]
+                if next_node != node_id:
+                    edge_id = self.graph.get_edge_id(node_id, next_node)
+                    reservations.append(SegmentReservation(edge_id, airplane_id, t, next_t,
+                                                           priority, "movement"))
+        for reservation in reservations:
+            self.table.add(reservation)
+        return reservations
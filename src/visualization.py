@@ -3,7 +3,6 @@ import matplotlib.animation as animation
 import numpy as np
 from matplotlib.patches import Rectangle, Circle
 import matplotlib.patches as mpatches
-import networkx as nx
 from matplotlib.image import imread
 import os
 
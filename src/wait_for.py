@@ -0,0 +1,88 @@
+"""
+Graf oczekiwania samolotów (wait-for) do wykrywania zakleszczeń
+
+Krawędź A -> B oznacza, że samolot A czeka na segment trzymany przez B.
+Graf jest aktualizowany przyrostowo; cykl sprawdzany jest tylko przy dodaniu
+nowej krawędzi (DFS od B szuka drogi do A), więc koszt zależy od fragmentu
+grafu osiągalnego z B, a nie od liczby wszystkich samolotów.
+"""
+
+from typing import Dict, List, Optional
+
+
+class WaitForGraph:
+    """Skierowany graf oczekiwania z krotnością krawędzi"""
+
+    def __init__(self):
+        # oczekujący -> {trzymający: liczba segmentów, przez które czeka}
+        self.succ: Dict[int, Dict[int, int]] = {}
+
+    def __len__(self) -> int:
+        """Liczba krawędzi oczekiwania"""
+        return sum(len(holders) for holders in self.succ.values())
+
+    def has_wait(self, waiter: int, holder: int) -> bool:
+        return holder in self.succ.get(waiter, ())
+
+    def waits_for(self, waiter: int) -> List[int]:
+        return list(self.succ.get(waiter, ()))
+
+    def add_wait(self, waiter: int, holder: int) -> Optional[List[int]]:
+        """
+        Dodaje krawędź waiter -> holder. Zwraca cykl [waiter, holder, ..., ] (zamykany
+        z powrotem do waiter), jeśli nowa krawędź go utworzyła, inaczej None.
+        """
+        holders = self.succ.setdefault(waiter, {})
+        count = holders.get(holder, 0)
+        holders[holder] = count + 1
+        if count:
+            return None
+        return self._path(holder, waiter)
+
+    def remove_wait(self, waiter: int, holder: int):
+        holders = self.succ.get(waiter)
+        if not holders or holder not in holders:
+            return
+        holders[holder] -= 1
+        if holders[holder] <= 0:
+            del holders[holder]
+            if not holders:
+                del self.succ[waiter]
+
+    def remove_airplane(self, airplane_id: int):
+        """Usuwa wszystkie krawędzie wychodzące z samolotu (przychodzące zostają u oczekujących)"""
+        self.succ.pop(airplane_id, None)
+
+    def _path(self, start: int, goal: int) -> Optional[List[int]]:
+        """Ścieżka start -> goal (DFS); przy sukcesie zwraca [goal, start, ..., ]"""
+        if start == goal:
+            return [goal]
+        parent = {start: None}
+        stack = [start]
+        while stack:
+            node = stack.pop()
+            for nxt in self.succ.get(node, ()):
+                if nxt in parent:
+                    continue
+                parent[nxt] = node
+                if nxt == goal:
+                    path = []
+                    node = parent[goal]
+                    while node is not None:
+                        path.append(node)
+                        node = parent[node]
+                    return [goal] + path[::-1]
+                stack.append(nxt)
+        return None
+
+    def find_cycle(self, airplane_id: int) -> Optional[List[int]]:
+        """Cykl oczekiwania przechodzący przez samolot (lub None)"""
+        for holder in self.succ.get(airplane_id, ()):
+            path = self._path(holder, airplane_id)
+            if path is not None:
+                return path
+        return None
+
+    def is_cycle(self, cycle: List[int]) -> bool:
+        """Czy wszystkie krawędzie cyklu nadal istnieją"""
+        return all(self.has_wait(a, b) for a, b in zip(cycle, cycle[1:] + cycle[:1]))
@@ -0,0 +1,77 @@
+import unittest
+from src.model import AirportModel
+
+
+def snapshot(model):
+    segment_manager = model.segment_manager
+    airplanes = sorted((a.unique_id, a.state, a.current_node, a.target_node, a.position.x, a.position.y,
+                        a.position.progress, a.is_moving, a.landing_time, a.stand_time, a.departure_time,
+                        tuple(a.path), tuple(segment_manager.held_edge_ids(a.unique_id)))
+                       for a in model.airplanes)
+    return (model.step_count, airplanes, model.runway_controller.is_busy,
+            model.runway_controller.get_runway_queue_info(), model.random.getstate())
+
+
+class TestEventEngine(unittest.TestCase):
+
+    def _pair(self, seed, **kwargs):
+        models = []
+        for engine in ("tick", "event"):
+            model = AirportModel(engine=engine, **kwargs)
+            model.random.seed(seed)
+            models.append(model)
+        return models
+
+    def test_same_trajectories_at_event_boundaries(self):
+        for seed, wind, rate in ((1, "07", 0.05), (2, "25", 0.2)):
+            tick, event = self._pair(seed, num_arriving_airplanes=4, arrival_rate=rate, wind_direction=wind)
+            for until in range(25, 301, 25):
+                tick.run_until(until)
+                event.run_until(until)
+                self.assertEqual(snapshot(tick), snapshot(event), (seed, wind, until))
+
+    def test_sparse_schedule_skips_quiet_ticks(self):
+        tick, event = self._pair(3, num_arriving_airplanes=1, arrival_rate=0.001)
+        tick.run_until(3000)
+        event.run_until(3000)
+        self.assertEqual(snapshot(tick), snapshot(event))
+        self.assertEqual(event.steps, 3000)
+        self.assertGreater(event.event_engine.ticks_skipped, 10 * event.event_engine.steps_run)
+
+    def test_event_keys_match_full_recompute(self):
+        _, model = self._pair(2, num_arriving_airplanes=5, arrival_rate=0.3, wind_direction="25")
+        engine = model.event_engine
+        for until in range(20, 401, 20):
+            model.run_until(until)
+            engine.schedule()
+            now = model.step_count
+            for source in [model.runway_controller] + model.airplanes:
+                tick = source.next_activity(now)
+                self.assertEqual(None if source not in engine.events else -engine.events.priority(source), tick)
+            self.assertLessEqual(len(engine.events), len(model.airplanes) + 1)
+
+    def test_dormant_airplanes_are_not_rekeyed(self):
+        _, model = self._pair(2, num_arriving_airplanes=6, arrival_rate=0.0)
+        model.run_until(3)
+        model.event_engine.schedule()
+        calls = {}
+        for airplane in model.airplanes:
+            original = airplane.next_activity
+
+            def counted(now, original=original, airplane=airplane):
+                calls[airplane.unique_id] = calls.get(airplane.unique_id, 0) + 1
+                return original(now)
+            airplane.next_activity = counted
+        model.event_engine.schedule()
+        queued = [a for a in model.airplanes if a.state == "waiting_landing" and a.is_in_queue]
+        self.assertTrue(queued)
+        for airplane in queued:
+            self.assertNotIn(airplane.unique_id, calls)
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            AirportModel(num_arriving_airplanes=0, engine="continuous")
+
+
+if __name__ == '__main__':
+    unittest.main()
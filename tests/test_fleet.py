@@ -0,0 +1,81 @@
+import unittest
+import numpy as np
+from src.model import AirportModel
+from src.agents.airplane import Airplane
+from src.fleet import NO_NODE, STATE_CODES, FleetStore
+
+
+class TestFleetStore(unittest.TestCase):
+
+    def test_rows_are_reused_after_release(self):
+        fleet = FleetStore(capacity=2)
+        rows = [fleet.allocate() for _ in range(5)]
+        self.assertEqual(rows, [0, 1, 2, 3, 4])
+        self.assertGreaterEqual(fleet.capacity, 5)
+        fleet.x[3] = 7.5
+        fleet.release(3)
+        self.assertEqual(len(fleet), 4)
+        self.assertEqual(fleet.allocate(), 3)
+        self.assertEqual(fleet.x[3], 0.0)
+
+    def test_airplane_attributes_live_in_arrays(self):
+        model = AirportModel(num_arriving_airplanes=2, arrival_rate=0.0)
+        airplane = model.airplanes[1]
+        fleet = model.fleet
+        self.assertIsNone(airplane.current_node)
+        self.assertEqual(fleet.current_node[airplane._row], NO_NODE)
+        airplane.current_node = 13
+        airplane.state = "at_stand"
+        airplane.position.x, airplane.position.y = 4.0, 5.0
+        self.assertEqual(fleet.current_node[airplane._row], 13)
+        self.assertEqual(fleet.state[airplane._row], STATE_CODES["at_stand"])
+        self.assertEqual((fleet.x[airplane._row], fleet.y[airplane._row]), (4.0, 5.0))
+        self.assertEqual(fleet.state_counts(), {"waiting_landing": 1, "at_stand": 1})
+        self.assertIs(airplane.movement_controller, Airplane.movement_controller)
+
+
+class TestMovementKernel(unittest.TestCase):
+
+    def setUp(self):
+        self.model = AirportModel(num_arriving_airplanes=0, arrival_rate=0.0)
+        self.graph = self.model.graph
+        self.controller = Airplane.movement_controller
+
+    def _moving_fleet(self, count, seed=0):
+        rng = np.random.default_rng(seed)
+        fleet = FleetStore()
+        node_ids = self.graph.node_ids
+        for _ in range(count):
+            row = fleet.allocate()
+            fleet.is_moving[row] = True
+            fleet.pos_current_node[row], fleet.pos_target_node[row] = rng.choice(node_ids, 2)
+            fleet.movement_start[row] = rng.integers(0, 10)
+            fleet.movement_duration[row] = rng.integers(1, 8)
+            if rng.random() < 0.3:
+                fleet.hold_limit[row] = rng.choice([0.0, 0.62, 0.81])
+        return fleet
+
+    def test_vectorized_step_matches_loop(self):
+        vector, loop = self._moving_fleet(200), self._moving_fleet(200)
+        rows = vector.moving_rows()
+        arrived = self.controller.advance(vector, rows, self.graph, now=8)
+        expected = self.controller._advance_rows(loop, rows, self.graph, now=8)
+        np.testing.assert_array_equal(arrived, expected)
+        for name in ('x', 'y', 'progress'):
+            np.testing.assert_array_equal(getattr(vector, name), getattr(loop, name))
+
+    def test_model_phase_finishes_only_arrived_airplanes(self):
+        model = AirportModel(num_arriving_airplanes=2, arrival_rate=0.0)
+        first, second = model.airplanes
+        for airplane, duration in ((first, 1), (second, 5)):
+            airplane.state, airplane.current_node = "taxiing_to_stand", 13
+            airplane._start_movement_to_node(38)
+            airplane.movement_duration = duration
+        model.step_count += 1
+        model.advance_movement()
+        self.assertEqual((first.is_moving, first.current_node), (False, 38))
+        self.assertTrue(second.is_moving)
+        self.assertAlmostEqual(second.position.progress, 0.2)
+
+if __name__ == '__main__':
+    unittest.main()
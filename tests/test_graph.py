@@ -0,0 +1,207 @@
+import os
+import shutil
+import tempfile
+import unittest
+import networkx as nx
+from src.graph import AirportGraph
+from src import graph_cache
+from src.routing import RouteTable
+
+
+class TestAirportGraph(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = AirportGraph("nodes.csv", "edges.csv")
+
+    def test_route_table_matches_dijkstra_lengths(self):
+        for start in self.graph.get_all_nodes():
+            for end in self.graph.get_all_nodes():
+                path = self.graph.find_shortest_path(start, end)
+                expected = nx.shortest_path_length(self.graph.digraph, start, end, weight="length")
+                self.assertAlmostEqual(nx.path_weight(self.graph.digraph, path, "length"), expected)
+                self.assertEqual(path[0], start)
+                self.assertEqual(path[-1], end)
+
+    def test_route_table_paths_match_networkx(self):
+        # Przy remisach długości ta sama ścieżka co nx.shortest_path (Dijkstra dwukierunkowa)
+        for strategy in ("table", "dijkstra"):
+            graph = AirportGraph("nodes.csv", "edges.csv")
+            graph.route_strategy = strategy
+            for start in graph.get_all_nodes():
+                for end in graph.get_all_nodes():
+                    self.assertEqual(graph.find_shortest_path(start, end),
+                                     nx.shortest_path(self.graph.digraph, start, end, weight="length"),
+                                     (strategy, start, end))
+        self.assertEqual(self.graph.find_shortest_path(1, 7), [1, 8, 7])
+
+    def test_unreachable_pair_is_cached(self):
+        self.assertEqual(self.graph.find_shortest_path(1, 999), [])
+        self.assertIn((1, 999), self.graph.routes.unreachable)
+
+    def test_route_table_rebuilt_after_invalidation(self):
+        routes = self.graph.routes
+        self.graph.invalidate_routes()
+        self.assertIsNot(self.graph.routes, routes)
+
+    def test_returned_path_is_a_copy(self):
+        path = self.graph.find_shortest_path(1, 13)
+        path.pop(0)
+        self.assertEqual(self.graph.find_shortest_path(1, 13)[0], 1)
+
+    def test_astar_strategy_finds_shortest_paths(self):
+        for strategy in ("astar", "dijkstra"):
+            self.graph.route_strategy = strategy
+            routes = RouteTable(self.graph.get_all_nodes(), self.graph.csr_indptr, self.graph.csr_indices,
+                                self.graph.edge_length[self.graph.csr_edge], precompute=False,
+                                strategy=strategy, coords=(self.graph.node_x, self.graph.node_y),
+                                scale=self.graph.routes.scale)
+            for start in self.graph.get_all_nodes():
+                for end in self.graph.get_all_nodes():
+                    path = routes.path(start, end)
+                    self.assertAlmostEqual(nx.path_weight(self.graph.digraph, path, "length"),
+                                           self.graph.routes.distance(start, end))
+            self.assertEqual(len(routes.rows), 0)
+        self.assertGreater(self.graph.routes.scale, 0.0)
+        with self.assertRaises(ValueError):
+            self.graph.route_strategy = "bfs"
+
+    def test_k_shortest_paths_match_networkx(self):
+        import itertools
+        for start, end in [(13, 9), (1, 14), (9, 36)]:
+            paths = self.graph.find_k_shortest_paths(start, end, 5)
+            expected = itertools.islice(nx.shortest_simple_paths(self.graph.digraph, start, end, weight="length"), 5)
+            self.assertEqual([round(nx.path_weight(self.graph.digraph, p, "length"), 6) for p in paths],
+                             [round(nx.path_weight(self.graph.digraph, p, "length"), 6) for p in expected])
+            for path in paths:
+                self.assertEqual(len(path), len(set(path)))
+        # Mniejsze k obsługiwane z pamięci, bez ponownego liczenia
+        cached, _ = self.graph.routes.k_paths[(13, 9)]
+        self.assertEqual(self.graph.find_k_shortest_paths(13, 9, 2), cached[:2])
+        self.assertEqual(self.graph.find_k_shortest_paths(1, 999, 3), [])
+
+    def test_find_all_paths_respects_hop_limit(self):
+        for path in self.graph.find_all_paths(13, 9, max_length=5, k=3):
+            self.assertLessEqual(len(path) - 1, 5)
+
+    def test_find_all_paths_hop_limit_inside_enumeration(self):
+        # Bezpośrednia krawędź 1-2 jest dłuższa niż każdy z 6 objazdów przez dwie krawędzie
+        tmp = tempfile.mkdtemp()
+        try:
+            nodes, edges = os.path.join(tmp, "nodes.csv"), os.path.join(tmp, "edges.csv")
+            with open(nodes, "w") as f:
+                f.write("id,type,name,x,y,notes\n")
+                f.writelines(f"{i},taxiway,N{i},{i},0,\n" for i in range(1, 9))
+            with open(edges, "w") as f:
+                f.write("from,to,type,length,bidirectional,desc\n1,2,taxiway,100.0,True,taxiway\n")
+                f.writelines(f"1,{i},taxiway,1.0,True,taxiway\n{i},2,taxiway,1.0,True,taxiway\n"
+                             for i in range(3, 9))
+            graph = AirportGraph(nodes, edges, use_cache=False)
+            self.assertEqual(graph.find_all_paths(1, 2, max_length=1, k=1), [[1, 2]])
+            self.assertEqual(len(graph.find_all_paths(1, 2, max_length=2, k=7)), 7)
+            self.assertEqual(graph.find_all_paths(1, 2, max_length=2, k=7)[-1], [1, 2])
+        finally:
+            shutil.rmtree(tmp)
+
+    def test_closed_edge_updates_routes_incrementally(self):
+        routes = self.graph.routes
+        path = self.graph.find_shortest_path(13, 9)
+        u, v = path[1], path[2]
+        self.graph.close_edge(u, v)
+        self.assertIs(self.graph.routes, routes)
+        detour = self.graph.find_shortest_path(13, 9)
+        self.assertNotIn((u, v), list(zip(detour, detour[1:])))
+        self.assertFalse(self.graph.digraph.has_edge(u, v))
+        self.assertTrue(self.graph.graph.edges[u, v]['closed'])
+        self.graph.open_edge(u, v)
+        self.assertEqual(self.graph.find_shortest_path(13, 9), path)
+
+    def test_one_way_edge(self):
+        self.graph.set_one_way(13, 38, 'AB')
+        self.assertTrue(self.graph.can_traverse(13, 38))
+        self.assertFalse(self.graph.can_traverse(38, 13))
+        self.assertTrue(self.graph.digraph.has_edge(13, 38))
+        self.assertFalse(self.graph.digraph.has_edge(38, 13))
+        path = self.graph.find_shortest_path(38, 13)
+        self.assertNotIn((38, 13), list(zip(path, path[1:])))
+        self.assertTrue(self.graph.graph.edges[13, 38]['one_way'])
+        self.graph.set_bidirectional(13, 38)
+        self.assertEqual(self.graph.find_shortest_path(38, 13), [38, 13])
+
+    def test_edge_attribute_mutators(self):
+        changes = []
+        self.graph.add_listener(lambda edge_id, change: changes.append(change))
+        self.graph.set_edge_capacity(13, 38, capacity=3)
+        self.graph.set_edge_speed_limits(13, 38, straight_kts=20, turn_kts=10)
+        self.graph.add_conflict_point(1, description="Crossing", edges=[(13, 38)], nodes=[9])
+        attrs = self.graph.graph.edges[13, 38]
+        self.assertEqual(attrs['capacity'], 3)
+        self.assertEqual(attrs['speed_limit_turn_kts'], 10)
+        self.assertEqual(self.graph.get_conflict_points(38, 13), [1])
+        self.assertEqual(changes, ['capacity', 'speed', 'conflict'])
+        with self.assertRaises(ValueError):
+            self.graph.set_edge_capacity(1, 999, capacity=2)
+
+    def test_typed_edge_index(self):
+        runway = self.graph.get_edges_by_type("runway")
+        self.assertIsInstance(runway, tuple)
+        self.assertEqual(len(runway), 3)
+        self.assertIs(runway, self.graph.get_edges_by_type("runway"))
+        self.assertEqual(self.graph.get_edge_count_by_type()["stand_link"], 16)
+        ids = self.graph.get_edge_ids_by_type("runway")
+        self.assertFalse(ids.flags.writeable)
+        self.assertEqual([self.graph.edge_record(i) for i in ids], list(runway))
+        self.assertEqual(self.graph.get_edges_by_type("unknown"), ())
+
+    def test_typed_node_index(self):
+        self.assertEqual(self.graph.get_runway_nodes(), (1, 2))
+        self.assertEqual(len(self.graph.get_stand_nodes()), 16)
+
+    def test_networkx_views_are_lazy(self):
+        graph = AirportGraph("nodes.csv", "edges.csv")
+        graph.find_shortest_path(1, 13)
+        graph.get_edge_type(8, 10)
+        self.assertIsNone(graph._graph)
+        self.assertIsNone(graph._digraph)
+        self.assertEqual(graph.graph.number_of_edges(), graph.num_edges)
+        self.assertEqual(graph.digraph.number_of_edges(), 2 * graph.num_edges)
+
+    def test_csr_adjacency_matches_neighbors(self):
+        for node_id in self.graph.get_all_nodes():
+            self.assertEqual(self.graph.get_neighbors(node_id), list(self.graph.graph.neighbors(node_id)))
+
+
+class TestCompiledGraphCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.mkdtemp()
+        self.nodes = os.path.join(self.tmp, "nodes.csv")
+        self.edges = os.path.join(self.tmp, "edges.csv")
+        shutil.copy("nodes.csv", self.nodes)
+        shutil.copy("edges.csv", self.edges)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp)
+
+    def test_compiled_graph_matches_csv_graph(self):
+        path = graph_cache.compile_graph(self.nodes, self.edges)
+        self.assertTrue(os.path.exists(path))
+        from_csv = AirportGraph(self.nodes, self.edges, use_cache=False)
+        compiled = AirportGraph(self.nodes, self.edges)
+        self.assertEqual(len(compiled.routes.rows), compiled.num_nodes)
+        self.assertEqual(compiled.get_edge_count_by_type(), from_csv.get_edge_count_by_type())
+        self.assertEqual(compiled.get_stand_nodes(), from_csv.get_stand_nodes())
+        for start in from_csv.get_all_nodes():
+            for end in from_csv.get_all_nodes():
+                self.assertEqual(compiled.find_shortest_path(start, end), from_csv.find_shortest_path(start, end))
+
+    def test_stale_cache_is_ignored(self):
+        old_path = graph_cache.compile_graph(self.nodes, self.edges)
+        with open(self.edges, "a") as f:
+            f.write("\n8,9,taxiway,10.0,True,Taxiway X\n")
+        self.assertNotEqual(graph_cache.cache_path(self.nodes, self.edges), old_path)
+        graph = AirportGraph(self.nodes, self.edges)
+        self.assertTrue(graph.is_connected(8, 9))
+
+
+if __name__ == '__main__':
+    unittest.main()
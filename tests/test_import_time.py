@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Budżet zimnego startu (import src.model) w sekundach - można nadpisać zmienną środowiskową
+IMPORT_BUDGET_S = float(os.environ.get("AIRPORT_IMPORT_BUDGET_S", "3.0"))
+
+
+def _run(code: str) -> str:
+    """Uruchamia kod w świeżym interpreterze i zwraca ostatnią linię wyjścia"""
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1]
+
+
+class TestColdStart(unittest.TestCase):
+
+    def test_model_import_within_budget(self):
+        code = ("import time; t = time.perf_counter(); import src.model; "
+                "print(time.perf_counter() - t)")
+        best = min(float(_run(code)) for _ in range(3))
+        self.assertLess(best, IMPORT_BUDGET_S)
+
+    def test_graph_import_skips_pandas_and_networkx(self):
+        code = ("import sys; import src.graph; "
+                "print(sorted(m for m in ('pandas', 'networkx', 'matplotlib') if m in sys.modules))")
+        self.assertEqual(_run(code), "[]")
+
+    def test_headless_run_does_not_load_matplotlib(self):
+        code = ("import sys; import run_simulation; run_simulation.run_headless(5); "
+                "print('matplotlib' in sys.modules, 'src.visualization' in sys.modules)")
+        self.assertEqual(_run(code), "False False")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,30 @@
+import tempfile
+import unittest
+from src.graph import AirportGraph
+from src.layout_generator import generate_layout, write_layout
+
+
+class TestLayoutGenerator(unittest.TestCase):
+
+    def test_generated_layout_loads_with_expected_types(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            nodes_file, edges_file = write_layout(tmp, runways=3, parallel_taxiways=2, stands=300, seed=1)
+            graph = AirportGraph(nodes_file, edges_file, use_cache=False)
+        self.assertEqual(len(graph.get_stand_nodes()), 300)
+        self.assertEqual(len(graph.get_runway_nodes()), 6)
+        self.assertEqual(graph.get_node_by_id(1)['type'], 'runway_thr')
+        self.assertEqual(graph.get_node_by_id(2)['type'], 'runway_thr')
+        counts = graph.get_edge_count_by_type()
+        for edge_type in ('runway', 'runway_entry', 'runway_exit', 'taxiway', 'apron_link', 'stand_link'):
+            self.assertGreater(counts.get(edge_type, 0), 0)
+        # Każde stanowisko osiągalne z obu progów pierwszego pasa
+        for stand in graph.get_stand_nodes()[::37]:
+            self.assertTrue(graph.find_shortest_path(1, stand))
+            self.assertTrue(graph.find_shortest_path(stand, 2))
+
+    def test_generation_is_deterministic(self):
+        self.assertEqual(generate_layout(stands=100, seed=3), generate_layout(stands=100, seed=3))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from src.graph import AirportGraph
+from src.movement_controller import MovementController
+
+
+class TestTraversalTable(unittest.TestCase):
+
+    def setUp(self):
+        self.graph = AirportGraph("nodes.csv", "edges.csv")
+        self.controller = MovementController()
+        # 7 -> 9 (taxiway, długość 18): z 5 -> 7 na prostej, z 8 -> 7 po zakręcie o 90°
+        self.edge = self.graph.get_edge_id(7, 9)
+        self.straight_in = self.graph.get_edge_id(5, 7)
+        self.turn_in = self.graph.get_edge_id(8, 7)
+
+    def test_table_matches_movement_time(self):
+        table = self.controller.traversal_table(self.graph)
+        for edge_id in range(self.graph.num_edges):
+            record = self.graph.edge_record(edge_id)
+            distance = self.controller.calculate_distance(self.graph.get_node_position(record['from']),
+                                                          self.graph.get_node_position(record['to']))
+            for movement_type, column in table.types.items():
+                self.assertEqual(table.ticks[edge_id, column],
+                                 self.controller.calculate_movement_time(distance, movement_type))
+        self.assertEqual(table.turns, {})
+
+    def test_turn_limit_applies_after_sharp_turn_only(self):
+        ticks = self.controller.movement_ticks
+        self.assertEqual(ticks(self.graph, self.edge, "taxiing", self.turn_in), 36)
+        # 5 kt = 1/4 prędkości kołowania (20 kt)
+        self.graph.set_edge_speed_limits(7, 9, turn_kts=5)
+        self.assertEqual(ticks(self.graph, self.edge, "taxiing", self.turn_in), 144)
+        self.assertEqual(ticks(self.graph, self.edge, "taxiing", self.straight_in), 36)
+        self.assertEqual(ticks(self.graph, self.edge, "taxiing"), 36)
+        self.graph.set_edge_speed_limits(7, 9, straight_kts=10, turn_kts=5)
+        self.assertEqual(ticks(self.graph, self.edge, "taxiing", self.straight_in), 72)
+        self.assertEqual(ticks(self.graph, self.edge, "landing"), 72)
+
+    def test_one_listener_per_graph(self):
+        self.controller.traversal_table(self.graph)
+        listeners = len(self.graph._listeners)
+        for kts in range(5, 10):
+            self.graph.set_edge_speed_limits(7, 9, turn_kts=kts)
+            self.controller.traversal_table(self.graph)
+        self.assertEqual(len(self.graph._listeners), listeners)
+
+
+if __name__ == '__main__':
+    unittest.main()
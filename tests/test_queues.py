@@ -0,0 +1,56 @@
+import unittest
+from src.queues import IndexedPriorityQueue, OrderedQueue
+
+
+class TestOrderedQueue(unittest.TestCase):
+
+    def test_fifo_without_duplicates(self):
+        queue = OrderedQueue([5, 3, 9])
+        self.assertFalse(queue.append(3))
+        self.assertEqual(list(queue), [5, 3, 9])
+        self.assertEqual(queue.index(9), 2)
+        self.assertTrue(queue.is_head(5))
+        self.assertEqual(queue.popleft(), 5)
+        self.assertEqual(queue.head(), 3)
+
+    def test_remove_from_middle_and_reappend(self):
+        queue = OrderedQueue(range(100))
+        for item in range(0, 100, 2):
+            queue.remove(item)
+        self.assertEqual(queue.index(51), 25)
+        queue.append(0)
+        self.assertEqual(queue.index(0), 50)
+        self.assertEqual(list(queue)[-2:], [99, 0])
+        with self.assertRaises(ValueError):
+            queue.remove(2)
+        self.assertFalse(queue.discard(2))
+
+
+
+class TestIndexedPriorityQueue(unittest.TestCase):
+
+    def test_priority_then_fifo(self):
+        queue = IndexedPriorityQueue()
+        for item, priority in (("a", 1), ("b", 1), ("c", 2), ("d", 1)):
+            self.assertTrue(queue.push(item, priority))
+        self.assertFalse(queue.push("a", 5))
+        self.assertEqual(list(queue), ["c", "a", "b", "d"])
+        self.assertEqual(queue.smallest(2), ["c", "a"])
+        self.assertEqual(queue.pop(), "c")
+
+    def test_update_and_remove_keep_heap_order(self):
+        queue = IndexedPriorityQueue()
+        for item in range(50):
+            queue.push(item, 0)
+        snapshot = queue.snapshot()
+        self.assertIs(queue.snapshot(), snapshot)
+        queue.update(40, 3)
+        queue.remove(0)
+        self.assertEqual(queue.priority(40), 3)
+        self.assertEqual(queue.smallest(3), [40, 1, 2])
+        self.assertEqual([queue.pop() for _ in range(len(queue))], [40] + [i for i in range(1, 50) if i != 40])
+        with self.assertRaises(ValueError):
+            queue.remove(0)
+
+if __name__ == '__main__':
+    unittest.main()
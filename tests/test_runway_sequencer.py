@@ -0,0 +1,40 @@
+import unittest
+from types import SimpleNamespace
+from src.runway_sequencer import RunwaySequencer
+
+
+class TestRunwaySequencer(unittest.TestCase):
+
+    def setUp(self):
+        # T/T 2 ticki, pozostałe pary 3
+        self.sequencer = RunwaySequencer(((2, 3), (3, 3)), window=8, max_shift=2)
+
+    def test_groups_takeoffs_within_shift_limit(self):
+        # T L T: starty razem oszczędzają jeden tick
+        self.assertEqual(self.sequencer.order("TLT"), (0, 2, 1))
+        # T T L L L byłoby najkrótsze, ale drugi start przesunąłby się o 3 miejsca
+        self.assertEqual(self.sequencer.order("TLLLT"), (1, 0, 4, 2, 3))
+
+    def test_ties_keep_fifo_order(self):
+        self.assertEqual(self.sequencer.order("LTLL"), (0, 1, 2, 3))
+
+    def test_ready_times_decide_first_operation(self):
+        self.assertEqual(self.sequencer.order("LT", ready=(0, 5))[0], 1)
+
+    def test_deferral_budget_prevents_starvation(self):
+        queue = [SimpleNamespace(unique_id=i, airplane_type=t)
+                 for i, t in enumerate(["arrival", "departure", "departure"])]
+        # Starty przeskakują lądowanie, dopóki ma ono budżet przesunięć
+        served = []
+        while queue:
+            index = self.sequencer.choose(queue, ready=(0, 0))
+            self.sequencer.served(queue, index)
+            served.append(queue.pop(index).unique_id)
+            queue.append(SimpleNamespace(unique_id=len(served) + 10, airplane_type="departure"))
+            if 0 in served:
+                break
+        self.assertLessEqual(served.index(0), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+import unittest
+from src.model import AirportModel
+
+
+def snapshot(model):
+    segment_manager = model.segment_manager
+    return sorted((a.unique_id, a.state, a.current_node, a.position.x, a.position.y, a.position.progress,
+                   a.landing_time, a.stand_time, a.departure_time, tuple(a.path),
+                   tuple(segment_manager.held_edge_ids(a.unique_id)), segment_manager.is_parked(a.unique_id))
+                  for a in model.airplanes)
+
+
+class TestActiveSetScheduler(unittest.TestCase):
+
+    def test_same_result_as_stepping_every_airplane(self):
+        for seed, rate in ((1, 0.05), (4, 0.3)):
+            everyone = AirportModel(num_arriving_airplanes=6, arrival_rate=rate)
+            active = AirportModel(num_arriving_airplanes=6, arrival_rate=rate)
+            everyone.random.seed(seed)
+            active.random.seed(seed)
+            for _ in range(250):
+                # Obudzeni przed tickiem wykonują krok jak w pętli po wszystkich samolotach
+                for airplane in everyone.airplanes:
+                    everyone.scheduler.wake(airplane)
+                everyone.step()
+                active.step()
+                self.assertEqual(snapshot(everyone), snapshot(active), (seed, active.step_count))
+
+    def test_dormant_airplanes_are_not_stepped(self):
+        model = AirportModel(num_arriving_airplanes=6, arrival_rate=0.0)
+        model.random.seed(2)
+        calls = {}
+        for airplane in model.airplanes:
+            original = airplane.step
+
+            def counted(original=original, airplane=airplane):
+                calls[airplane.unique_id] = calls.get(airplane.unique_id, 0) + 1
+                original()
+            airplane.step = counted
+        model.run_until(3)
+        queued = [a for a in model.airplanes if a.state == "waiting_landing" and a.is_in_queue]
+        self.assertTrue(queued)
+        for airplane in queued:
+            self.assertTrue(model.scheduler.is_dormant(airplane))
+            # Dołączył do kolejki w pierwszym ticku, potem śpi
+            self.assertEqual(calls[airplane.unique_id], 1)
+
+    def test_stand_time_counts_while_dormant(self):
+        model = AirportModel(num_arriving_airplanes=1, arrival_rate=0.0)
+        model.random.seed(3)
+        airplane = model.airplanes[0]
+        while airplane.state != "at_stand":
+            model.step()
+        start = airplane.stand_time
+        model.step()
+        self.assertTrue(model.scheduler.is_dormant(airplane))
+        model.step()
+        self.assertEqual(airplane.stand_time, start + 2)
+        while airplane.state == "at_stand":
+            model.step()
+        self.assertEqual(airplane.stand_time, airplane.max_stand_time)
+
+    def test_departed_airplane_leaves_mesa_registry(self):
+        model = AirportModel(num_arriving_airplanes=1, arrival_rate=0.0)
+        model.random.seed(3)
+        airplane = model.airplanes[0]
+        self.assertIn(airplane, model.agents)
+        while model.airplanes and model.step_count < 500:
+            model.step()
+        self.assertEqual(model.airplanes, [])
+        self.assertNotIn(airplane, model.agents)
+        self.assertNotIn(airplane, model.scheduler)
+        self.assertEqual(len(model.fleet), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
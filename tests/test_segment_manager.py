@@ -0,0 +1,368 @@
+import unittest
+from src.model import AirportModel
+from src.model import DEFAULTS
+from src.segment_manager import AtcController, ReservationTable, SegmentReservation
+
+
+class TestEdgeReservations(unittest.TestCase):
+
+    def setUp(self):
+        self.model = AirportModel(num_arriving_airplanes=0, arrival_rate=0.0)
+        self.manager = self.model.segment_manager
+
+    def test_capacity_and_fifo_order(self):
+        self.assertEqual(self.manager._edge_capacity(13, 38), 1)
+        self.assertEqual(self.manager._edge_capacity(5, 1), 5)
+        for airplane_id in (10, 11, 12):
+            self.assertTrue(self.manager.request_edge(1, 5, airplane_id))
+        self.assertTrue(self.manager.request_edge(5, 1, 11))  # ponowna prośba tego samego samolotu
+        self.manager.release_edge(5, 1, 10)
+        self.assertEqual(self.manager.get_edge_status(1, 5)["airplanes"], [11, 12])
+        self.assertTrue(self.manager.request_edge(13, 38, 10))
+        self.assertFalse(self.manager.request_edge(38, 13, 11))
+
+    def test_held_index_and_release_all(self):
+        ids = self.model.graph.get_edge_ids_by_type("runway").tolist()
+        self.assertTrue(self.manager.request_edges_atomic(ids, 7))
+        self.assertTrue(self.manager.request_edge(13, 38, 7))
+        self.assertTrue(self.manager.holds(7, 38, 13))
+        self.assertEqual(self.manager.held_count(7), len(ids) + 1)
+        self.assertEqual(self.manager.release_all(7, keep=(ids[0],)), len(ids))
+        self.assertEqual(self.manager.held_edge_ids(7), [ids[0]])
+        self.assertEqual(self.manager.release_all(7), 1)
+        self.assertFalse(self.manager.holds(7, 38, 13))
+        self.assertEqual(int(self.manager.edge_occupancy.sum()), 0)
+
+    def test_capacity_follows_graph_changes(self):
+        self.model.graph.set_edge_capacity(13, 38, capacity=8)
+        self.assertEqual(self.manager._edge_capacity(13, 38), 8)
+        for airplane_id in range(8):
+            self.assertTrue(self.manager.request_edge(13, 38, airplane_id))
+        self.assertFalse(self.manager.request_edge(13, 38, 99))
+
+
+class TestSectionReservations(unittest.TestCase):
+
+    def setUp(self):
+        self.model = AirportModel(num_arriving_airplanes=0, arrival_rate=0.0)
+        self.manager = self.model.segment_manager
+
+    def test_runway_section_is_all_or_nothing(self):
+        self.assertTrue(self.manager.request_edge(8, 10, 50))
+        before = self.manager.edge_occupancy.copy()
+        granted, edges = self.manager.request_airport_section("runway", 51)
+        self.assertFalse(granted)
+        self.assertEqual(edges, [])
+        self.assertTrue((self.manager.edge_occupancy == before).all())
+        self.manager.release_edge(8, 10, 50)
+        granted, edges = self.manager.request_airport_section("runway", 51)
+        self.assertTrue(granted)
+        self.assertEqual(len(edges), self.model.graph.get_edge_count_by_type()["runway"])
+
+    def test_deck_failure_reserves_nothing(self):
+        self.assertTrue(self.manager.request_edge(38, 13, 50))
+        granted, edges = self.manager.request_airport_section("airport_deck", 51)
+        self.assertEqual((granted, edges), (False, []))
+        self.assertEqual(int(self.manager.edge_occupancy.sum()), 1)
+        self.manager.release_edge(38, 13, 50)
+        granted, edges = self.manager.request_airport_section("airport_deck", 51)
+        self.assertTrue(granted)
+        self.manager.release_edges(edges, 51)
+        self.assertEqual(int(self.manager.edge_occupancy.sum()), 0)
+
+    def test_bulk_release_keeps_order_of_others(self):
+        ids = self.model.graph.get_edge_ids_by_type("runway_entry").tolist()
+        for airplane_id in (1, 2, 3):
+            self.assertTrue(self.manager.request_edges_atomic(ids, airplane_id))
+        self.manager.release_edge_ids(ids * 10, 2)
+        for edge_id in ids:
+            self.assertEqual(self.manager.get_edge_occupants(edge_id), [1, 3])
+
+
+class TestWakeOnRelease(unittest.TestCase):
+
+    def setUp(self):
+        self.model = AirportModel(num_arriving_airplanes=0, arrival_rate=0.0)
+        self.manager = self.model.segment_manager
+
+    def test_release_wakes_waiters_in_priority_order(self):
+        self.assertTrue(self.manager.request_edge(13, 38, 1))
+        self.assertFalse(self.manager.park(2))  # brak nieudanej prośby - nie ma na co czekać
+        for airplane_id, priority in ((2, 0), (3, 1)):
+            self.assertFalse(self.manager.request_edge(38, 13, airplane_id))
+            self.assertTrue(self.manager.park(airplane_id, priority))
+        self.assertTrue(self.manager.is_parked(2))
+        # Jedno wolne miejsce - budzi się tylko pierwszy wg priorytetu
+        self.manager.release_edge(13, 38, 1)
+        self.assertFalse(self.manager.is_parked(3))
+        self.assertTrue(self.manager.is_parked(2))
+        self.assertEqual(list(self.manager.woken), [3])
+        # Obudzony nie zajął miejsca (zablokował go inny segment) - miejsce dostaje następny
+        self.assertTrue(self.manager.request_edge(7, 9, 4))
+        self.assertFalse(self.manager.request_edge(7, 9, 3))
+        self.assertTrue(self.manager.park(3))
+        self.assertFalse(self.manager.is_parked(2))
+        self.assertEqual(list(self.manager.woken), [3, 2])
+        self.assertTrue(self.manager.request_edge(38, 13, 2))
+        self.assertEqual(list(self.manager.woken), [3, 2])
+
+    def test_controller_grant_unparks_and_passes_slot_on(self):
+        self.assertTrue(self.manager.request_edge(13, 38, 1))
+        for airplane_id in (2, 3):
+            self.assertFalse(self.manager.request_edge(13, 38, airplane_id))
+            self.manager.park(airplane_id)
+        self.assertFalse(self.manager.can_retry(3))
+        self.manager.release_edge(13, 38, 1)
+        self.assertFalse(self.manager.is_parked(2))
+        # Kontroler prosi za uśpionego 3 - miejsce jest wolne, więc może
+        self.assertTrue(self.manager.can_retry(3))
+        self.assertTrue(self.manager.request_edge(13, 38, 3))
+        self.assertFalse(self.manager.is_parked(3))
+        self.assertFalse(self.manager.request_edge(13, 38, 2))
+        self.assertTrue(self.manager.park(2))
+
+    def test_blockers_cleared_by_success_and_removal(self):
+        self.assertTrue(self.manager.request_edge(13, 38, 1))
+        self.assertFalse(self.manager.request_edge(38, 13, 2))
+        self.manager.release_edge(13, 38, 1)
+        self.assertTrue(self.manager.request_edge(38, 13, 2))
+        # Udana prośba kasuje starą blokadę - nie ma na co czekać
+        self.assertNotIn(2, self.manager._blockers)
+        self.assertFalse(self.manager.park(2))
+        self.assertFalse(self.manager.request_edge(13, 38, 3))
+        self.manager.remove_airplane(3)
+        self.assertEqual(self.manager._blockers, {})
+        self.assertFalse(self.manager.park(3))
+
+    def test_removed_airplane_stops_waiting(self):
+        self.assertTrue(self.manager.request_edge(13, 38, 1))
+        self.assertFalse(self.manager.request_edge(38, 13, 2))
+        self.assertTrue(self.manager.park(2))
+        self.manager.remove_airplane(2)
+        self.assertFalse(self.manager.is_parked(2))
+        self.assertEqual(self.manager.wait_for.waits_for(2), [])
+
+    def test_refused_pushback_stays_parked_until_deck_release(self):
+        model = AirportModel(num_arriving_airplanes=1, arrival_rate=0.0)
+        manager = model.segment_manager
+        airplane = model.airplanes[0]
+        airplane.state = "pushback_pending"
+        airplane.current_node = model.graph.get_stand_nodes()[0]
+        airplane.runway_entry_node = model.runway_controller.get_runway_entry_node()
+        deck_edge = int(manager._section("airport_deck")[0][0])
+        self.assertTrue(manager.request_edge_id(deck_edge, 999))
+        for _ in range(5):
+            model.step()
+            self.assertTrue(manager.is_parked(airplane.unique_id))
+            self.assertEqual(airplane.state, "pushback_pending")
+            self.assertEqual(manager.held_count(airplane.unique_id), 0)
+        manager.release_edge_id(deck_edge, 999)
+        self.assertFalse(manager.is_parked(airplane.unique_id))
+        model.step()
+        self.assertEqual(airplane.state, "pushback")
+
+    def test_exit_edge_forgotten_after_leaving_exit(self):
+        model = AirportModel(num_arriving_airplanes=3, arrival_rate=0.0)
+        model.random.seed(1)
+        checked = 0
+        for _ in range(600):
+            model.step()
+            for airplane in model.airplanes:
+                # Zjazd zwolniony przy przydziale płyty - kolejka na krawędzi nie może go zostawiać
+                if airplane.state in ("taxiing_to_stand", "at_stand"):
+                    self.assertIsNone(airplane.exit_edge_id)
+                    checked += 1
+        self.assertGreater(checked, 0)
+
+    def test_capacity_increase_wakes_waiters(self):
+        self.assertTrue(self.manager.request_edge(13, 38, 1))
+        self.assertFalse(self.manager.request_edge(13, 38, 2))
+        self.manager.park(2)
+        self.model.graph.set_edge_capacity(13, 38, capacity=2)
+        self.assertFalse(self.manager.is_parked(2))
+        self.assertTrue(self.manager.request_edge(13, 38, 2))
+
+
+class TestDeadlockDetection(unittest.TestCase):
+
+    def setUp(self):
+        self.model = AirportModel(num_arriving_airplanes=0, arrival_rate=0.0)
+        self.manager = self.model.segment_manager
+        self.found = []
+        self.manager.add_deadlock_listener(self.found.append)
+
+    def test_crossed_requests_form_cycle(self):
+        self.assertTrue(self.manager.request_edge_id(0, 1))
+        self.assertTrue(self.manager.request_edge_id(7, 2))
+        self.assertFalse(self.manager.request_edge_id(7, 1))
+        self.manager.park(1)
+        self.assertEqual(self.found, [])
+        self.assertFalse(self.manager.request_edge_id(0, 2))
+        self.manager.park(2)
+        self.assertEqual(self.found, [[2, 1]])
+        self.assertEqual(self.manager.find_deadlock(1), [1, 2])
+        # Zwolnienie krawędzi rozbija cykl (i budzi czekającego)
+        self.manager.release_edge_id(7, 2)
+        self.assertEqual(self.manager.current_deadlocks(), [])
+        self.assertIsNone(self.manager.find_deadlock(1))
+        self.assertEqual(self.manager.wait_for.waits_for(2), [1])
+        self.assertEqual(self.manager.wait_for.waits_for(1), [])
+
+
+class TestAtcController(unittest.TestCase):
+
+    def setUp(self):
+        self.atc = AtcController(DEFAULTS)
+
+    def test_separation_matrix_in_ticks(self):
+        # 30 s na tick: T/T 60 s = 2, L/L 70 s = 3, T/L i L/T 90 s = 3
+        self.assertEqual(self.atc.sep, ((2, 3), (3, 3)))
+        self.assertTrue(self.atc.can_land(0) and self.atc.can_takeoff(0))
+
+    def test_takeoff_after_landing_waits_for_separation(self):
+        self.atc.grant_landing(10)
+        self.assertEqual(self.atc.earliest("T"), 13)
+        self.assertFalse(self.atc.can_takeoff(12))
+        self.assertTrue(self.atc.can_takeoff(13))
+        self.atc.grant_takeoff(13)
+        self.assertEqual(self.atc.earliest("T"), 15)
+        self.assertEqual(self.atc.earliest("L"), 16)
+
+    def test_controller_is_wired_into_model(self):
+        model = AirportModel(num_arriving_airplanes=0, arrival_rate=0.0)
+        self.assertEqual(model.segment_manager.atc.tick_s, DEFAULTS['tick_s'])
+
+
+class TestReservationTable(unittest.TestCase):
+
+    def setUp(self):
+        self.table = ReservationTable()
+        for airplane_id, (t0, t1) in enumerate([(0, 5), (5, 8), (12, 20)]):
+            self.table.add(SegmentReservation(7, airplane_id, t0, t1))
+
+    def test_window_queries(self):
+        self.assertFalse(self.table.is_free(7, 4, 6))
+        self.assertTrue(self.table.is_free(7, 8, 12))
+        self.assertTrue(self.table.is_free(7, 4, 6, airplane_id=None, capacity=3))
+        self.assertEqual(self.table.earliest_free(7, 0, 4), 8)
+        self.assertEqual(self.table.earliest_free(7, 0, 5), 20)
+        self.assertEqual(self.table.earliest_free(7, 2, 3, airplane_id=0), 2)
+        self.assertEqual(self.table.earliest_free(99, 3, 10), 3)
+
+    def test_expiry_drops_past_reservations(self):
+        self.table.expire(8)
+        self.assertEqual([(r.start_time, r.end_time) for r in self.table.by_segment[7]], [(12, 20)])
+        self.table.expire(20)
+        self.assertEqual(self.table.by_segment, {})
+        self.assertEqual(self.table.calendars, {})
+
+    def test_expiry_prunes_airplane_index(self):
+        self.table.add(SegmentReservation(3, 2, 4, 30))
+        self.table.add(SegmentReservation(4, 1, 6, 9))
+        self.table.expire(8)
+        self.assertEqual(self.table.segments_by_airplane, {1: {4: 1}, 2: {7: 1, 3: 1}})
+        # Anulowane rezerwacje zostawiają w kopcu martwe wpisy - expire je pomija
+        self.assertEqual(self.table.remove_airplane(2), 2)
+        self.table.add(SegmentReservation(7, 2, 25, 40))
+        self.table.expire(20)
+        self.assertEqual(self.table.segments_by_airplane, {2: {7: 1}})
+        self.assertEqual(self.table.by_segment[7][0].start_time, 25)
+        self.table.expire(40)
+        self.assertEqual((self.table.segments_by_airplane, self.table.calendars), ({}, {}))
+
+
+class TestSpaceTimePlanner(unittest.TestCase):
+
+    def setUp(self):
+        self.model = AirportModel(num_arriving_airplanes=0, arrival_rate=0.0)
+        self.manager = self.model.segment_manager
+
+    def assertRouteValid(self, route, start, goal):
+        self.assertEqual(route[0][0], start)
+        self.assertEqual(route[-1][0], goal)
+        for (a, ta), (b, tb) in zip(route, route[1:]):
+            self.assertGreater(tb, ta)
+            self.assertTrue(a == b or self.model.graph.is_connected(a, b))
+
+    def test_unobstructed_route_follows_shortest_time(self):
+        route = self.manager.plan_timed_route(100, 9, 13, start_time=0)
+        self.assertRouteValid(route, 9, 13)
+        # Bez innych rezerwacji nie ma postojów
+        nodes = [node for node, _ in route]
+        self.assertEqual(len(nodes), len(set(nodes)))
+
+    def test_second_route_avoids_booked_segments(self):
+        first = self.manager.plan_timed_route(100, 13, 9, start_time=0)
+        second = self.manager.plan_timed_route(101, 9, 14, start_time=0)
+        self.assertRouteValid(first, 13, 9)
+        self.assertRouteValid(second, 9, 14)
+        table = self.manager.reservation_table
+        for segment_id, reservations in table.by_segment.items():
+            for r in reservations:
+                capacity = (self.manager._edge_capacity_by_id(segment_id)
+                            if segment_id < self.model.graph.num_edges else 1)
+                self.assertLessEqual(table.count_overlapping(segment_id, r.start_time, r.end_time), capacity)
+
+    def test_planner_avoids_closed_edge(self):
+        route = self.manager.plan_timed_route(100, 9, 13, start_time=0, book=False)
+        u, v = route[1][0], route[2][0]
+        self.model.graph.close_edge(u, v)
+        detour = self.manager.plan_timed_route(100, 9, 13, start_time=0, book=False)
+        self.assertRouteValid(detour, 9, 13)
+        self.assertNotIn((u, v), [(a, b) for (a, _), (b, _) in zip(detour, detour[1:])])
+
+    def test_planner_heuristic_follows_one_way_edges(self):
+        graph = self.model.graph
+        for u, v in ((13, 38), (2, 11), (11, 37), (37, 36), (36, 9)):
+            graph.set_one_way(u, v, 'AB')
+        route = self.manager.plan_timed_route(100, 13, 1, start_time=0, book=False)
+        self.assertIsNotNone(route)
+        self.assertRouteValid(route, 13, 1)
+        for (a, _), (b, _) in zip(route, route[1:]):
+            self.assertTrue(a == b or graph.can_traverse(a, b))
+
+    def test_planner_follows_direction_change(self):
+        graph = self.model.graph
+        graph.set_one_way(9, 36, 'AB')
+        detour = self.manager.plan_timed_route(100, 36, 9, start_time=0, book=False)
+        self.assertRouteValid(detour, 36, 9)
+        self.assertGreater(len(detour), 2)
+        # Odwrócenie kierunku otwiera łuk 36 -> 9 - heurystyka do celu 9 nie może zostać stara
+        graph.set_one_way(9, 36, 'BA')
+        route = self.manager.plan_timed_route(100, 36, 9, start_time=0, book=False)
+        self.assertEqual([node for node, _ in route], [36, 9])
+        back = self.manager.plan_timed_route(100, 9, 36, start_time=0, book=False)
+        self.assertRouteValid(back, 9, 36)
+        self.assertGreater(len(back), 2)
+
+    def test_planner_follows_speed_limits(self):
+        graph = self.model.graph
+        planner = self.manager.planner
+        edge_id = graph.get_edge_id(13, 38)
+        before = self.manager.plan_timed_route(100, 38, 13, start_time=0, book=False)
+        graph.set_edge_speed_limits(13, 38, straight_kts=2)
+        self.assertIs(self.manager.planner, planner)
+        self.assertEqual(planner.edge_ticks[edge_id], self.manager._edge_ticks()[edge_id])
+        self.assertEqual(planner.edge_ticks[edge_id], 10 * before[-1][1])
+        route = self.manager.plan_timed_route(100, 38, 13, start_time=0, book=False)
+        self.assertEqual(route[-1][1], planner.edge_ticks[edge_id])
+        self.manager.plan_timed_route(100, 38, 13, start_time=0)
+        self.assertEqual([(r.start_time, r.end_time) for r in self.manager.reservation_table.by_segment[edge_id]],
+                         [(0, planner.edge_ticks[edge_id])])
+
+    def test_booked_slots_expire_during_run(self):
+        first = self.manager.book_edge_slot(100, 13, 38, earliest=1, duration=4)
+        second = self.manager.book_edge_slot(101, 38, 13, earliest=1, duration=4)
+        self.assertEqual((first, second), (1, 5))
+        for _ in range(10):
+            self.model.step()
+        self.assertEqual(self.manager.reservation_table.by_segment, {})
+
+    def test_cancel_removes_bookings(self):
+        route = self.manager.plan_timed_route(100, 9, 13, start_time=0)
+        self.assertGreater(self.manager.cancel_timed_routes(100), len(route) - 1)
+        self.assertEqual(self.manager.reservation_table.by_segment, {})
+
+
+if __name__ == '__main__':
+    unittest.main()